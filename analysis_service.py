@@ -0,0 +1,411 @@
+import os
+import json
+import time
+import signal
+import asyncio
+import logging
+import argparse
+from http import HTTPStatus
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit, parse_qs
+
+from resume_parser import ResumeParser
+from extractors import ExtractionError
+from job_analyzer import JobAnalyzer
+from metrics import get_metrics
+from pdf_extraction import PdfExtractor
+
+MAX_BODY_BYTES = 25 * 1024 * 1024
+
+# Parser owned by each extraction worker process
+_worker_parser = None
+
+
+def _init_extraction_worker():
+    global _worker_parser
+    # The pool already spreads uploads over the cores, so extract PDF pages serially
+    _worker_parser = ResumeParser(pdf_extractor=PdfExtractor(max_workers=1))
+
+
+class _DeadlineExceeded(BaseException):
+    """Raised by SIGALRM, and not an Exception so extractors that catch errors can't swallow it"""
+
+
+def _raise_deadline(signum, frame):
+    raise _DeadlineExceeded()
+
+
+def _extract_in_worker(data: bytes, filename: str, deadline: Optional[float] = None) -> str:
+    """
+    Extract text from uploaded file bytes inside a worker process
+
+    Raises ExtractionError if no text could be extracted. An alarm interrupts
+    the extraction at ``deadline`` (a ``time.time()`` value) with a
+    TimeoutError, so a request that timed out doesn't keep occupying its worker.
+    """
+    if deadline is None:
+        return _worker_parser.extract_text(data, name=filename, strict=True)
+
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise TimeoutError("extraction passed the request deadline")
+    previous = signal.signal(signal.SIGALRM, _raise_deadline)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, remaining)
+        try:
+            return _worker_parser.extract_text(data, name=filename, strict=True)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    except _DeadlineExceeded:
+        raise TimeoutError("extraction passed the request deadline") from None
+    finally:
+        signal.signal(signal.SIGALRM, previous)
+
+
+class ServiceError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent parse requests into ``nlp.pipe`` batches
+
+    Texts submitted while a batch is being collected are parsed together once
+    ``max_batch_size`` texts are waiting or ``max_wait`` seconds have passed
+    since the first one arrived. Parsing runs on a dedicated thread so the
+    event loop keeps serving requests. When ``max_queue`` texts are already
+    waiting, new submissions are rejected instead of queueing without bound.
+    """
+
+    def __init__(self, nlp, max_batch_size: int = 32, max_wait: float = 0.005, max_queue: int = 1024):
+        self.nlp = nlp
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batches = 0
+        self.texts = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+        self.executor.shutdown(wait=False)
+
+    async def parse(self, text: str):
+        """Parse one text as part of the next batch"""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((text, future))
+        except asyncio.QueueFull:
+            raise ServiceError(HTTPStatus.SERVICE_UNAVAILABLE, "NLP queue is full, retry later")
+        return await future
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        # Requests that timed out while queued don't need parsing
+        return [(text, future) for text, future in batch if not future.done()]
+
+    def _pipe(self, texts: List[str]) -> List:
+        with get_metrics().stage('nlp_batch', profile=True):
+            docs = list(self.nlp.pipe(texts, batch_size=len(texts)))
+        get_metrics().inc('nlp_texts', len(texts))
+        return docs
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            if not batch:
+                continue
+
+            texts = [text for text, _ in batch]
+            try:
+                docs = await loop.run_in_executor(self.executor, self._pipe, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.texts += len(texts)
+            for (_, future), doc in zip(batch, docs):
+                if not future.done():
+                    future.set_result(doc)
+
+
+class AnalysisService:
+    """
+    Local asyncio HTTP service for resume parsing, job analysis and matching
+
+    Endpoints (all POST, JSON responses):
+        /parse?filename=resume.pdf   raw file bytes as the request body
+        /analyze-job                 {"text": job description}
+        /match                       {"resume_text": ..., "resume_skills": [...], "job_text": ...}
+
+    GET /health reports load, GET /metrics exports Prometheus text (or JSON with ?format=json).
+    """
+
+    def __init__(self, max_batch_size: int = 32, max_wait: float = 0.005, max_queue: int = 1024,
+                 workers: Optional[int] = None, request_timeout: float = 30.0, max_inflight: int = 256):
+        self.resume_parser = ResumeParser()
+        self.job_analyzer = JobAnalyzer()
+        self.batch_options = dict(max_batch_size=max_batch_size, max_wait=max_wait, max_queue=max_queue)
+        self.workers = workers or os.cpu_count() or 1
+        self.request_timeout = request_timeout
+        self.max_inflight = max_inflight
+        self.inflight = 0
+        self.logger = logging.getLogger(__name__)
+
+        self.extraction_pool: Optional[ProcessPoolExecutor] = None
+        self.sentence_batcher: Optional[MicroBatcher] = None
+        self.tagger_batcher: Optional[MicroBatcher] = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765) -> asyncio.AbstractServer:
+        self.extraction_pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                   initializer=_init_extraction_worker)
+        # Load the models before accepting traffic
+        self.sentence_batcher = MicroBatcher(self.resume_parser.sentence_nlp, **self.batch_options)
+        self.tagger_batcher = MicroBatcher(self.job_analyzer.tagger_nlp, **self.batch_options)
+        self.sentence_batcher.start()
+        self.tagger_batcher.start()
+
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        self.logger.info(f"Analysis service listening on http://{host}:{port}")
+        return server
+
+    async def stop(self):
+        await self.sentence_batcher.stop()
+        await self.tagger_batcher.stop()
+        self.extraction_pool.shutdown(wait=False, cancel_futures=True)
+        get_metrics().log_json()
+
+    async def parse_resume(self, data: bytes, filename: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Parse an upload, stopping its extraction at ``deadline`` (a ``time.time()`` value)"""
+        if not data:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "empty upload")
+
+        loop = asyncio.get_running_loop()
+        try:
+            text = await loop.run_in_executor(self.extraction_pool, _extract_in_worker, data, filename, deadline)
+        except TimeoutError:
+            raise ServiceError(HTTPStatus.GATEWAY_TIMEOUT, "text extraction exceeded the request deadline")
+        except ExtractionError as e:
+            raise ServiceError(HTTPStatus.UNPROCESSABLE_ENTITY, f"could not extract text: {e}")
+
+        doc = await self.sentence_batcher.parse(text)
+        return {
+            'raw_text': text,
+            'skills': self.resume_parser.extract_skills(text),
+            'contact_info': self.resume_parser.extract_contact_info(text),
+            'file_path': filename,
+            'education': self.resume_parser.education_from_doc(doc)
+        }
+
+    async def analyze_job(self, job_text: str) -> Dict[str, Any]:
+        doc = await self.sentence_batcher.parse(job_text)
+        return {
+            'raw_text': job_text,
+            'requirements': self.job_analyzer.requirements_from_doc(doc)
+        }
+
+    async def match(self, resume_text: str, resume_skills: List[str], job_text: str) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        analysis = await self.analyze_job(job_text)
+        requirements = analysis['requirements']
+
+        docs = await asyncio.gather(*(
+            self.tagger_batcher.parse(req.lower()) for req in requirements['required_skills']
+        ))
+        skill_gaps = self.job_analyzer.skill_gaps_from_docs(resume_skills, list(docs))
+        score = await loop.run_in_executor(None, self.job_analyzer.text_similarity, resume_text, job_text)
+
+        return {
+            'match_score': float(score),
+            'requirements': requirements,
+            'skill_gaps': skill_gaps,
+            'suggestions': self.job_analyzer.generate_improvement_suggestions(skill_gaps)
+        }
+
+    async def _dispatch(self, method: str, target: str, body: bytes,
+                        deadline: Optional[float] = None) -> Union[Dict[str, Any], str]:
+        url = urlsplit(target)
+        if method == 'GET' and url.path == '/metrics':
+            if parse_qs(url.query).get('format', [''])[0] == 'json':
+                return get_metrics().snapshot()
+            return get_metrics().to_prometheus()
+        if method == 'GET' and url.path == '/health':
+            return {
+                'status': 'ok',
+                'inflight': self.inflight,
+                'nlp_batches': self.sentence_batcher.batches + self.tagger_batcher.batches,
+                'nlp_texts': self.sentence_batcher.texts + self.tagger_batcher.texts,
+            }
+        if method != 'POST':
+            raise ServiceError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not supported")
+
+        if url.path == '/parse':
+            filename = parse_qs(url.query).get('filename', ['upload.pdf'])[0]
+            return await self.parse_resume(body, filename, deadline)
+
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "request body must be JSON")
+        if not isinstance(payload, dict):
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "request body must be a JSON object")
+
+        if url.path == '/analyze-job':
+            return await self.analyze_job(payload.get('text', ''))
+        if url.path == '/match':
+            return await self.match(payload.get('resume_text', ''), payload.get('resume_skills', []),
+                                    payload.get('job_text', ''))
+        raise ServiceError(HTTPStatus.NOT_FOUND, f"unknown endpoint {url.path}")
+
+    async def _handle_request(self, method: str, target: str,
+                              body: bytes) -> Tuple[HTTPStatus, Union[Dict[str, Any], str]]:
+        endpoint = urlsplit(target).path
+        started = time.perf_counter()
+        status, payload = await self._handle_request_inner(method, target, body)
+        # Wall time only, the request's CPU time is spread over several threads and processes
+        get_metrics().observe('request', time.perf_counter() - started, endpoint=endpoint)
+        get_metrics().inc('requests', endpoint=endpoint, status=status.value)
+        return status, payload
+
+    async def _handle_request_inner(self, method: str, target: str,
+                                    body: bytes) -> Tuple[HTTPStatus, Union[Dict[str, Any], str]]:
+        if self.inflight >= self.max_inflight:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {'error': "too many requests in flight, retry later"}
+
+        self.inflight += 1
+        try:
+            deadline = time.time() + self.request_timeout
+            result = await asyncio.wait_for(self._dispatch(method, target, body, deadline), self.request_timeout)
+            return HTTPStatus.OK, result
+        except ServiceError as e:
+            return e.status, {'error': str(e)}
+        except asyncio.TimeoutError:
+            return HTTPStatus.GATEWAY_TIMEOUT, {'error': f"request exceeded {self.request_timeout}s deadline"}
+        except Exception as e:
+            self.logger.exception("Request failed")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+        finally:
+            self.inflight -= 1
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve HTTP/1.1 requests on one connection until the client closes it"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+
+                try:
+                    method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {'error': "malformed request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0) or 0)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                        {'error': f"body exceeds {MAX_BODY_BYTES} bytes"}, False)
+                    break
+
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await self._handle_request(method, target, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: HTTPStatus,
+                       payload: Union[Dict[str, Any], str], keep_alive: bool):
+        # Text payloads are Prometheus metrics, everything else is JSON
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), 'text/plain; version=0.0.4'
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json'
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+
+async def serve(host: str, port: int, **options):
+    service = AnalysisService(**options)
+    server = await service.start(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run the local resume analysis HTTP service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch-size', type=int, default=32, help="Most texts per nlp.pipe batch")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help="Longest wait to fill a batch")
+    parser.add_argument('--max-queue', type=int, default=1024, help="Texts waiting for NLP before rejecting")
+    parser.add_argument('--max-inflight', type=int, default=256, help="Concurrent requests before rejecting")
+    parser.add_argument('-w', '--workers', type=int, help="Extraction worker processes (defaults to CPU count)")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Per-request deadline in seconds")
+    parser.add_argument('--profile-slow-ms', type=float,
+                        help="Sample NLP batches and log the hottest stacks of those slower than this")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.profile_slow_ms is not None:
+        get_metrics().configure_profiler(args.profile_slow_ms / 1000)
+    try:
+        asyncio.run(serve(
+            args.host, args.port,
+            max_batch_size=args.max_batch_size,
+            max_wait=args.max_wait_ms / 1000,
+            max_queue=args.max_queue,
+            workers=args.workers,
+            request_timeout=args.timeout,
+            max_inflight=args.max_inflight,
+        ))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
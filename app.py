@@ -1,186 +1,144 @@
+import hashlib
 import streamlit as st
-import spacy
 import pandas as pd
 import plotly.express as px
-from pathlib import Path
-import tempfile
-import os
 from resume_parser import ResumeParser
 from job_analyzer import JobAnalyzer
+from matching import match_resume_to_job  # re-exported for existing importers
+from doc_cache import text_hash
+
+# Lifetime in seconds and per-stage size of the result caches shared by all sessions
+CACHE_TTL = 3600
+CACHE_MAX_ENTRIES = 128
 
-# Load spaCy model
 @st.cache_resource
-def load_spacy_model():
-    return spacy.load("en_core_web_sm")
+def get_analyzers():
+    """Create the parser and analyzer once per process instead of on every rerun"""
+    return ResumeParser(), JobAnalyzer()
 
-def match_resume_to_job(resume_data: dict, job_description_data: dict) -> dict:
-    """
-    Match resume to job description and provide detailed analysis
-    
-    Args:
-        resume_data (dict): Parsed resume data
-        job_description_data (dict): Parsed job description data
-    
-    Returns:
-        dict: Detailed match analysis
-    """
-    # Initialize models
-    import spacy
-    resume_parser = spacy.load("en_core_web_sm")
-    
-    # Extract raw texts
-    resume_text = resume_data.get('raw_text', '').lower()
-    job_description_text = job_description_data.get('raw_text', '').lower()
-    
-    # Extract resume skills and job requirements
-    resume_skills = set(skill.lower() for skill in resume_data.get('skills', []))
-    
-    # Extract job requirements from job description
-    job_requirements = job_description_data.get('requirements', {})
-    required_skills_text = ' '.join(job_requirements.get('required_skills', []))
-    
-    # Use NLP to extract skills from job description
-    job_doc = resume_parser(required_skills_text)
-    job_skills = set()
-    
-    # Extract skills from job description
-    skill_keywords = [
-        'python', 'java', 'javascript', 'c++', 'sql', 
-        'machine learning', 'data science', 'react', 
-        'node.js', 'docker', 'kubernetes', 'aws',
-        'html', 'css', 'django', 'flask', 'tensorflow', 
-        'pytorch', 'pandas', 'numpy', 'git', 'agile'
-    ]
-    
-    for token in job_doc:
-        for skill in skill_keywords:
-            if skill in token.text.lower():
-                job_skills.add(skill)
-    
-    # Match skills
-    matched_skills = resume_skills.intersection(job_skills)
-    
-    # Calculate match score
-    total_job_skills = len(job_skills)
-    matched_skill_count = len(matched_skills)
-    match_score = (matched_skill_count / total_job_skills * 100) if total_job_skills > 0 else 0
-    
-    # Prepare detailed analysis
-    analysis = {
-        'match_score': match_score,
-        'total_job_skills': total_job_skills,
-        'matched_skills': list(matched_skills),
-        'recommended_improvements': list(job_skills - resume_skills)
-    }
-    
-    return analysis
+# Each stage is cached on the hashes of its inputs only. Arguments starting
+# with an underscore are not hashed by Streamlit, so the raw upload and job
+# text are passed that way and never rehashed on a rerun.
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner="Parsing resume...")
+def cached_parse_resume(resume_hash: str, _data: bytes, _name: str) -> dict:
+    resume_parser, _ = get_analyzers()
+    return resume_parser.parse_resume(_data, name=_name)
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner="Analyzing job description...")
+def cached_job_requirements(job_hash: str, _job_text: str) -> dict:
+    _, job_analyzer = get_analyzers()
+    return job_analyzer.extract_requirements(_job_text)
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def cached_match_score(resume_hash: str, job_hash: str, _resume_text: str, _job_text: str):
+    _, job_analyzer = get_analyzers()
+    return job_analyzer.calculate_match_score(_resume_text, _job_text)
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def cached_skill_gaps(resume_hash: str, job_hash: str, _resume_skills: list, _job_requirements: dict):
+    _, job_analyzer = get_analyzers()
+    skill_gaps = job_analyzer.analyze_skill_gaps(_resume_skills, _job_requirements)
+    return skill_gaps, job_analyzer.generate_improvement_suggestions(skill_gaps)
 
 def main():
     st.set_page_config(page_title="AI Resume Analyzer", layout="wide")
     
     st.title("AI Resume Analyzer")
     
-    # Initialize models and analyzers
-    nlp = load_spacy_model()
-    resume_parser = ResumeParser(nlp)
-    job_analyzer = JobAnalyzer(nlp)
-    
     # Sidebar
     st.sidebar.title("Upload Documents")
     
     # File upload
-    uploaded_resume = st.sidebar.file_uploader("Upload Resume", type=["pdf", "docx"])
+    uploaded_resume = st.sidebar.file_uploader("Upload Resume", type=["pdf", "docx", "doc", "odt", "rtf", "txt", "html"])
     
     # Job description input
     job_description = st.sidebar.text_area("Enter Job Description")
     
     if uploaded_resume and job_description:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(uploaded_resume.name).suffix) as tmp_file:
-            tmp_file.write(uploaded_resume.getvalue())
-            temp_path = tmp_file.name
+        # Only stages whose inputs changed since the last rerun are recomputed
+        resume_bytes = uploaded_resume.getvalue()
+        resume_hash = hashlib.sha256(resume_bytes).hexdigest()
+        job_hash = text_hash(job_description)
+        
+        # Parse resume, reporting the current upload's name even on a cache hit
+        resume_data = cached_parse_resume(resume_hash, resume_bytes, uploaded_resume.name)
+        resume_data = {**resume_data, "file_path": uploaded_resume.name}
+        
+        # Analyze job description
+        job_requirements = cached_job_requirements(job_hash, job_description)
+        
+        # Calculate match score
+        match_score, term_scores = cached_match_score(
+            resume_hash,
+            job_hash,
+            resume_data["raw_text"],
+            job_description
+        )
+        
+        # Analyze skill gaps and generate suggestions
+        skill_gaps, suggestions = cached_skill_gaps(
+            resume_hash,
+            job_hash,
+            resume_data["skills"],
+            job_requirements
+        )
+        
+        # Display results in columns
+        col1, col2 = st.columns(2)
         
-        try:
-            # Parse resume
-            resume_data = resume_parser.parse_resume(temp_path)
+        with col1:
+            st.subheader("Resume Analysis")
             
-            # Analyze job description
-            job_requirements = job_analyzer.extract_requirements(job_description)
+            # Contact Information
+            st.write("### Contact Information")
+            for key, value in resume_data["contact_info"].items():
+                if value:
+                    st.write(f"**{key.title()}:** {value}")
             
-            # Calculate match score
-            match_score, term_scores = job_analyzer.calculate_match_score(
-                resume_data["raw_text"], 
-                job_description
-            )
+            # Skills
+            st.write("### Skills")
+            skills_df = pd.DataFrame({"Skills": resume_data["skills"]})
+            st.dataframe(skills_df)
             
-            # Analyze skill gaps
-            skill_gaps = job_analyzer.analyze_skill_gaps(
-                resume_data["skills"],
-                job_requirements
-            )
+            # Education
+            st.write("### Education")
+            for edu in resume_data["education"]:
+                st.write(f"- {edu['description']}")
+        
+        with col2:
+            st.subheader("Job Match Analysis")
             
-            # Generate suggestions
-            suggestions = job_analyzer.generate_improvement_suggestions(skill_gaps)
+            # Overall match score
+            st.metric("Overall Match Score", f"{match_score*100:.1f}%")
             
-            # Display results in columns
-            col1, col2 = st.columns(2)
+            # Skill gap analysis
+            st.write("### Skill Gap Analysis")
+            st.write(f"Match Percentage: {skill_gaps['match_percentage']*100:.1f}%")
             
-            with col1:
-                st.subheader("Resume Analysis")
-                
-                # Contact Information
-                st.write("### Contact Information")
-                for key, value in resume_data["contact_info"].items():
-                    if value:
-                        st.write(f"**{key.title()}:** {value}")
-                
-                # Skills
-                st.write("### Skills")
-                skills_df = pd.DataFrame({"Skills": resume_data["skills"]})
-                st.dataframe(skills_df)
-                
-                # Education
-                st.write("### Education")
-                for edu in resume_data["education"]:
-                    st.write(f"- {edu['description']}")
+            if skill_gaps["missing_skills"]:
+                st.warning("Missing Skills:")
+                for skill in skill_gaps["missing_skills"]:
+                    st.write(f"- {skill}")
             
-            with col2:
-                st.subheader("Job Match Analysis")
-                
-                # Overall match score
-                st.metric("Overall Match Score", f"{match_score*100:.1f}%")
-                
-                # Skill gap analysis
-                st.write("### Skill Gap Analysis")
-                st.write(f"Match Percentage: {skill_gaps['match_percentage']*100:.1f}%")
-                
-                if skill_gaps["missing_skills"]:
-                    st.warning("Missing Skills:")
-                    for skill in skill_gaps["missing_skills"]:
-                        st.write(f"- {skill}")
-                
-                # Improvement suggestions
-                st.write("### Suggestions for Improvement")
-                for suggestion in suggestions:
-                    st.write(suggestion)
-                
-                # Visualize term matches
-                st.write("### Keyword Match Analysis")
-                term_df = pd.DataFrame(
-                    {"Term": list(term_scores.keys()), 
-                     "Match": list(term_scores.values())}
-                )
-                fig = px.bar(
-                    term_df,
-                    x="Term",
-                    y="Match",
-                    title="Keyword Matches"
-                )
-                st.plotly_chart(fig)
-        
-        finally:
-            # Clean up temporary file
-            os.unlink(temp_path)
+            # Improvement suggestions
+            st.write("### Suggestions for Improvement")
+            for suggestion in suggestions:
+                st.write(suggestion)
+            
+            # Visualize term matches
+            st.write("### Keyword Match Analysis")
+            term_df = pd.DataFrame(
+                {"Term": list(term_scores.keys()), 
+                 "Match": list(term_scores.values())}
+            )
+            fig = px.bar(
+                term_df,
+                x="Term",
+                y="Match",
+                title="Keyword Matches"
+            )
+            st.plotly_chart(fig)
 
 if __name__ == "__main__":
     main()
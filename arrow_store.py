@@ -0,0 +1,162 @@
+import os
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+# Typed columnar storage of batch results. Results are written incrementally
+# as record batches, so a screening run of any size is saved once and later
+# filtering and ranking jobs reload it without re-running the NLP pipeline.
+# Arrow IPC files are memory-mapped on reload and read without copying;
+# Parquet files are smaller but decoded into memory.
+
+FORMATS = ('parquet', 'arrow')
+
+RESUME_SCHEMA = pa.schema([
+    pa.field('file_path', pa.string()),
+    pa.field('error', pa.string()),
+    pa.field('skills', pa.list_(pa.string())),
+    pa.field('email', pa.string()),
+    pa.field('phone', pa.string()),
+    pa.field('education', pa.list_(pa.string())),
+    # Large strings so a batch can hold more than 2 GB of text
+    pa.field('raw_text', pa.large_string()),
+])
+
+MATCH_SCHEMA = pa.schema([
+    pa.field('file_path', pa.string()),
+    pa.field('job_id', pa.string()),
+    pa.field('title', pa.string()),
+    pa.field('match_score', pa.float64()),
+    pa.field('total_job_skills', pa.int32()),
+    pa.field('matched_skills', pa.list_(pa.string())),
+    pa.field('missing_skills', pa.list_(pa.string())),
+])
+
+
+def format_from_path(path: str) -> Optional[str]:
+    """The storage format implied by a file extension, None if there is none"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    if extension in ('.arrow', '.feather', '.ipc'):
+        return 'arrow'
+    return None
+
+
+def resume_row(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a ``ResumeParser.parse_resume`` result into a ``RESUME_SCHEMA`` row"""
+    contact_info = result.get('contact_info') or {}
+    return {
+        'file_path': result.get('file_path'),
+        'error': result.get('error'),
+        'skills': list(result.get('skills') or []),
+        'email': contact_info.get('email'),
+        'phone': contact_info.get('phone'),
+        'education': [entry.get('description', '') for entry in result.get('education') or []],
+        'raw_text': result.get('raw_text'),
+    }
+
+
+def resume_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild the ``ResumeParser.parse_resume`` shape from a ``RESUME_SCHEMA`` row"""
+    if row.get('error'):
+        return {'file_path': row['file_path'], 'error': row['error']}
+    contact_info = {key: row[key] for key in ('email', 'phone') if row.get(key)}
+    return {
+        'raw_text': row.get('raw_text'),
+        'skills': row.get('skills') or [],
+        'contact_info': contact_info,
+        'file_path': row.get('file_path'),
+        'education': [{'description': description} for description in row.get('education') or []],
+    }
+
+
+class ResultWriter:
+    """
+    Write rows to a Parquet or Arrow IPC file one record batch at a time
+
+    Rows are buffered until ``batch_size`` of them are pending, so memory
+    stays bounded however many results are written.
+    """
+
+    def __init__(self, path: str, schema: pa.Schema, file_format: Optional[str] = None, batch_size: int = 1024):
+        file_format = file_format or format_from_path(path) or 'parquet'
+        if file_format not in FORMATS:
+            raise ValueError(f"Unknown result format: {file_format}")
+
+        self.path = path
+        self.schema = schema
+        self.file_format = file_format
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self.logger = logging.getLogger(__name__)
+        self._pending: List[Dict[str, Any]] = []
+
+        if file_format == 'parquet':
+            self._writer = pq.ParquetWriter(path, schema, compression='zstd')
+        else:
+            self._sink = pa.OSFile(path, 'wb')
+            self._writer = ipc.new_file(self._sink, schema)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, row: Dict[str, Any]):
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, rows: Iterable[Dict[str, Any]]):
+        for row in rows:
+            self.write(row)
+
+    def flush(self):
+        """Write all pending rows as one record batch"""
+        if not self._pending:
+            return
+        self._writer.write_batch(pa.RecordBatch.from_pylist(self._pending, schema=self.schema))
+        self.rows_written += len(self._pending)
+        self._pending = []
+
+    def close(self):
+        if self._writer is None:
+            return
+        self.flush()
+        self._writer.close()
+        if self.file_format == 'arrow':
+            self._sink.close()
+        self._writer = None
+        self.logger.info(f"Wrote {self.rows_written} rows to {self.path}")
+
+
+def open_results(path: str, columns: Optional[List[str]] = None) -> pa.Table:
+    """
+    Load a result file written by ``ResultWriter``
+
+    Arrow IPC files are memory-mapped and the returned table references the
+    mapped pages directly, so opening even a very large file is nearly free
+    and only the columns and rows actually touched are paged in.
+
+    Args:
+        path (str): Parquet or Arrow IPC file
+        columns: Only load these columns
+    """
+    if format_from_path(path) == 'parquet':
+        return pq.read_table(path, columns=columns, memory_map=True)
+
+    source = pa.memory_map(path, 'r')
+    table = ipc.open_file(source).read_all()
+    return table.select(columns) if columns else table
+
+
+def iter_resumes(table: pa.Table, batch_size: int = 1024) -> Iterator[Dict[str, Any]]:
+    """Yield every ``RESUME_SCHEMA`` row of a table in the ``parse_resume`` shape"""
+    for batch in table.to_batches(max_chunksize=batch_size):
+        for row in batch.to_pylist():
+            yield resume_from_row(row)
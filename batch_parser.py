@@ -0,0 +1,248 @@
+import os
+import sys
+import glob
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+from resume_parser import ResumeParser, PARSER_VERSION
+from extraction_cache import ExtractionCache
+from pdf_extraction import PdfExtractor
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.doc', '.odt', '.rtf', '.txt', '.html', '.htm')
+
+# Columnar output formats by file extension, see arrow_store
+OUTPUT_FORMATS = {'.parquet': 'parquet', '.pq': 'parquet', '.arrow': 'arrow', '.feather': 'arrow', '.ipc': 'arrow'}
+
+# Parser owned by each worker process, created once by the pool initializer
+_worker_parser = None
+
+
+def _init_worker(cache_dir: Optional[str] = None):
+    """Load the spaCy model once per worker process"""
+    global _worker_parser
+    extraction_cache = ExtractionCache(cache_dir, PARSER_VERSION) if cache_dir else None
+    # The pool already keeps every core busy, so extract PDF pages serially
+    _worker_parser = ResumeParser(extraction_cache=extraction_cache, pdf_extractor=PdfExtractor(max_workers=1))
+    # Warm the shared registry so the first resume doesn't pay for the load
+    _worker_parser.sentence_nlp
+
+
+def _parse_worker(index: int, file_path: str) -> Tuple[int, Dict[str, Any]]:
+    """Parse a single resume inside a worker process"""
+    try:
+        result = _worker_parser.parse_resume(file_path)
+    except Exception as e:
+        result = {'file_path': file_path, 'error': str(e)}
+    return index, result
+
+
+def collect_resume_paths(inputs: Iterable[str], manifest: Optional[str] = None) -> List[str]:
+    """
+    Expand directories, glob patterns and manifest files into resume paths
+
+    Args:
+        inputs: Directories, glob patterns or individual files
+        manifest: Optional file listing one resume path per line
+
+    Returns:
+        List of resume paths in a stable order, without duplicates
+    """
+    paths = []
+
+    for item in inputs:
+        if os.path.isdir(item):
+            found = []
+            for root, _, files in os.walk(item):
+                for name in files:
+                    if name.lower().endswith(RESUME_EXTENSIONS):
+                        found.append(os.path.join(root, name))
+            paths.extend(sorted(found))
+        elif glob.has_magic(item):
+            paths.extend(sorted(glob.glob(item, recursive=True)))
+        else:
+            paths.append(item)
+
+    if manifest:
+        with open(manifest, 'r', encoding='utf-8') as file:
+            paths.extend(line.strip() for line in file if line.strip() and not line.startswith('#'))
+
+    seen = set()
+    unique_paths = []
+    for path in paths:
+        if path not in seen:
+            seen.add(path)
+            unique_paths.append(path)
+
+    return unique_paths
+
+
+class BatchStats:
+    """Progress and throughput counters for a batch run"""
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.bytes_processed = 0
+        self.started_at = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def files_per_second(self) -> float:
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes_processed / 1e6 / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.completed}/{self.submitted} resumes, {self.failed} failed, "
+                f"{self.elapsed:.1f}s, {self.files_per_second:.1f} files/s, "
+                f"{self.megabytes_per_second:.2f} MB/s")
+
+
+class BatchResumeParser:
+    def __init__(self, workers: Optional[int] = None, order: str = 'input',
+                 max_pending: Optional[int] = None, progress_every: int = 100,
+                 cache_dir: Optional[str] = None):
+        if order not in ('input', 'completion'):
+            raise ValueError(f"Unknown output order: {order}")
+
+        self.workers = workers or os.cpu_count() or 1
+        self.order = order
+        self.max_pending = max_pending or self.workers * 4
+        self.progress_every = progress_every
+        self.cache_dir = cache_dir
+        self.stats = BatchStats()
+        self.logger = logging.getLogger(__name__)
+
+    def _record(self, file_path: str, result: Dict[str, Any]):
+        """Update counters for a finished resume"""
+        self.stats.completed += 1
+        if 'error' in result:
+            self.stats.failed += 1
+        try:
+            self.stats.bytes_processed += os.path.getsize(file_path)
+        except OSError:
+            pass
+
+        if self.progress_every and self.stats.completed % self.progress_every == 0:
+            self.logger.info(f"Progress: {self.stats.summary()}")
+
+    def run(self, paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Parse resumes across a process pool, yielding results as they are ready
+
+        Only ``max_pending`` files are in flight or finished but not yet yielded
+        at once, so memory stays bounded for arbitrarily large inputs. With
+        ``order='input'`` results are yielded in the order of ``paths``, and a
+        slow file holds back submissions until it finishes; with
+        ``order='completion'`` they are yielded as soon as a worker finishes them.
+        """
+        self.stats = BatchStats()
+        path_iter = enumerate(paths)
+        paths_by_index = {}
+        buffered = {}
+        next_index = 0
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.cache_dir,)) as executor:
+            pending = set()
+
+            def submit_more():
+                # Results waiting for an earlier one count too, or a slow file would let them pile up
+                while len(pending) + len(buffered) < self.max_pending:
+                    try:
+                        index, path = next(path_iter)
+                    except StopIteration:
+                        return
+                    paths_by_index[index] = path
+                    pending.add(executor.submit(_parse_worker, index, path))
+                    self.stats.submitted += 1
+
+            submit_more()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, result = future.result()
+                    self._record(paths_by_index.pop(index), result)
+
+                    if self.order == 'completion':
+                        yield result
+                    else:
+                        buffered[index] = result
+
+                # Flush the contiguous prefix of finished results
+                while next_index in buffered:
+                    yield buffered.pop(next_index)
+                    next_index += 1
+
+                submit_more()
+
+        self.logger.info(f"Finished: {self.stats.summary()}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Parse many resumes in parallel and write JSONL, Parquet or Arrow results")
+    parser.add_argument('inputs', nargs='*', help="Resume files, directories or glob patterns")
+    parser.add_argument('--manifest', help="File listing one resume path per line")
+    parser.add_argument('-o', '--output', help="Output file (defaults to stdout, JSONL only)")
+    parser.add_argument('--format', choices=['jsonl', 'parquet', 'arrow'],
+                        help="Output format, guessed from the output extension by default")
+    parser.add_argument('-w', '--workers', type=int, help="Number of worker processes (defaults to CPU count)")
+    parser.add_argument('--order', choices=['input', 'completion'], default='input',
+                        help="Emit results in input order or as soon as they complete")
+    parser.add_argument('--progress-every', type=int, default=100,
+                        help="Log progress every N resumes (0 disables)")
+    parser.add_argument('--cache-dir', default=os.environ.get('EXTRACTION_CACHE_DIR'),
+                        help="Extraction cache directory shared by all workers")
+    parser.add_argument('--no-raw-text', action='store_true', help="Omit the extracted raw text from the output")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    output_format = args.format
+    if output_format is None and args.output:
+        output_format = OUTPUT_FORMATS.get(os.path.splitext(args.output)[1].lower())
+    output_format = output_format or 'jsonl'
+    if output_format != 'jsonl' and not args.output:
+        parser.error(f"--format {output_format} needs an output file")
+
+    paths = collect_resume_paths(args.inputs, args.manifest)
+    if not paths:
+        parser.error("no resumes found")
+
+    batch = BatchResumeParser(workers=args.workers, order=args.order, progress_every=args.progress_every,
+                              cache_dir=args.cache_dir)
+
+    if output_format != 'jsonl':
+        # pyarrow is only imported when columnar output is asked for
+        from arrow_store import RESUME_SCHEMA, ResultWriter, resume_row
+        with ResultWriter(args.output, RESUME_SCHEMA, output_format) as writer:
+            for result in batch.run(paths):
+                if args.no_raw_text:
+                    result.pop('raw_text', None)
+                writer.write(resume_row(result))
+        return
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+    try:
+        for result in batch.run(paths):
+            if args.no_raw_text:
+                result.pop('raw_text', None)
+            output.write(json.dumps(result, ensure_ascii=False) + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import os
+import json
+import random
+import logging
+import argparse
+from typing import Dict, List, Optional, Sequence
+
+import docx
+
+from skill_matcher import get_skill_matcher
+
+FORMATS = ('pdf', 'docx', 'txt')
+
+_FILLER = (
+    "team project delivered improved designed built maintained led worked with customers "
+    "across several releases using modern tooling to reduce costs and increase reliability "
+    "for internal and external users while mentoring colleagues and reviewing changes"
+).split()
+_FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie"]
+_LAST_NAMES = ["Smith", "Garcia", "Chen", "Okafor", "Novak", "Silva", "Kim", "Patel"]
+_DEGREES = [
+    "Bachelor of Science in Computer Science",
+    "Master of Science in Data Science",
+    "BSc in Software Engineering",
+    "PhD in Machine Learning",
+]
+
+# Page layout of generated PDFs, in points and characters
+_PDF_LINE_CHARS = 95
+_PDF_LINES_PER_PAGE = 60
+
+
+def _sentence(rng: random.Random, skills: Sequence[str], skill_density: float) -> str:
+    words = rng.choices(_FILLER, k=rng.randint(8, 16))
+    if skills and rng.random() < skill_density:
+        words.insert(rng.randrange(len(words)), rng.choice(skills))
+        if rng.random() < skill_density:
+            words.insert(rng.randrange(len(words)), rng.choice(skills))
+    return " ".join(words).capitalize() + "."
+
+
+def generate_resume_text(rng: random.Random, skills: Sequence[str], words: int = 600,
+                         skill_density: float = 0.3) -> str:
+    """
+    Generate a plain-text resume of about ``words`` words
+
+    Args:
+        skills: Skill names to sprinkle over the experience section
+        skill_density (float): Share of sentences mentioning a skill, from 0 to 1
+    """
+    name = f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+    lines = [
+        name,
+        f"Email: {name.lower().replace(' ', '.')}@example.com",
+        f"Phone: 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "",
+        "Skills: " + ", ".join(rng.sample(list(skills), min(len(skills), 8))),
+        "",
+        "Experience",
+    ]
+
+    written = sum(len(line.split()) for line in lines)
+    while written < words:
+        paragraph = " ".join(_sentence(rng, skills, skill_density) for _ in range(rng.randint(3, 6)))
+        lines.append(paragraph)
+        written += len(paragraph.split())
+
+    lines += ["", "Education", f"{rng.choice(_DEGREES)}, State University, {rng.randint(2000, 2022)}."]
+    return "\n".join(lines)
+
+
+def generate_job_text(rng: random.Random, skills: Sequence[str], required: int = 6, preferred: int = 4) -> str:
+    """Generate a job description in the layout of ``test_data/job_descriptions.txt``"""
+    picked = rng.sample(list(skills), min(len(skills), required + preferred))
+    lines = ["# Generated Position", "Job Title: Software Engineer", "", "Required Skills:"]
+    lines += [f"- Experience with {skill} is required." for skill in picked[:required]]
+    lines += ["", "Preferred Skills:"]
+    lines += [f"- {skill} is preferred." for skill in picked[required:]]
+    lines += ["", "Education:", f"- {rng.choice(_DEGREES)} degree or equivalent.",
+              f"- {rng.randint(2, 8)}+ years of experience."]
+    return "\n".join(lines)
+
+
+def _wrap(text: str, width: int) -> List[str]:
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split():
+            if line and len(line) + 1 + len(word) > width:
+                lines.append(line)
+                line = word
+            else:
+                line = f"{line} {word}" if line else word
+        lines.append(line)
+    return lines
+
+
+def write_pdf(path: str, text: str):
+    """
+    Write text as a minimal multi-page PDF using the built-in Helvetica font
+
+    Only ASCII text is supported, which is all the generator produces.
+    """
+    lines = _wrap(text, _PDF_LINE_CHARS)
+    pages = [lines[i:i + _PDF_LINES_PER_PAGE] for i in range(0, len(lines), _PDF_LINES_PER_PAGE)] or [[]]
+
+    # Objects 1-3 are the catalog, page tree and font, then a page and its content per page
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page_lines in pages:
+        escaped = (line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in page_lines)
+        stream = ("BT /F1 10 Tf 12 TL 50 750 Td " + " ".join(f"({line}) Tj T*" for line in escaped) + " ET")
+        stream = stream.encode("latin-1", "replace")
+        page_number, content_number = len(objects) + 1, len(objects) + 2
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_number} 0 R >>".encode())
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(f"{page_number} 0 R")
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, 'wb') as file:
+        file.write(out)
+
+
+def write_docx(path: str, text: str):
+    document = docx.Document()
+    for paragraph in text.split("\n"):
+        document.add_paragraph(paragraph)
+    document.save(path)
+
+
+def write_txt(path: str, text: str):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(text)
+
+
+_WRITERS = {'pdf': write_pdf, 'docx': write_docx, 'txt': write_txt}
+
+
+def generate_corpus(directory: str, resumes: int = 30, jobs: int = 3, formats: Sequence[str] = FORMATS,
+                    words: int = 600, skill_density: float = 0.3, seed: int = 0,
+                    skills: Optional[Sequence[str]] = None) -> Dict:
+    """
+    Generate a reproducible corpus of resumes and job descriptions
+
+    Resumes cycle through ``formats``. Job descriptions are always TXT. A
+    ``manifest.json`` listing every file and the generation settings is
+    written next to them and also returned.
+    """
+    rng = random.Random(seed)
+    if skills is None:
+        skills = sorted(get_skill_matcher().names.values())
+    os.makedirs(directory, exist_ok=True)
+
+    manifest = {
+        'settings': {'resumes': resumes, 'jobs': jobs, 'formats': list(formats), 'words': words,
+                     'skill_density': skill_density, 'seed': seed},
+        'resumes': [],
+        'jobs': [],
+    }
+
+    for i in range(resumes):
+        file_format = formats[i % len(formats)]
+        path = os.path.join(directory, f"resume_{i:04d}.{file_format}")
+        _WRITERS[file_format](path, generate_resume_text(rng, skills, words, skill_density))
+        manifest['resumes'].append(path)
+
+    for i in range(jobs):
+        path = os.path.join(directory, f"job_{i:04d}.txt")
+        write_txt(path, generate_job_text(rng, skills))
+        manifest['jobs'].append(path)
+
+    with open(os.path.join(directory, 'manifest.json'), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+
+    return manifest
+
+
+def load_corpus(directory: str) -> Dict:
+    """Load the manifest of a corpus written by ``generate_corpus``"""
+    with open(os.path.join(directory, 'manifest.json'), 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume and job description corpus")
+    parser.add_argument('directory', help="Output directory")
+    parser.add_argument('--resumes', type=int, default=30, help="Number of resumes")
+    parser.add_argument('--jobs', type=int, default=3, help="Number of job descriptions")
+    parser.add_argument('--formats', default=','.join(FORMATS), help="Comma-separated resume formats")
+    parser.add_argument('--words', type=int, default=600, help="Approximate words per resume")
+    parser.add_argument('--skill-density', type=float, default=0.3,
+                        help="Share of sentences mentioning a skill, from 0 to 1")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    manifest = generate_corpus(args.directory, args.resumes, args.jobs, args.formats.split(','),
+                               args.words, args.skill_density, args.seed)
+    logging.getLogger(__name__).info(
+        f"Wrote {len(manifest['resumes'])} resumes and {len(manifest['jobs'])} job descriptions to {args.directory}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+# Cold import budgets in milliseconds. Each module is imported in a fresh
+# interpreter, so the budget covers everything it pulls in transitively.
+IMPORT_BUDGETS = {
+    'matching': 50,
+    'metrics': 50,
+    'resume_parser': 120,
+    'job_analyzer': 120,
+    'batch_parser': 150,
+    'job_feed': 120,
+    'job_queue': 150,
+    'analysis_service': 200,
+}
+
+# Slow-to-import libraries that must only be loaded once actually used
+HEAVY_MODULES = (
+    'spacy', 'sklearn', 'numpy', 'scipy', 'PyPDF2', 'pdfplumber', 'docx', 'textract',
+    'streamlit', 'pandas', 'plotly', 'torch', 'transformers', 'pyarrow',
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(module: str) -> Tuple[float, List[str]]:
+    """
+    Import a module in a fresh interpreter
+
+    Returns:
+        Cumulative import time in milliseconds and the heavy modules it loaded
+    """
+    code = (
+        f"import {module}, sys, json; "
+        f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    )
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+
+    # Lines look like "import time:  self [us] | cumulative | imported package",
+    # with nested imports indented under the package name
+    cumulative_us = None
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.rstrip() == f' {module}':
+            cumulative_us = int(cumulative)
+    if cumulative_us is None:
+        raise RuntimeError(f"No import time reported for {module}")
+
+    return cumulative_us / 1000, json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def check_budgets(budgets: Dict[str, float], runs: int = 5) -> List[Dict]:
+    """
+    Measure every module's best import time over ``runs`` cold starts
+
+    Returns:
+        One result per module with its time, budget, heavy imports and verdict
+    """
+    results = []
+    for module, budget in budgets.items():
+        timings, heavy = [], []
+        for _ in range(runs):
+            milliseconds, heavy = measure_import(module)
+            timings.append(milliseconds)
+        best = min(timings)
+        results.append({
+            'module': module,
+            'milliseconds': best,
+            'budget': budget,
+            'heavy_imports': heavy,
+            'ok': best <= budget and not heavy,
+        })
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Enforce cold import time budgets")
+    parser.add_argument('modules', nargs='*', help="Modules to check (defaults to every budgeted module)")
+    parser.add_argument('--runs', type=int, default=5, help="Cold starts per module, the fastest counts")
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiply every budget, e.g. for slow CI machines")
+    parser.add_argument('-o', '--output', help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    budgets = {module: IMPORT_BUDGETS.get(module, 0) * args.scale for module in args.modules or IMPORT_BUDGETS}
+    results = check_budgets(budgets, args.runs)
+
+    print(f"{'module':<20}{'ms':>10}{'budget':>10}  heavy imports")
+    for result in results:
+        print(f"{result['module']:<20}{result['milliseconds']:>10.1f}{result['budget']:>10.1f}  "
+              f"{', '.join(result['heavy_imports']) or '-'}{'' if result['ok'] else '  FAIL'}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+    if not all(result['ok'] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
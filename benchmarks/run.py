@@ -0,0 +1,252 @@
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import tempfile
+import tracemalloc
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.corpus import FORMATS, generate_corpus, load_corpus
+from doc_cache import DocCache
+from resume_parser import ResumeParser, PARSER_VERSION
+from job_analyzer import JobAnalyzer
+
+# Bump when the layout of the results file changes
+RESULTS_FORMAT = 1
+
+STAGES = (
+    'extract_text', '_clean_text', 'extract_skills', 'extract_contact_info', 'extract_education',
+    'extract_requirements', 'calculate_match_score', 'analyze_skill_gaps',
+    # Whole corpus at once through nlp.pipe, one sample per repetition
+    'extract_education_batch', 'extract_requirements_batch', 'analyze_skill_gaps_batch',
+)
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {'count': 0}
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    return {
+        'count': len(ordered),
+        'total': sum(ordered),
+        'mean': sum(ordered) / len(ordered),
+        'p50': percentile(0.5),
+        'p95': percentile(0.95),
+        'min': ordered[0],
+        'max': ordered[-1],
+    }
+
+
+def _timed(samples: Dict[str, List[float]], stage: str, function: Callable, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    samples[stage].append(time.perf_counter() - started)
+    return result
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_benchmarks(manifest: Dict, repeat: int = 3, warm: bool = False) -> Dict:
+    """
+    Time every pipeline stage on a corpus, then the whole pipeline end to end
+
+    Unless ``warm`` is set, the Doc cache stores nothing and the extraction
+    cache is disabled, so every repetition measures the full cost of a stage.
+    Models are loaded before any timing starts.
+
+    Returns:
+        JSON-serializable results with per-stage timing statistics, end-to-end
+        throughput and peak memory
+    """
+    doc_cache = DocCache() if warm else DocCache(max_chars=0)
+    resume_parser = ResumeParser(doc_cache=doc_cache)
+    job_analyzer = JobAnalyzer(doc_cache=doc_cache)
+    if not warm:
+        resume_parser.extraction_cache = None
+
+    resume_paths, job_paths = manifest['resumes'], manifest['jobs']
+    jobs = []
+    for path in job_paths:
+        with open(path, 'r', encoding='utf-8') as file:
+            jobs.append(file.read())
+
+    # Load models and lazily imported libraries up front so the first timed call doesn't pay for them
+    job_analyzer.extract_requirements(jobs[0] if jobs else "Warm up.")
+    job_analyzer.calculate_match_score("Warm up.", "Warm up.")
+    resume_parser.extract_education("Warm up.")
+    job_analyzer.analyze_skill_gaps([], {'required_skills': ["Warm up."]})
+
+    samples: Dict[str, List[float]] = defaultdict(list)
+    for _ in range(repeat):
+        texts, comparisons = [], []
+        for path in resume_paths:
+            text = _timed(samples, 'extract_text', resume_parser.extract_text, path)
+            # extract_text already cleans its result, so clean the extractor's raw output instead
+            raw_text = resume_parser.extractors.extract(path).text
+            _timed(samples, '_clean_text', resume_parser._clean_text, raw_text)
+            skills = _timed(samples, 'extract_skills', resume_parser.extract_skills, text)
+            texts.append(text)
+            _timed(samples, 'extract_contact_info', resume_parser.extract_contact_info, text)
+            _timed(samples, 'extract_education', resume_parser.extract_education, text)
+
+            for job in jobs:
+                requirements = _timed(samples, 'extract_requirements', job_analyzer.extract_requirements, job)
+                _timed(samples, 'calculate_match_score', job_analyzer.calculate_match_score, text, job)
+                _timed(samples, 'analyze_skill_gaps', job_analyzer.analyze_skill_gaps, skills, requirements)
+                comparisons.append((skills, requirements))
+
+        _timed(samples, 'extract_education_batch', resume_parser.extract_education_batch, texts)
+        _timed(samples, 'extract_requirements_batch', job_analyzer.extract_requirements_batch, jobs)
+        _timed(samples, 'analyze_skill_gaps_batch', job_analyzer.analyze_skill_gaps_batch, comparisons)
+
+    def end_to_end():
+        for path in resume_paths:
+            resume = resume_parser.parse_resume(path)
+            for job in jobs:
+                requirements = job_analyzer.extract_requirements(job)
+                job_analyzer.calculate_match_score(resume['raw_text'], job)
+                job_analyzer.analyze_skill_gaps(resume['skills'], requirements)
+
+    # End to end: parse every resume and match it against every job. Tracing
+    # allocations slows Python down, so memory is measured in a separate pass.
+    input_bytes = sum(os.path.getsize(path) for path in resume_paths)
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    end_to_end()
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    tracemalloc.start()
+    end_to_end()
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'format': RESULTS_FORMAT,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'parser_version': PARSER_VERSION,
+        },
+        'settings': {'repeat': repeat, 'warm': warm, 'corpus': manifest.get('settings', {}),
+                     'resumes': len(resume_paths), 'jobs': len(jobs)},
+        'stages': {stage: _summarize(samples[stage]) for stage in STAGES},
+        'end_to_end': {
+            'seconds': elapsed,
+            'cpu_seconds': cpu,
+            'resumes_per_second': len(resume_paths) / elapsed if elapsed else 0.0,
+            'bytes_per_second': input_bytes / elapsed if elapsed else 0.0,
+            'peak_traced_bytes': peak_traced,
+            'peak_rss_bytes': _peak_rss_bytes(),
+        },
+    }
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.1) -> List[str]:
+    """
+    Compare results against a baseline
+
+    A stage regresses when its median time grows by more than ``threshold``
+    (a fraction), and the whole pipeline when its throughput drops or its
+    peak traced memory grows by more than that.
+
+    Returns:
+        One message per regression, empty if there are none
+    """
+    regressions = []
+
+    for stage in STAGES:
+        before = baseline.get('stages', {}).get(stage, {}).get('p50')
+        after = current['stages'].get(stage, {}).get('p50')
+        if before and after and after > before * (1 + threshold):
+            regressions.append(f"{stage}: median {before * 1000:.3f} ms -> {after * 1000:.3f} ms "
+                               f"(+{(after / before - 1) * 100:.1f}%)")
+
+    before_e2e, after_e2e = baseline.get('end_to_end', {}), current['end_to_end']
+    before, after = before_e2e.get('resumes_per_second'), after_e2e['resumes_per_second']
+    if before and after < before * (1 - threshold):
+        regressions.append(f"throughput: {before:.2f} -> {after:.2f} resumes/s "
+                           f"({(after / before - 1) * 100:.1f}%)")
+
+    before, after = before_e2e.get('peak_traced_bytes'), after_e2e['peak_traced_bytes']
+    if before and after > before * (1 + threshold):
+        regressions.append(f"peak memory: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB "
+                           f"(+{(after / before - 1) * 100:.1f}%)")
+
+    return regressions
+
+
+def format_results(results: Dict) -> str:
+    lines = [f"{'stage':<24}{'calls':>8}{'p50 ms':>12}{'p95 ms':>12}{'total s':>12}"]
+    for stage, stats in results['stages'].items():
+        if stats['count']:
+            lines.append(f"{stage:<24}{stats['count']:>8}{stats['p50'] * 1000:>12.3f}"
+                         f"{stats['p95'] * 1000:>12.3f}{stats['total']:>12.3f}")
+    e2e = results['end_to_end']
+    lines.append(f"end to end: {e2e['seconds']:.2f} s, {e2e['resumes_per_second']:.2f} resumes/s, "
+                 f"peak traced memory {e2e['peak_traced_bytes'] / 1e6:.1f} MB")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resume analysis pipeline stage by stage")
+    parser.add_argument('--corpus', help="Existing corpus directory (generated into a temporary one by default)")
+    parser.add_argument('--resumes', type=int, default=30, help="Number of generated resumes")
+    parser.add_argument('--jobs', type=int, default=3, help="Number of generated job descriptions")
+    parser.add_argument('--formats', default=','.join(FORMATS), help="Comma-separated resume formats")
+    parser.add_argument('--words', type=int, default=600, help="Approximate words per generated resume")
+    parser.add_argument('--skill-density', type=float, default=0.3, help="Share of sentences mentioning a skill")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed of the generated corpus")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetitions of the per-stage measurements")
+    parser.add_argument('--warm', action='store_true', help="Keep Doc and extraction caches enabled")
+    parser.add_argument('-o', '--output', help="Write results as JSON to this file")
+    parser.add_argument('--compare', help="Baseline results file to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="Allowed slowdown as a fraction before a change counts as a regression")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.corpus:
+            manifest = load_corpus(args.corpus)
+        else:
+            manifest = generate_corpus(tmp_dir, args.resumes, args.jobs, args.formats.split(','),
+                                       args.words, args.skill_density, args.seed)
+        results = run_benchmarks(manifest, args.repeat, args.warm)
+
+    print(format_results(results))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare_results(baseline, results, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold * 100:.0f}% against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
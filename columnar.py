@@ -0,0 +1,395 @@
+import sys
+import json
+import logging
+import argparse
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from skill_matcher import get_skill_matcher
+
+# Compact, column-oriented resume and job results for matching at scale.
+# Skill names are interned once into integer IDs and every table keeps its
+# skills as a bit-packed matrix, one row per resume or job and one bit per
+# skill, so overlaps between whole batches are bitwise ANDs and popcounts.
+
+# Number of set bits in every byte value, for NumPy versions without bitwise_count
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def _popcount(packed: np.ndarray) -> np.ndarray:
+    """Set bits per row of a packed matrix, summed over its last axis"""
+    if hasattr(np, 'bitwise_count'):
+        counts = np.bitwise_count(packed)
+    else:
+        counts = _POPCOUNT[packed]
+    return counts.sum(axis=-1, dtype=np.int32)
+
+
+class SkillVocabulary:
+    """Interns lowercased skill names into dense integer IDs"""
+
+    __slots__ = ('ids', 'names')
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        for name in names:
+            self.intern(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, name: str) -> int:
+        """The ID of a skill name, assigning the next free one on first sight"""
+        name = name.lower()
+        skill_id = self.ids.get(name)
+        if skill_id is None:
+            skill_id = len(self.names)
+            name = sys.intern(name)
+            self.ids[name] = skill_id
+            self.names.append(name)
+        return skill_id
+
+    def lookup(self, skill_ids: Iterable[int]) -> List[str]:
+        return [self.names[skill_id] for skill_id in skill_ids]
+
+
+class SkillMatrix:
+    """
+    Bit-packed boolean matrix of entities by skills
+
+    Bits are packed big-endian along each row as by ``np.packbits``, so bit
+    ``i`` of a row lives in byte ``i // 8``. Rows of different widths are
+    compared by padding the narrower matrix with zero bytes.
+    """
+
+    __slots__ = ('packed', 'counts')
+
+    def __init__(self, packed: np.ndarray):
+        self.packed = packed
+        self.counts = _popcount(packed)
+
+    @classmethod
+    def from_ids(cls, rows: Sequence[Iterable[int]], n_skills: int) -> 'SkillMatrix':
+        """Pack one row per sequence of skill IDs"""
+        packed = np.zeros((len(rows), (n_skills + 7) // 8), dtype=np.uint8)
+        row_index = np.fromiter((i for i, ids in enumerate(rows) for _ in ids), dtype=np.int64)
+        skill_ids = np.fromiter((skill_id for ids in rows for skill_id in ids), dtype=np.int64)
+        if len(skill_ids):
+            bits = np.right_shift(0x80, skill_ids & 7).astype(np.uint8)
+            np.bitwise_or.at(packed, (row_index, skill_ids >> 3), bits)
+        return cls(packed)
+
+    def __len__(self) -> int:
+        return self.packed.shape[0]
+
+    def widened(self, n_bytes: int) -> np.ndarray:
+        """The packed rows padded with zero bytes to ``n_bytes`` columns"""
+        missing = n_bytes - self.packed.shape[1]
+        if missing <= 0:
+            return self.packed
+        return np.pad(self.packed, ((0, 0), (0, missing)))
+
+    def row_ids(self, row: int) -> np.ndarray:
+        """Skill IDs set in one row"""
+        return np.flatnonzero(np.unpackbits(self.packed[row]))
+
+
+class ResumeRecord:
+    """Compact parsed resume. Skills live in the owning table's matrix."""
+
+    __slots__ = ('file_path', 'email', 'phone', 'education')
+
+    def __init__(self, file_path: Optional[str], email: Optional[str] = None, phone: Optional[str] = None,
+                 education: Tuple[str, ...] = ()):
+        self.file_path = file_path
+        self.email = email
+        self.phone = phone
+        self.education = education
+
+
+class JobRecord:
+    """Compact analyzed job posting. Skills live in the owning table's matrix."""
+
+    __slots__ = ('job_id', 'title')
+
+    def __init__(self, job_id: Optional[str], title: str = ''):
+        self.job_id = job_id
+        self.title = title
+
+
+class _SkillTable:
+    """Records plus their skills, packed into a matrix on first use after a change"""
+
+    def __init__(self, vocabulary: Optional[SkillVocabulary] = None):
+        self.vocabulary = vocabulary if vocabulary is not None else SkillVocabulary()
+        self.records: List[Any] = []
+        self._skill_ids: List[Tuple[int, ...]] = []
+        self._matrix: Optional[SkillMatrix] = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _append(self, record: Any, skills: Iterable[str]) -> int:
+        intern = self.vocabulary.intern
+        self._skill_ids.append(tuple(sorted({intern(skill) for skill in skills})))
+        self.records.append(record)
+        self._matrix = None
+        return len(self.records) - 1
+
+    @property
+    def matrix(self) -> SkillMatrix:
+        if self._matrix is None:
+            self._matrix = SkillMatrix.from_ids(self._skill_ids, len(self.vocabulary))
+        return self._matrix
+
+    def skills(self, row: int) -> List[str]:
+        return self.vocabulary.lookup(self._skill_ids[row])
+
+
+class ResumeTable(_SkillTable):
+    """
+    Column-oriented store of parsed resumes
+
+    Raw text is only kept when ``keep_text`` is set, and then in its own list,
+    so tables used purely for matching hold no text at all.
+    """
+
+    def __init__(self, vocabulary: Optional[SkillVocabulary] = None, keep_text: bool = False):
+        super().__init__(vocabulary)
+        self.texts: Optional[List[Optional[str]]] = [] if keep_text else None
+
+    def append(self, resume_data: Dict[str, Any]) -> int:
+        """Add the output of ``ResumeParser.parse_resume`` and return its row"""
+        contact_info = resume_data.get('contact_info') or {}
+        record = ResumeRecord(
+            resume_data.get('file_path'),
+            contact_info.get('email'),
+            contact_info.get('phone'),
+            tuple(entry.get('description', '') for entry in resume_data.get('education') or []),
+        )
+        if self.texts is not None:
+            self.texts.append(resume_data.get('raw_text'))
+        return self._append(record, resume_data.get('skills') or [])
+
+    def extend(self, resumes: Iterable[Dict[str, Any]]):
+        for resume_data in resumes:
+            self.append(resume_data)
+
+    def to_dict(self, row: int) -> Dict[str, Any]:
+        """A resume in the shape returned by ``ResumeParser.parse_resume``, with lowercased skill names"""
+        record = self.records[row]
+        contact_info = {}
+        if record.email:
+            contact_info['email'] = record.email
+        if record.phone:
+            contact_info['phone'] = record.phone
+        return {
+            'raw_text': self.texts[row] if self.texts is not None else None,
+            'skills': self.skills(row),
+            'contact_info': contact_info,
+            'file_path': record.file_path,
+            'education': [{'description': description} for description in record.education],
+        }
+
+
+class JobTable(_SkillTable):
+    """
+    Column-oriented store of job postings and their required skills
+
+    Required skills are the taxonomy skills named in the required-skill
+    sentences, as in ``matching.match_resume_to_job``.
+    """
+
+    def __init__(self, vocabulary: Optional[SkillVocabulary] = None, skill_matcher=None):
+        super().__init__(vocabulary)
+        self.skill_matcher = skill_matcher if skill_matcher else get_skill_matcher()
+
+    def append(self, requirements: Dict[str, List[str]], job_id: Optional[str] = None, title: str = '') -> int:
+        """Add the output of ``JobAnalyzer.extract_requirements`` and return its row"""
+        skills = self.skill_matcher.skill_names(' '.join(requirements.get('required_skills', [])))
+        return self._append(JobRecord(job_id, title), skills)
+
+    def append_skills(self, skills: Iterable[str], job_id: Optional[str] = None, title: str = '') -> int:
+        """Add a posting whose required skills are already known"""
+        return self._append(JobRecord(job_id, title), skills)
+
+    @classmethod
+    def from_index(cls, index, vocabulary: Optional[SkillVocabulary] = None) -> 'JobTable':
+        """Load every posting of a ``job_feed.JobIndex`` without re-analyzing any"""
+        table = cls(vocabulary, index.skill_matcher)
+        postings: Dict[int, Tuple[str, str, List[str]]] = {}
+        for row_id, job_id, title in index.conn.execute('SELECT id, job_id, title FROM jobs ORDER BY id'):
+            postings[row_id] = (job_id, title, [])
+        for row_id, skill in index.conn.execute('SELECT job_id, skill FROM job_skills WHERE required = 1'):
+            postings[row_id][2].append(skill)
+        for job_id, title, skills in postings.values():
+            table.append_skills(skills, job_id, title)
+        return table
+
+
+class MatchMatrix(NamedTuple):
+    # Required skills of each job that each resume has, resumes by jobs
+    overlap: np.ndarray
+    # Share of each job's required skills each resume has, in percent
+    scores: np.ndarray
+
+
+def _same_vocabulary(resumes: _SkillTable, jobs: _SkillTable):
+    if resumes.vocabulary is not jobs.vocabulary:
+        raise ValueError("Resume and job tables must share one SkillVocabulary")
+
+
+def _score_chunks(resumes: ResumeTable, jobs: JobTable,
+                  max_chunk_bytes: int) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    """(first resume row, overlap, scores) of consecutive resume chunks against every job"""
+    _same_vocabulary(resumes, jobs)
+    resume_matrix, job_matrix = resumes.matrix, jobs.matrix
+    n_bytes = max(resume_matrix.packed.shape[1], job_matrix.packed.shape[1])
+    resume_bits, job_bits = resume_matrix.widened(n_bytes), job_matrix.widened(n_bytes)
+    totals = job_matrix.counts.astype(np.float64)
+
+    # Per resume: the AND of its bits with every job's, plus int32 overlaps and float64 scores
+    chunk = max(1, max_chunk_bytes // max(1, len(job_matrix) * (n_bytes + 12)))
+    for start in range(0, len(resume_matrix), chunk):
+        both = resume_bits[start:start + chunk, None, :] & job_bits[None, :, :]
+        overlap = _popcount(both)
+        scores = np.divide(overlap * 100.0, totals, out=np.zeros(overlap.shape), where=totals > 0)
+        yield start, overlap, scores
+
+
+def match_tables(resumes: ResumeTable, jobs: JobTable,
+                 max_chunk_bytes: int = 64 * 1024 * 1024) -> MatchMatrix:
+    """
+    Skill overlap and match score of every resume against every job
+
+    Scores follow ``matching.match_resume_to_job``: matched required skills
+    over all required skills of the job, 0 for jobs without any. Resumes are
+    processed in chunks whose intermediate matrices stay below
+    ``max_chunk_bytes``. The result holds two dense resumes by jobs matrices;
+    use ``top_jobs`` when only the best matches are needed.
+    """
+    overlap = np.zeros((len(resumes), len(jobs)), dtype=np.int32)
+    scores = np.zeros((len(resumes), len(jobs)))
+    for start, chunk_overlap, chunk_scores in _score_chunks(resumes, jobs, max_chunk_bytes):
+        overlap[start:start + len(chunk_overlap)] = chunk_overlap
+        scores[start:start + len(chunk_scores)] = chunk_scores
+    return MatchMatrix(overlap, scores)
+
+
+def match_pairs(resumes: ResumeTable, jobs: JobTable, pairs: Sequence[Tuple[int, int]]) -> List[Dict[str, Any]]:
+    """
+    Detailed analyses for (resume row, job row) pairs, as ``matching.match_resume_to_job`` returns them
+
+    Matched and missing skills of all pairs come from two bitwise operations
+    over the gathered rows.
+    """
+    _same_vocabulary(resumes, jobs)
+    if not pairs:
+        return []
+    resume_matrix, job_matrix = resumes.matrix, jobs.matrix
+    n_bytes = max(resume_matrix.packed.shape[1], job_matrix.packed.shape[1])
+    rows = np.asarray(pairs, dtype=np.int64)
+    resume_bits = resume_matrix.widened(n_bytes)[rows[:, 0]]
+    job_bits = job_matrix.widened(n_bytes)[rows[:, 1]]
+
+    matched = np.unpackbits(resume_bits & job_bits, axis=1)
+    missing = np.unpackbits(job_bits & ~resume_bits, axis=1)
+    totals = job_matrix.counts[rows[:, 1]]
+
+    names = resumes.vocabulary.lookup
+    return [
+        {
+            'match_score': matched[i].sum() / totals[i] * 100 if totals[i] else 0,
+            'total_job_skills': int(totals[i]),
+            'matched_skills': names(np.flatnonzero(matched[i])),
+            'recommended_improvements': names(np.flatnonzero(missing[i])),
+        }
+        for i in range(len(rows))
+    ]
+
+
+def top_jobs(resumes: ResumeTable, jobs: JobTable, k: int = 10,
+             max_chunk_bytes: int = 64 * 1024 * 1024) -> Iterator[List[Tuple[int, float]]]:
+    """
+    The ``k`` best (job row, score) pairs of every resume, best first
+
+    Scores are ranked one resume chunk at a time, so memory is bounded by
+    ``max_chunk_bytes`` however many resumes and jobs there are.
+    """
+    # Imported here since ranking pulls in the TF-IDF model helpers
+    from ranking import top_k_rows
+
+    for _, _, scores in _score_chunks(resumes, jobs, max_chunk_bytes):
+        indices, top_scores = top_k_rows(scores, k)
+        for row_indices, row_scores in zip(indices, top_scores):
+            yield [(int(job), float(score)) for job, score in zip(row_indices, row_scores)]
+
+
+def _iter_results(path: str) -> Iterator[Dict[str, Any]]:
+    if path.lower().endswith(('.parquet', '.pq', '.arrow', '.feather', '.ipc')):
+        # pyarrow is only imported for columnar input
+        from arrow_store import iter_resumes, open_results
+        yield from iter_resumes(open_results(path, ['file_path', 'error', 'skills', 'email', 'phone', 'education']))
+        return
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Match parsed resumes against every indexed job posting")
+    parser.add_argument('resumes', help="JSONL, Parquet or Arrow output of batch_parser.py")
+    parser.add_argument('index', help="Job index built by job_feed.py")
+    parser.add_argument('--top', type=int, default=5, help="Jobs listed per resume")
+    parser.add_argument('-o', '--output', help="Write one row per match to a Parquet or Arrow file instead of JSONL")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    # Imported here so the module itself stays free of SQLite and feed code
+    from job_feed import JobIndex
+
+    vocabulary = SkillVocabulary()
+    with JobIndex(args.index) as index:
+        jobs = JobTable.from_index(index, vocabulary)
+    resumes = ResumeTable(vocabulary)
+    resumes.extend(result for result in _iter_results(args.resumes) if not result.get('error'))
+    logging.getLogger(__name__).info(
+        f"Matching {len(resumes)} resumes against {len(jobs)} jobs over {len(vocabulary)} skills"
+    )
+
+    writer = None
+    if args.output:
+        from arrow_store import MATCH_SCHEMA, ResultWriter
+        writer = ResultWriter(args.output, MATCH_SCHEMA)
+
+    try:
+        for row, ranking in enumerate(top_jobs(resumes, jobs, args.top)):
+            pairs = [(row, job) for job, _ in ranking]
+            matches = []
+            for (_, job), analysis in zip(pairs, match_pairs(resumes, jobs, pairs)):
+                record = jobs.records[job]
+                matches.append({'job_id': record.job_id, 'title': record.title, **analysis})
+
+            file_path = resumes.records[row].file_path
+            if writer is None:
+                print(json.dumps({'file_path': file_path, 'matches': matches}, ensure_ascii=False))
+                continue
+            for match in matches:
+                writer.write({
+                    'file_path': file_path,
+                    'job_id': match['job_id'],
+                    'title': match['title'],
+                    'match_score': match['match_score'],
+                    'total_job_skills': match['total_job_skills'],
+                    'matched_skills': match['matched_skills'],
+                    'missing_skills': match['recommended_improvements'],
+                })
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+if __name__ == "__main__":
+    main()
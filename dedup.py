@@ -0,0 +1,277 @@
+import os
+import json
+import zlib
+import logging
+import argparse
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from metrics import get_metrics
+
+# Near-duplicate resume detection. Cleaned resume text is cut into word
+# shingles and summarized by a MinHash signature. Signatures are split into
+# bands for locality-sensitive hashing, so finding the earlier copies of a
+# resume only looks at the few resumes that share a band bucket with it
+# instead of comparing against every resume seen so far.
+
+# Signature value of a text without shingles, above any hash value
+_EMPTY = 1 << 32
+
+
+def _false_rates(threshold: float, bands: int, rows: int, steps: int = 100) -> Tuple[float, float]:
+    """Areas under the LSH candidate curve below and above the threshold"""
+    def probability(s: float) -> float:
+        return 1 - (1 - s ** rows) ** bands
+
+    below = sum(probability(threshold * (i + 0.5) / steps) for i in range(steps)) * threshold / steps
+    width = 1 - threshold
+    above = sum(1 - probability(threshold + width * (i + 0.5) / steps) for i in range(steps)) * width / steps
+    return below, above
+
+
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Bands and rows per band that best separate pairs around ``threshold``
+
+    Minimizes the sum of the false positive and false negative probability
+    mass of the banding scheme.
+    """
+    best, best_error = (1, num_perm), float('inf')
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            error = sum(_false_rates(threshold, bands, rows))
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class MinHasher:
+    """MinHash signatures over the word shingles of a text"""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # Multiply-add-shift hashing of the 32-bit shingle hashes: the high half of
+        # (a * hash + b) mod 2**64 with random odd a. Each permutation orders the
+        # shingles independently of their hash order, which small multipliers
+        # modulo a large prime would not.
+        self._a = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2)
+
+    def shingles(self, text: str) -> Set[str]:
+        words = text.lower().split()
+        if len(words) <= self.shingle_size:
+            return {' '.join(words)} if words else set()
+        return {' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text, ``num_perm`` unsigned 64-bit values"""
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) for shingle in self.shingles(text)), dtype=np.uint64
+        )
+        if not len(hashes):
+            return np.full(self.num_perm, _EMPTY, dtype=np.uint64)
+        # uint64 arithmetic wraps around, which is the mod 2**64
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) >> np.uint64(32)
+        return permuted.min(axis=1)
+
+
+def similarity(signature: np.ndarray, other: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures"""
+    return float(np.count_nonzero(signature == other)) / len(signature)
+
+
+class LSHIndex:
+    """
+    Banded locality-sensitive hashing index of MinHash signatures
+
+    Candidates sharing at least one band bucket with a query are verified
+    against the full signatures, so results only contain keys whose
+    estimated similarity reaches ``threshold``.
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"Threshold must be in (0, 1]: {threshold}")
+        self.threshold = threshold
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key: str, signature: np.ndarray):
+        with self._lock:
+            if key in self._signatures:
+                raise KeyError(f"Already indexed: {key}")
+            self._signatures[key] = signature
+            for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+                buckets.setdefault(band_key, []).append(key)
+
+    def query(self, signature: np.ndarray) -> List[Tuple[str, float]]:
+        """Indexed keys at or above the threshold with their similarity, most similar first"""
+        with self._lock:
+            candidates = set()
+            for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(buckets.get(band_key, ()))
+            scored = [(key, similarity(signature, self._signatures[key])) for key in candidates]
+        matches = [(key, score) for key, score in scored if score >= self.threshold]
+        return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+
+class DedupPipeline:
+    """
+    Parse and match resumes, reusing earlier results for near-duplicates
+
+    Each new resume's text is looked up in an LSH index of the distinct
+    resumes seen so far. A copy at or above ``threshold`` similarity reuses
+    the skills and education of its original and every match result already
+    computed for it. Contact info is cheap to extract and is always taken
+    from the copy's own text. Text extraction itself still runs for every
+    file; byte-identical files are already served by the extraction cache.
+    """
+
+    def __init__(self, resume_parser=None, threshold: float = 0.9, num_perm: int = 128, shingle_size: int = 3):
+        if resume_parser is None:
+            # Imported here so the index can be used without loading NLP code
+            from resume_parser import ResumeParser
+            resume_parser = ResumeParser()
+        self.resume_parser = resume_parser
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.index = LSHIndex(threshold, num_perm)
+        self.logger = logging.getLogger(__name__)
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._clusters: Dict[str, List[str]] = {}
+        self._matches: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._keys: Set[str] = set()
+
+    def _new_key(self, file_path: Optional[str]) -> str:
+        """A key for a resume, its file path unless that is missing or taken. Call with the lock held."""
+        key = file_path or 'resume'
+        if key in self._keys or not file_path:
+            key = f"{key}#{len(self._keys) + 1}"
+        self._keys.add(key)
+        return key
+
+    def parse_resume(self, source, name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Parse a resume like ``ResumeParser.parse_resume``
+
+        Results additionally carry ``dedup_key``, the key the resume is known
+        by, and for near-duplicates ``duplicate_of`` and ``similarity``.
+        """
+        parser = self.resume_parser
+        file_path = os.fspath(source) if isinstance(source, (str, os.PathLike)) else name
+        text = parser.extract_text(source, name=name)
+        signature = self.hasher.signature(parser._clean_text(text))
+
+        matches = self.index.query(signature) if text else []
+        if matches:
+            original, score = matches[0]
+            get_metrics().inc('cache_hits', cache='dedup')
+            with self._lock:
+                key = self._new_key(file_path)
+                self._clusters[original].append(key)
+            return {
+                **self._results[original],
+                'raw_text': text,
+                'contact_info': parser.extract_contact_info(text),
+                'file_path': file_path,
+                'dedup_key': key,
+                'duplicate_of': original,
+                'similarity': score,
+            }
+
+        get_metrics().inc('cache_misses', cache='dedup')
+        result = parser.parse_text(text, file_path)
+        with self._lock:
+            key = self._new_key(file_path)
+            # Failed extractions are not indexed, or every empty file would match every other
+            if text:
+                self._results[key] = {field: result[field] for field in ('skills', 'education')}
+                self._clusters[key] = []
+        if text:
+            self.index.add(key, signature)
+        return {**result, 'dedup_key': key}
+
+    def match(self, resume_data: Dict[str, Any], job_key: str, job_data: Dict[str, Any],
+              compute: Optional[Callable[[Dict, Dict], Dict]] = None) -> Dict[str, Any]:
+        """
+        Match a resume from ``parse_resume`` against a job, computing each distinct pair once
+
+        Args:
+            resume_data: Result of ``parse_resume``
+            job_key (str): Identifies the job description
+            job_data: Job data passed to ``compute``
+            compute: Matching function, defaults to ``matching.match_resume_to_job``
+        """
+        if compute is None:
+            from matching import match_resume_to_job
+            compute = match_resume_to_job
+        original = resume_data.get('duplicate_of') or resume_data.get('dedup_key')
+        cache_key = (original, job_key)
+
+        with self._lock:
+            cached = self._matches.get(cache_key) if original else None
+        if cached is not None:
+            get_metrics().inc('cache_hits', cache='dedup_match')
+            return cached
+
+        get_metrics().inc('cache_misses', cache='dedup_match')
+        analysis = compute(resume_data, job_data)
+        if original:
+            with self._lock:
+                self._matches[cache_key] = analysis
+        return analysis
+
+    def clusters(self) -> List[Dict[str, Any]]:
+        """Every resume with near-duplicates, and those duplicates, largest cluster first"""
+        with self._lock:
+            clusters = [
+                {'original': original, 'duplicates': list(duplicates)}
+                for original, duplicates in self._clusters.items() if duplicates
+            ]
+        return sorted(clusters, key=lambda cluster: (-len(cluster['duplicates']), cluster['original']))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Report clusters of near-duplicate resumes")
+    parser.add_argument('inputs', nargs='*', help="Resume files, directories or glob patterns")
+    parser.add_argument('--manifest', help="File listing one resume path per line")
+    parser.add_argument('--threshold', type=float, default=0.9, help="Estimated Jaccard similarity of duplicates")
+    parser.add_argument('--num-perm', type=int, default=128, help="MinHash permutations")
+    parser.add_argument('--shingle-size', type=int, default=3, help="Words per shingle")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    from batch_parser import collect_resume_paths
+    paths = collect_resume_paths(args.inputs, args.manifest)
+    if not paths:
+        parser.error("no resumes found")
+
+    pipeline = DedupPipeline(threshold=args.threshold, num_perm=args.num_perm, shingle_size=args.shingle_size)
+    duplicates = 0
+    for path in paths:
+        try:
+            duplicates += 'duplicate_of' in pipeline.parse_resume(path)
+        except Exception as e:
+            pipeline.logger.error(f"Failed to parse {path}: {e}")
+
+    for cluster in pipeline.clusters():
+        print(json.dumps(cluster, ensure_ascii=False))
+    pipeline.logger.info(f"{duplicates} of {len(paths)} resumes were near-duplicates")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,161 @@
 import sys
 import os
+import threading
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QLabel, QFileDialog, QTextEdit, 
-                             QMessageBox, QTabWidget, QTableWidget, QTableWidgetItem, 
-                             QProgressBar, QGridLayout, QScrollArea)
+                             QMessageBox, QTabWidget, QTableView, QHeaderView,
+                             QAbstractItemView, QProgressBar, QGridLayout, QScrollArea)
 from PyQt6.QtGui import QFont, QIcon, QPixmap
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import (Qt, QSize, QObject, QRunnable, QThreadPool, QAbstractTableModel,
+                          QModelIndex, QSortFilterProxyModel, pyqtSignal)
 
-from resume_parser import parse_resume
-from job_analyzer import analyze_job_description
-from app import match_resume_to_job
+from resume_parser import ResumeParser
+from job_analyzer import JobAnalyzer
+from matching import match_resume_to_job
+
+TABLE_STYLE = """
+    QTableView {
+        background-color: #31363F;
+        color: #EEEEEE;
+        gridline-color: #76ABAE;
+    }
+    QHeaderView::section {
+        background-color: #76ABAE;
+        color: #222831;
+    }
+"""
+
+class WorkerSignals(QObject):
+    """Signals of a background task, delivered to slots on the GUI thread"""
+    # Batch ID, row and result
+    result = pyqtSignal(int, int, object)
+    # Batch ID, row and error message
+    failed = pyqtSignal(int, int, str)
+
+class AnalysisTask(QRunnable):
+    """
+    Run one analysis step on the shared thread pool
+
+    The task is skipped if its batch was cancelled before it started, so
+    cancelling only has to wait for the tasks already running.
+    """
+
+    def __init__(self, batch_id, row, cancelled, function, *args):
+        super().__init__()
+        self.batch_id = batch_id
+        self.row = row
+        self.cancelled = cancelled
+        self.function = function
+        self.args = args
+        self.signals = WorkerSignals()
+
+    def run(self):
+        if self.cancelled.is_set():
+            return
+        try:
+            result = self.function(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(self.batch_id, self.row, str(e))
+        else:
+            self.signals.result.emit(self.batch_id, self.row, result)
+
+class CandidateTableModel(QAbstractTableModel):
+    """One row per queued resume, filled in as its analysis finishes"""
+
+    HEADERS = ["Resume", "Status", "Match Score", "Matched Skills", "Missing Skills"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        match = row["match"]
+        column = index.column()
+
+        # Sort on raw numbers rather than on their display strings
+        if role == Qt.ItemDataRole.UserRole:
+            if column == 2:
+                return match["match_score"] if match else -1.0
+            if column == 3:
+                return len(match["matched_skills"]) if match else -1
+            if column == 4:
+                return len(match["recommended_improvements"]) if match else -1
+            role = Qt.ItemDataRole.DisplayRole
+
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if column == 0:
+            return os.path.basename(row["path"])
+        if column == 1:
+            return row["status"]
+        if not match:
+            return ""
+        if column == 2:
+            return f"{match['match_score']:.1f}%"
+        if column == 3:
+            return len(match["matched_skills"])
+        return len(match["recommended_improvements"])
+
+    def set_paths(self, paths):
+        self.beginResetModel()
+        self.rows = [{"path": path, "status": "Queued", "match": None} for path in paths]
+        self.endResetModel()
+
+    def set_status(self, row, status, match=None):
+        self.rows[row]["status"] = status
+        if match is not None:
+            self.rows[row]["match"] = match
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+class SkillTableModel(QAbstractTableModel):
+    """Matched and missing skills of the selected candidate"""
+
+    HEADERS = ["Skill", "Status"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role == Qt.ItemDataRole.DisplayRole:
+            return self.rows[index.row()][index.column()]
+        return None
+
+    def set_match(self, match):
+        self.beginResetModel()
+        self.rows = [(skill.capitalize(), "Matched") for skill in match["matched_skills"]]
+        self.rows += [(skill.capitalize(), "Missing") for skill in match["recommended_improvements"]]
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self.rows = []
+        self.endResetModel()
 
 class StyledButton(QPushButton):
     def __init__(self, text, icon=None):
@@ -75,9 +221,9 @@ class ResumeAnalyzerApp(QMainWindow):
         
         # Resume Upload Section
         resume_layout = QHBoxLayout()
-        resume_label = QLabel("Resume:")
-        self.resume_path = QLabel("No file selected")
-        resume_upload_btn = StyledButton("Upload Resume")
+        resume_label = QLabel("Resumes:")
+        self.resume_path = QLabel("No files selected")
+        resume_upload_btn = StyledButton("Upload Resumes")
         resume_upload_btn.clicked.connect(self.upload_resume)
         
         resume_layout.addWidget(resume_label)
@@ -97,16 +243,46 @@ class ResumeAnalyzerApp(QMainWindow):
         job_layout.addWidget(job_upload_btn)
         upload_layout.addLayout(job_layout)
         
-        # Analyze Button
+        # Analyze and Cancel Buttons
+        actions_layout = QHBoxLayout()
         analyze_btn = StyledButton("Analyze Match")
         analyze_btn.clicked.connect(self.analyze_match)
-        upload_layout.addWidget(analyze_btn)
+        self.cancel_btn = StyledButton("Cancel")
+        self.cancel_btn.clicked.connect(self.cancel_analysis)
+        self.cancel_btn.setEnabled(False)
+        actions_layout.addWidget(analyze_btn)
+        actions_layout.addWidget(self.cancel_btn)
+        upload_layout.addLayout(actions_layout)
         
         # Results Tab
         results_tab = QWidget()
         results_layout = QVBoxLayout()
         results_tab.setLayout(results_layout)
         
+        # Batch Progress
+        batch_layout = QHBoxLayout()
+        self.batch_status = QLabel("No analysis running")
+        self.batch_progress = QProgressBar()
+        self.batch_progress.setFormat("%v / %m")
+        batch_layout.addWidget(self.batch_status)
+        batch_layout.addWidget(self.batch_progress)
+        results_layout.addLayout(batch_layout)
+        
+        # Candidates Table, sortable by any column
+        self.candidate_model = CandidateTableModel(self)
+        self.candidate_proxy = QSortFilterProxyModel(self)
+        self.candidate_proxy.setSourceModel(self.candidate_model)
+        self.candidate_proxy.setSortRole(Qt.ItemDataRole.UserRole)
+        self.candidate_view = QTableView()
+        self.candidate_view.setModel(self.candidate_proxy)
+        self.candidate_view.setSortingEnabled(True)
+        self.candidate_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.candidate_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.candidate_view.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.candidate_view.setStyleSheet(TABLE_STYLE)
+        self.candidate_view.selectionModel().currentRowChanged.connect(self.show_candidate)
+        results_layout.addWidget(self.candidate_view)
+        
         # Match Score Progress Bar
         match_score_layout = QHBoxLayout()
         match_score_label = QLabel("Match Score:")
@@ -129,21 +305,12 @@ class ResumeAnalyzerApp(QMainWindow):
         match_score_layout.addWidget(self.match_score_progress)
         results_layout.addLayout(match_score_layout)
         
-        # Skills Table
-        self.skills_table = QTableWidget()
-        self.skills_table.setColumnCount(2)
-        self.skills_table.setHorizontalHeaderLabels(["Skill", "Status"])
-        self.skills_table.setStyleSheet("""
-            QTableWidget {
-                background-color: #31363F;
-                color: #EEEEEE;
-                gridline-color: #76ABAE;
-            }
-            QHeaderView::section {
-                background-color: #76ABAE;
-                color: #222831;
-            }
-        """)
+        # Skills Table of the selected candidate
+        self.skill_model = SkillTableModel(self)
+        self.skills_table = QTableView()
+        self.skills_table.setModel(self.skill_model)
+        self.skills_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.skills_table.setStyleSheet(TABLE_STYLE)
         results_layout.addWidget(self.skills_table)
         
         # Recommended Improvements
@@ -158,15 +325,31 @@ class ResumeAnalyzerApp(QMainWindow):
         self.tab_widget.addTab(results_tab, "Results")
         
         # Initialize file paths
-        self.resume_file_path = None
+        self.resume_file_paths = []
         self.job_description_file_path = None
+        
+        # Analysis runs on a thread pool so the window stays responsive. Parsing
+        # mostly holds the GIL, so a few threads are enough to overlap file I/O.
+        self.resume_parser = ResumeParser()
+        self.job_analyzer = JobAnalyzer()
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max(1, min(4, QThreadPool.globalInstance().maxThreadCount())))
+        
+        # Results of tasks from an older batch carry a stale ID and are dropped
+        self.batch_id = 0
+        self.cancelled = threading.Event()
+        self.job_description = None
+        self.completed = 0
     
     def upload_resume(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select Resume", "", 
-                                                   "PDF Files (*.pdf);;Word Files (*.docx)")
-        if file_path:
-            self.resume_file_path = file_path
-            self.resume_path.setText(os.path.basename(file_path))
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Resumes", "", 
+                                                     "Resumes (*.pdf *.docx *.doc *.odt *.rtf *.txt *.html);;PDF Files (*.pdf);;Word Files (*.docx *.doc)")
+        if file_paths:
+            self.resume_file_paths = file_paths
+            if len(file_paths) == 1:
+                self.resume_path.setText(os.path.basename(file_paths[0]))
+            else:
+                self.resume_path.setText(f"{len(file_paths)} files selected")
     
     def upload_job_description(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Select Job Description", "", 
@@ -175,63 +358,149 @@ class ResumeAnalyzerApp(QMainWindow):
             self.job_description_file_path = file_path
             self.job_path.setText(os.path.basename(file_path))
     
+    def analyze_job(self, file_path):
+        """Read and analyze the job description, runs on a worker thread"""
+        if file_path.lower().endswith('.txt'):
+            with open(file_path, 'r', encoding='utf-8') as file:
+                job_description = file.read()
+        else:
+            job_description = self.resume_parser.extract_text(file_path)
+        if not job_description.strip():
+            raise ValueError("Could not read any text from the job description")
+        return self.job_analyzer.analyze_job_description(job_description)
+    
+    def analyze_resume(self, file_path, job_description):
+        """Parse one resume and match it to the job, runs on a worker thread"""
+        resume_data = self.resume_parser.parse_resume(file_path)
+        return match_resume_to_job(resume_data, job_description)
+    
+    def start_task(self, row, function, *args):
+        task = AnalysisTask(self.batch_id, row, self.cancelled, function, *args)
+        task.signals.result.connect(self.on_task_result)
+        task.signals.failed.connect(self.on_task_failed)
+        self.thread_pool.start(task)
+    
     def analyze_match(self):
-        if not self.resume_file_path or not self.job_description_file_path:
-            QMessageBox.warning(self, "Upload Error", "Please upload both resume and job description.")
+        if not self.resume_file_paths or not self.job_description_file_path:
+            QMessageBox.warning(self, "Upload Error", "Please upload resumes and a job description.")
             return
         
-        try:
-            # Parse resume
-            resume_data = parse_resume(self.resume_file_path)
-            
-            # Analyze job description
-            job_description = analyze_job_description(self.job_description_file_path)
-            
-            # Match resume to job
-            match_result = match_resume_to_job(resume_data, job_description)
-            
-            # Update match score progress bar
-            self.match_score_progress.setValue(int(match_result['match_score']))
-            
-            # Populate skills table
-            self.skills_table.setRowCount(0)
-            
-            # Separate matched and missing skills
-            matched_skills = match_result['matched_skills']
-            missing_skills = match_result['recommended_improvements']
-            
-            # Add matched skills first
-            for skill in matched_skills:
-                row = self.skills_table.rowCount()
-                self.skills_table.insertRow(row)
-                self.skills_table.setItem(row, 0, QTableWidgetItem(skill.capitalize()))
-                self.skills_table.setItem(row, 1, QTableWidgetItem("Matched"))
-            
-            # Add missing skills
-            for skill in missing_skills:
-                row = self.skills_table.rowCount()
-                self.skills_table.insertRow(row)
-                self.skills_table.setItem(row, 0, QTableWidgetItem(skill.capitalize()))
-                self.skills_table.setItem(row, 1, QTableWidgetItem("Missing"))
-            
-            # Resize columns to content
-            self.skills_table.resizeColumnsToContents()
-            
-            # Update improvements display
-            improvements_text = "To improve your resume, consider adding the following skills:\n\n"
-            improvements_text += "\n".join(f"• {skill.capitalize()}" for skill in missing_skills)
-            
-            # Add context from job description
-            job_description_text = job_description.get('raw_text', '')
-            improvements_text += f"\n\nJob Description Context:\n{job_description_text}"
-            
-            self.improvements_display.setText(improvements_text)
-            
-            # Switch to Results tab
-            self.tab_widget.setCurrentIndex(1)
-
-        except Exception as e:
-            QMessageBox.critical(self, "Analysis Error", f"Error during analysis: {str(e)}")
+        self.cancel_analysis()
+        self.batch_id += 1
+        self.cancelled = threading.Event()
+        self.job_description = None
+        self.completed = 0
+        
+        self.candidate_model.set_paths(self.resume_file_paths)
+        self.skill_model.clear()
+        self.match_score_progress.setValue(0)
+        self.improvements_display.clear()
+        self.batch_progress.setRange(0, len(self.resume_file_paths))
+        self.batch_progress.setValue(0)
+        self.batch_status.setText("Analyzing job description...")
+        self.cancel_btn.setEnabled(True)
+        
+        # Resumes are queued once the job description they are matched against is ready
+        self.start_task(-1, self.analyze_job, self.job_description_file_path)
+        
+        # Switch to Results tab
+        self.tab_widget.setCurrentIndex(1)
+    
+    def cancel_analysis(self):
+        if not self.cancel_btn.isEnabled():
+            return
+        
+        # Queued tasks are dropped, running ones finish but their results are ignored
+        self.cancelled.set()
+        self.thread_pool.clear()
+        self.batch_id += 1
+        for row, candidate in enumerate(self.candidate_model.rows):
+            if candidate["status"] in ("Queued", "Analyzing"):
+                self.candidate_model.set_status(row, "Cancelled")
+        self.finish_batch(f"Cancelled after {self.completed} of {len(self.candidate_model.rows)} resumes")
+    
+    def finish_batch(self, message):
+        self.batch_status.setText(message)
+        self.cancel_btn.setEnabled(False)
+    
+    def on_task_result(self, batch_id, row, result):
+        if batch_id != self.batch_id:
+            return
+        
+        if row < 0:
+            self.job_description = result
+            self.batch_status.setText(f"Analyzing {len(self.candidate_model.rows)} resumes...")
+            for resume_row, candidate in enumerate(self.candidate_model.rows):
+                self.candidate_model.set_status(resume_row, "Analyzing")
+                self.start_task(resume_row, self.analyze_resume, candidate["path"], result)
+            return
+        
+        self.candidate_model.set_status(row, "Done", result)
+        
+        # Show the first finished candidate, or refresh the one being viewed
+        current = self.candidate_proxy.mapToSource(self.candidate_view.currentIndex())
+        if not current.isValid():
+            self.candidate_view.selectRow(self.candidate_proxy.mapFromSource(self.candidate_model.index(row, 0)).row())
+        elif current.row() == row:
+            self.show_candidate(self.candidate_view.currentIndex())
+        
+        self.task_done()
+    
+    def on_task_failed(self, batch_id, row, message):
+        if batch_id != self.batch_id:
+            return
+        
+        if row < 0:
+            for resume_row in range(len(self.candidate_model.rows)):
+                self.candidate_model.set_status(resume_row, "Cancelled")
+            self.finish_batch("Job description analysis failed")
+            QMessageBox.critical(self, "Analysis Error", f"Error during analysis: {message}")
+            return
+        
+        self.candidate_model.set_status(row, f"Error: {message}")
+        self.task_done()
+    
+    def task_done(self):
+        self.completed += 1
+        total = len(self.candidate_model.rows)
+        self.batch_progress.setValue(self.completed)
+        if self.completed == total:
+            self.finish_batch(f"Analyzed {total} resumes")
+        else:
+            self.batch_status.setText(f"Analyzed {self.completed} of {total} resumes...")
+    
+    def show_candidate(self, current, previous=None):
+        index = self.candidate_proxy.mapToSource(current)
+        if not index.isValid():
+            return
+        match_result = self.candidate_model.rows[index.row()]["match"]
+        if not match_result:
+            self.skill_model.clear()
+            self.match_score_progress.setValue(0)
+            self.improvements_display.clear()
+            return
+        
+        # Update match score progress bar
+        self.match_score_progress.setValue(int(match_result['match_score']))
+        
+        # Populate skills table, matched skills first
+        self.skill_model.set_match(match_result)
+        
+        # Update improvements display
+        missing_skills = match_result['recommended_improvements']
+        improvements_text = "To improve your resume, consider adding the following skills:\n\n"
+        improvements_text += "\n".join(f"• {skill.capitalize()}" for skill in missing_skills)
+        
+        # Add context from job description
+        job_description_text = (self.job_description or {}).get('raw_text', '')
+        improvements_text += f"\n\nJob Description Context:\n{job_description_text}"
+        
+        self.improvements_display.setText(improvements_text)
+    
+    def closeEvent(self, event):
+        self.cancel_analysis()
+        self.thread_pool.waitForDone()
+        super().closeEvent(event)
 
 
 def main():
@@ -0,0 +1,103 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+from metrics import get_metrics
+
+
+def text_hash(text: str) -> str:
+    """Stable content hash of a text"""
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
+def pipeline_key(nlp) -> Tuple:
+    """Identify a pipeline by what it computes rather than by object identity"""
+    meta = nlp.meta
+    return (meta.get('lang'), meta.get('name'), meta.get('version'), tuple(nlp.pipe_names))
+
+
+class DocCache:
+    """
+    Bounded LRU cache of parsed spaCy Docs and structures derived from them
+
+    Entries are keyed by a hash of the text, so identical text is only parsed
+    once no matter which caller asks for it. The cache is bounded both by the
+    number of entries and by the total length of the cached texts.
+    """
+
+    def __init__(self, max_entries: int = 512, max_chars: int = 5_000_000):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_doc(self, nlp, text: str):
+        """Return the Doc for ``text`` produced by ``nlp``, parsing it only once"""
+        return self.get_or_compute(('doc', pipeline_key(nlp)), text, nlp)
+
+    def get_or_compute(self, namespace: Hashable, text: str, compute: Callable[[str], Any]) -> Any:
+        """
+        Return the cached value for ``text`` in ``namespace``, computing it on a miss
+
+        Args:
+            namespace: Distinguishes different kinds of values for the same text
+            text (str): Input text, hashed to build the cache key
+            compute: Function called with ``text`` on a cache miss
+
+        Returns:
+            Cached or freshly computed value. Callers must not mutate it.
+        """
+        key = (namespace, text_hash(text))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is not None:
+            get_metrics().inc('cache_hits', cache='doc')
+            return entry[0]
+        get_metrics().inc('cache_misses', cache='doc')
+
+        # Compute outside the lock so slow parses don't serialize other callers
+        value = compute(text)
+        self._put(key, value, len(text))
+        return value
+
+    def _put(self, key: Hashable, value: Any, size: int):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            if size > self.max_chars:
+                return
+
+            self._entries[key] = (value, size)
+            self._chars += size
+
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._chars -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+
+_doc_cache = DocCache()
+
+
+def get_doc_cache() -> DocCache:
+    """Get the process-wide cache shared by ResumeParser and JobAnalyzer"""
+    return _doc_cache
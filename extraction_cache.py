@@ -0,0 +1,151 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from metrics import get_metrics
+
+# Environment variable pointing at a cache directory used by default
+CACHE_DIR_ENV = 'EXTRACTION_CACHE_DIR'
+
+_READ_CHUNK = 1024 * 1024
+
+
+class ExtractionCache:
+    """
+    Content-addressed, size-bounded disk cache of extraction and parse results
+
+    Entries are JSON files named after the SHA-256 of the file bytes and a
+    version tag, so a renamed or re-uploaded copy of a file hits the same entry
+    and bumping the version invalidates everything. Writes go to a temporary
+    file that is atomically renamed into place, so any number of processes can
+    share one cache directory. Reads refresh an entry's mtime, and the oldest
+    entries are evicted once the directory grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory: str, version: str = '', max_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.version = version
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        self._written_since_scan = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def key_for_bytes(self, data: bytes) -> str:
+        digest = hashlib.sha256(self.version.encode('utf-8') + b'\0')
+        digest.update(data)
+        return digest.hexdigest()
+
+    def key_for_file(self, file_path: str) -> str:
+        digest = hashlib.sha256(self.version.encode('utf-8') + b'\0')
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(_READ_CHUNK), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry stored under ``key``, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+            os.utime(path)
+        except (OSError, ValueError):
+            # Missing, concurrently evicted or corrupt entries are all misses
+            self.misses += 1
+            get_metrics().inc('cache_misses', cache='extraction')
+            return None
+
+        self.hits += 1
+        get_metrics().inc('cache_hits', cache='extraction')
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        """Store an entry atomically, evicting old entries if the cache is full"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Could not write cache entry {key}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._written_since_scan += len(data)
+            # Rescanning the directory on every write would be costly, so only
+            # do it once a meaningful fraction of the budget has been written
+            should_evict = self._written_since_scan > self.max_bytes // 20
+            if should_evict:
+                self._written_since_scan = 0
+        if should_evict:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in ``max_bytes``"""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.unlink(path)
+            except OSError:
+                # Another process already evicted it
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+_default_caches: Dict[str, ExtractionCache] = {}
+_default_caches_lock = threading.Lock()
+
+
+def get_default_extraction_cache(version: str = '') -> Optional[ExtractionCache]:
+    """
+    Get the process-wide cache in ``$EXTRACTION_CACHE_DIR``, if any
+
+    Returns:
+        ExtractionCache for that directory, or None when the variable is not set
+    """
+    directory = os.environ.get(CACHE_DIR_ENV)
+    if not directory:
+        return None
+
+    with _default_caches_lock:
+        key = directory + '\0' + version
+        if key not in _default_caches:
+            _default_caches[key] = ExtractionCache(directory, version)
+        return _default_caches[key]
@@ -0,0 +1,444 @@
+import io
+import os
+import re
+import time
+import codecs
+import logging
+import tempfile
+import zipfile
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, NamedTuple, Optional
+from xml.etree import ElementTree
+
+from metrics import get_metrics
+
+# Pluggable text extractors, chosen by sniffing a document's content. Common
+# formats are read in-process by pure-Python extractors, and textract, which
+# spawns external tools for every file, is only the last resort for formats
+# nothing else can read, such as legacy .doc files.
+
+_SNIFF_BYTES = 8192
+_OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+_ODT_MIMETYPE = b'application/vnd.oasis.opendocument.text'
+_HTML_PATTERN = re.compile(rb'<(?:!doctype\s+html|html|head|body)\b', re.IGNORECASE)
+_MIME_TYPES = {
+    'application/pdf': 'pdf',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': 'docx',
+    'application/msword': 'doc',
+    'application/x-ole-storage': 'doc',
+    'application/cdfv2': 'doc',
+    'application/vnd.oasis.opendocument.text': 'odt',
+    'application/rtf': 'rtf',
+    'text/rtf': 'rtf',
+    'text/html': 'html',
+    'text/plain': 'txt',
+}
+_EXTENSION_TYPES = {
+    '.pdf': 'pdf', '.docx': 'docx', '.doc': 'doc', '.odt': 'odt', '.rtf': 'rtf',
+    '.html': 'html', '.htm': 'html', '.txt': 'txt', '.md': 'txt',
+}
+
+# Byte order marks and the codecs they identify, longest first
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'), (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# python-magic is imported on first use, and only if content sniffing is inconclusive
+_magic = None
+_magic_loaded = False
+
+
+class ExtractionError(Exception):
+    """Text could not be extracted from a document"""
+    pass
+
+
+def _get_magic():
+    """python-magic if it is installed, otherwise None"""
+    global _magic, _magic_loaded
+    if not _magic_loaded:
+        try:
+            import magic
+            _magic = magic
+        except ImportError:
+            # python-magic is optional, and fails to import when libmagic is missing
+            _magic = None
+        _magic_loaded = True
+    return _magic
+
+
+def _looks_like_text(head: bytes) -> bool:
+    """Whether the start of a file decodes as text without control characters"""
+    if not head:
+        return False
+    if any(head.startswith(bom) for bom, _ in _BOMS):
+        return True
+    if b'\x00' in head:
+        return False
+    try:
+        text = head.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A multi-byte character may be cut off at the end of the sniffed bytes
+        if len(head) < _SNIFF_BYTES or e.start < len(head) - 3:
+            return False
+        text = head[:e.start].decode('utf-8')
+    control = sum(1 for char in text if ord(char) < 32 and char not in '\t\n\r\f')
+    return control <= len(text) // 100
+
+
+def detect_file_type(path: Optional[str] = None, data: Optional[bytes] = None, name: Optional[str] = None) -> str:
+    """
+    Detect a document's type from its content, falling back to its extension
+
+    Args:
+        path (str): Path of the document, if it is on disk
+        data (bytes): Content of the document, if it is in memory
+        name (str): Original file name, only used for its extension
+
+    Returns:
+        'pdf', 'docx', 'doc', 'odt', 'rtf', 'html', 'txt' or 'other'
+    """
+    if data is not None:
+        head = data[:_SNIFF_BYTES]
+    else:
+        with open(path, 'rb') as file:
+            head = file.read(_SNIFF_BYTES)
+
+    if b'%PDF-' in head[:1024]:
+        return 'pdf'
+    if head.startswith(_OLE_MAGIC):
+        return 'doc'
+    if head.startswith(b'PK\x03\x04'):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data) if data is not None else path) as archive:
+                names = set(archive.namelist())
+                if 'word/document.xml' in names:
+                    return 'docx'
+                if 'mimetype' in names and archive.read('mimetype').strip() == _ODT_MIMETYPE:
+                    return 'odt'
+        except zipfile.BadZipFile:
+            pass
+    if head.lstrip().startswith(b'{\\rtf'):
+        return 'rtf'
+    if _looks_like_text(head):
+        return 'html' if _HTML_PATTERN.search(head[:2048]) else 'txt'
+
+    magic = _get_magic()
+    if magic is not None:
+        try:
+            mime = magic.from_buffer(head, mime=True)
+        except Exception:
+            mime = None
+        if mime in _MIME_TYPES:
+            return _MIME_TYPES[mime]
+
+    extension = os.path.splitext(name or path or '')[1].lower()
+    return _EXTENSION_TYPES.get(extension, 'other')
+
+
+class DocumentSource(NamedTuple):
+    """A document on disk or in memory, exactly one of ``path`` and ``data`` is set"""
+    path: Optional[str]
+    data: Optional[bytes]
+    name: Optional[str] = None
+
+    def read(self) -> bytes:
+        if self.data is not None:
+            return self.data
+        with open(self.path, 'rb') as file:
+            return file.read()
+
+    def file(self):
+        """A path or binary file object, for libraries accepting either"""
+        return self.path if self.data is None else io.BytesIO(self.data)
+
+
+def decode_text(data: bytes) -> str:
+    """Decode bytes of unknown encoding: by byte order mark, as UTF-8, or else as Windows-1252"""
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return data.decode(encoding, errors='replace')
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.decode('cp1252', errors='replace')
+
+
+def extract_plain_text(source: DocumentSource) -> str:
+    return decode_text(source.read())
+
+
+class _HTMLTextParser(HTMLParser):
+    """Collect the visible text of an HTML document, one line per block element"""
+
+    SKIP = {'script', 'style', 'head', 'noscript', 'template'}
+    BLOCKS = {
+        'p', 'div', 'br', 'li', 'tr', 'td', 'th', 'table', 'ul', 'ol', 'dl', 'dt', 'dd', 'section',
+        'article', 'header', 'footer', 'blockquote', 'pre', 'hr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP:
+            self._skip_depth += 1
+        elif tag in self.BLOCKS:
+            self.parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in self.BLOCKS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def extract_html(source: DocumentSource) -> str:
+    parser = _HTMLTextParser()
+    parser.feed(decode_text(source.read()))
+    parser.close()
+    return ''.join(parser.parts)
+
+
+# Control words whose group holds no document text
+_RTF_DESTINATIONS = {
+    'fonttbl', 'colortbl', 'stylesheet', 'info', 'pict', 'object', 'header', 'headerl', 'headerr',
+    'headerf', 'footer', 'footerl', 'footerr', 'footerf', 'fldinst', 'datastore', 'themedata',
+    'listtable', 'listoverridetable', 'rsidtbl', 'xmlnstbl', 'latentstyles', 'generator', 'filetbl',
+    'revtbl', 'bkmkstart', 'bkmkend', 'footnote', 'annotation', 'private',
+}
+_RTF_CHARACTERS = {
+    'par': '\n', 'line': '\n', 'row': '\n', 'sect': '\n\n', 'page': '\n\n', 'tab': '\t', 'cell': ' ',
+    'emdash': '\u2014', 'endash': '\u2013', 'emspace': ' ', 'enspace': ' ', 'bullet': '\u2022',
+    'lquote': '\u2018', 'rquote': '\u2019', 'ldblquote': '\u201c', 'rdblquote': '\u201d',
+}
+_RTF_TOKEN = re.compile(
+    r"\\([a-z]{1,32})(-?\d{1,10})? ?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|(.)",
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def rtf_to_text(rtf: str) -> str:
+    """Strip the control words and groups of an RTF document, keeping its text"""
+    parts = []
+    stack = []
+    ignorable = False
+    # Fallback characters following a \u escape, which are to be skipped
+    unicode_skip, pending_skip = 1, 0
+
+    for match in _RTF_TOKEN.finditer(rtf):
+        word, argument, hex_code, symbol, brace, char = match.groups()
+        if brace:
+            pending_skip = 0
+            if brace == '{':
+                stack.append((unicode_skip, ignorable))
+            elif stack:
+                unicode_skip, ignorable = stack.pop()
+        elif symbol:
+            pending_skip = 0
+            if symbol == '*':
+                ignorable = True
+            elif not ignorable:
+                if symbol == '~':
+                    parts.append('\xa0')
+                elif symbol in '{}\\':
+                    parts.append(symbol)
+        elif word:
+            pending_skip = 0
+            if word in _RTF_DESTINATIONS:
+                ignorable = True
+            elif ignorable:
+                continue
+            elif word in _RTF_CHARACTERS:
+                parts.append(_RTF_CHARACTERS[word])
+            elif word == 'uc' and argument:
+                unicode_skip = int(argument)
+            elif word == 'u' and argument:
+                code = int(argument)
+                parts.append(chr(code + 0x10000 if code < 0 else code))
+                pending_skip = unicode_skip
+        elif hex_code or char:
+            if pending_skip:
+                pending_skip -= 1
+            elif not ignorable:
+                parts.append(bytes([int(hex_code, 16)]).decode('cp1252', errors='replace') if hex_code else char)
+
+    return ''.join(parts)
+
+
+def extract_rtf(source: DocumentSource) -> str:
+    # RTF is 7-bit text, anything else is escaped
+    return rtf_to_text(source.read().decode('latin-1'))
+
+
+_ODF_TEXT = '{urn:oasis:names:tc:opendocument:xmlns:text:1.0}'
+_ODF_OFFICE = '{urn:oasis:names:tc:opendocument:xmlns:office:1.0}'
+_ODF_PARAGRAPHS = {f'{_ODF_TEXT}p', f'{_ODF_TEXT}h'}
+
+
+def _odf_text(element, parts: List[str]):
+    if element.text:
+        parts.append(element.text)
+    for child in element:
+        if child.tag == f'{_ODF_TEXT}s':
+            parts.append(' ' * int(child.get(f'{_ODF_TEXT}c', '1')))
+        elif child.tag == f'{_ODF_TEXT}tab':
+            parts.append('\t')
+        elif child.tag == f'{_ODF_TEXT}line-break':
+            parts.append('\n')
+        else:
+            _odf_text(child, parts)
+            if child.tag in _ODF_PARAGRAPHS:
+                parts.append('\n')
+        if child.tail:
+            parts.append(child.tail)
+
+
+def extract_odt(source: DocumentSource) -> str:
+    with zipfile.ZipFile(source.file()) as archive:
+        root = ElementTree.fromstring(archive.read('content.xml'))
+    body = root.find(f'{_ODF_OFFICE}body')
+    parts: List[str] = []
+    _odf_text(body if body is not None else root, parts)
+    return ''.join(parts)
+
+
+def extract_docx(source: DocumentSource) -> str:
+    import docx
+    document = docx.Document(source.file())
+    return " ".join(paragraph.text for paragraph in document.paragraphs)
+
+
+def extract_textract(source: DocumentSource) -> str:
+    """Extract text with textract, which can only read files on disk"""
+    import textract
+
+    if source.path:
+        return textract.process(source.path).decode('utf-8')
+
+    suffix = os.path.splitext(source.name or '')[1]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        tmp_file.write(source.data)
+        temp_path = tmp_file.name
+    try:
+        return textract.process(temp_path).decode('utf-8')
+    finally:
+        os.unlink(temp_path)
+
+
+class Extractor(NamedTuple):
+    name: str
+    function: Callable[[DocumentSource], str]
+
+
+class ExtractionResult(NamedTuple):
+    text: str
+    file_type: str
+    # Name of the extractor that produced the text, None if none did
+    extractor: Optional[str]
+    # Seconds spent in each extractor that was tried, in order
+    timings: Dict[str, float]
+
+
+class ExtractorRegistry:
+    """
+    Ordered text extractors per detected file type
+
+    Extractors of a type are tried in order until one returns text. An
+    extractor that raises or returns nothing passes the document on to the
+    next one. Every attempt is timed and recorded as an ``extractor`` stage.
+    """
+
+    def __init__(self):
+        self._extractors: Dict[str, List[Extractor]] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def register(self, file_type: str, name: str, function: Callable[[DocumentSource], str], first: bool = False):
+        """
+        Add an extractor for a file type
+
+        Args:
+            file_type (str): A type returned by ``detect_file_type``
+            name (str): Extractor name, used in timings and metrics
+            function: Called with a DocumentSource, returns the text
+            first (bool): Try it before the extractors already registered
+        """
+        extractors = self._extractors.setdefault(file_type, [])
+        extractors.insert(0 if first else len(extractors), Extractor(name, function))
+
+    def unregister(self, file_type: str, name: str):
+        self._extractors[file_type] = [e for e in self._extractors.get(file_type, []) if e.name != name]
+
+    def extractors(self, file_type: str) -> List[str]:
+        return [extractor.name for extractor in self._extractors.get(file_type, [])]
+
+    def extract(self, path: Optional[str] = None, data: Optional[bytes] = None,
+                name: Optional[str] = None, file_type: Optional[str] = None) -> ExtractionResult:
+        """
+        Extract the text of a document with the extractors of its detected type
+
+        Raises:
+            ExtractionError: If every extractor failed with an error
+        """
+        file_type = file_type or detect_file_type(path, data, name)
+        source = DocumentSource(path, data, name)
+        metrics = get_metrics()
+        timings: Dict[str, float] = {}
+        errors = []
+
+        for extractor in self._extractors.get(file_type, []):
+            started = time.perf_counter()
+            cpu_started = time.thread_time()
+            try:
+                text = extractor.function(source)
+            except Exception as e:
+                text = None
+                errors.append(f"{extractor.name}: {type(e).__name__}: {e}")
+            finally:
+                elapsed = time.perf_counter() - started
+                timings[extractor.name] = elapsed
+                metrics.observe('extractor', elapsed, time.thread_time() - cpu_started,
+                                extractor=extractor.name, format=file_type)
+            if text and text.strip():
+                return ExtractionResult(text, file_type, extractor.name, timings)
+
+        if errors:
+            raise ExtractionError('; '.join(errors))
+        if file_type not in self._extractors:
+            self.logger.warning(f"No extractor registered for {file_type} documents")
+        return ExtractionResult('', file_type, None, timings)
+
+
+def create_registry(pdf_extractor=None) -> ExtractorRegistry:
+    """
+    A registry with the built-in extractors
+
+    Args:
+        pdf_extractor: ``PdfExtractor`` used for PDFs, a default one if None
+    """
+    if pdf_extractor is None:
+        from pdf_extraction import PdfExtractor
+        pdf_extractor = PdfExtractor()
+
+    def extract_pdf(source: DocumentSource) -> str:
+        return pdf_extractor.extract(source.path if source.data is None else source.data).text
+
+    registry = ExtractorRegistry()
+    registry.register('pdf', 'pdf', extract_pdf)
+    registry.register('docx', 'python-docx', extract_docx)
+    registry.register('odt', 'odt', extract_odt)
+    registry.register('rtf', 'rtf', extract_rtf)
+    registry.register('html', 'html', extract_html)
+    registry.register('txt', 'text', extract_plain_text)
+    # Legacy Word files have no pure-Python reader, and textract stays the
+    # last resort for anything the native extractors can't read
+    for file_type in ('doc', 'odt', 'rtf', 'other'):
+        registry.register(file_type, 'textract', extract_textract)
+    return registry
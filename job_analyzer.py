@@ -1,19 +1,79 @@
-import spacy
-from typing import Dict, List, Tuple
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+from typing import Dict, List, Sequence, Tuple
 import re
+from nlp_models import get_nlp, pipe_unique
+from doc_cache import get_doc_cache, pipeline_key
+from tfidf_model import get_default_tfidf_model
+from metrics import timed
 
 class JobAnalyzer:
-    def __init__(self, nlp=None):
-        self.nlp = nlp if nlp else spacy.load("en_core_web_sm")
-        self.vectorizer = TfidfVectorizer(stop_words='english')
+    def __init__(self, nlp=None, doc_cache=None, tfidf_model=None):
+        # An explicitly passed pipeline is used for every task, otherwise
+        # each task gets the smallest shared pipeline that can serve it
+        self._nlp = nlp
+        self.doc_cache = doc_cache if doc_cache is not None else get_doc_cache()
+        
+        # A pre-fitted model (see tfidf_model.py) makes scores comparable across
+        # requests and keeps fitting off the request path
+        self.tfidf_model = tfidf_model if tfidf_model is not None else get_default_tfidf_model()
+        self._vectorizer = self.tfidf_model
+
+    @property
+    def vectorizer(self):
+        """The pre-fitted TF-IDF model, or the settings fitted per comparison without one"""
+        if self._vectorizer is None:
+            # scikit-learn is slow to import, so wait until a score is needed
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            self._vectorizer = TfidfVectorizer(stop_words='english')
+        return self._vectorizer
+
+    @property
+    def nlp(self):
+        return self._nlp if self._nlp else get_nlp()
+
+    @property
+    def sentence_nlp(self):
+        return self._nlp if self._nlp else get_nlp('sentences')
 
+    @property
+    def tagger_nlp(self):
+        return self._nlp if self._nlp else get_nlp('tagger')
+
+    @timed('extract_requirements')
     def extract_requirements(self, job_description: str) -> Dict[str, List[str]]:
         """Extract key requirements from job description"""
-        doc = self.nlp(job_description)
+        requirements = self.doc_cache.get_or_compute(
+            ('requirements', pipeline_key(self.sentence_nlp)),
+            job_description,
+            self._extract_requirements
+        )
+        
+        # Hand out copies so callers can't corrupt the cached structure
+        return {key: list(values) for key, values in requirements.items()}
+
+    @timed('extract_requirements_batch')
+    def extract_requirements_batch(self, job_descriptions: Sequence[str], batch_size: int = 64,
+                                   n_process: int = 1) -> List[Dict[str, List[str]]]:
+        """
+        Extract requirements from many job descriptions with one ``nlp.pipe`` run
         
+        Bypasses the Doc cache, which would only churn on a large feed.
+        
+        Args:
+            job_descriptions: Job description texts
+            batch_size (int): Texts per ``nlp.pipe`` batch
+            n_process (int): Worker processes for ``nlp.pipe``, worth it for thousands of texts
+        
+        Returns:
+            Requirements per job description, in input order
+        """
+        docs = pipe_unique(self.sentence_nlp, job_descriptions, batch_size, n_process)
+        return [self.requirements_from_doc(doc) for doc in docs]
+
+    def _extract_requirements(self, job_description: str) -> Dict[str, List[str]]:
+        return self.requirements_from_doc(self.doc_cache.get_doc(self.sentence_nlp, job_description))
+
+    def requirements_from_doc(self, doc) -> Dict[str, List[str]]:
+        """Extract key requirements from an already parsed job description"""
         requirements = {
             "required_skills": [],
             "preferred_skills": [],
@@ -43,20 +103,34 @@ class JobAnalyzer:
         
         return requirements
 
+    @timed('calculate_match_score')
     def calculate_match_score(self, resume_text: str, job_description: str) -> Tuple[float, Dict]:
         """Calculate match score between resume and job description"""
-        # Vectorize texts
-        texts = [resume_text, job_description]
-        tfidf_matrix = self.vectorizer.fit_transform(texts)
-        
-        # Calculate cosine similarity
-        cosine_sim = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+        cosine_sim = self.text_similarity(resume_text, job_description)
         
         # Extract requirements
         requirements = self.extract_requirements(job_description)
         
         return cosine_sim, requirements
 
+    @timed('text_similarity')
+    def text_similarity(self, resume_text: str, job_description: str) -> float:
+        """TF-IDF cosine similarity between resume and job description"""
+        from sklearn.base import clone
+        from sklearn.metrics.pairwise import cosine_similarity
+        
+        # Vectorize texts
+        texts = [resume_text, job_description]
+        if self.tfidf_model is not None:
+            tfidf_matrix = self.vectorizer.transform(texts)
+        else:
+            # Fit a fresh copy so concurrent callers don't refit a shared vectorizer
+            tfidf_matrix = clone(self.vectorizer).fit_transform(texts)
+        
+        # Calculate cosine similarity
+        return cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+
+    @timed('analyze_job_description', profile=True)
     def analyze_job_description(self, job_description: str) -> Dict[str, List[str]]:
         """
         Analyze job description
@@ -75,11 +149,41 @@ class JobAnalyzer:
             'requirements': requirements
         }
 
+    @timed('analyze_skill_gaps')
     def analyze_skill_gaps(self, resume_skills: List[str], job_requirements: Dict[str, List[str]]) -> Dict:
         """Analyze skill gaps between resume and job requirements"""
+        docs = [
+            self.doc_cache.get_doc(self.tagger_nlp, req.lower())
+            for req in job_requirements["required_skills"]
+        ]
+        return self.skill_gaps_from_docs(resume_skills, docs)
+
+    @timed('analyze_skill_gaps_batch')
+    def analyze_skill_gaps_batch(self, comparisons: Sequence[Tuple[List[str], Dict[str, List[str]]]],
+                                 batch_size: int = 256, n_process: int = 1) -> List[Dict]:
+        """
+        Analyze skill gaps for many (resume skills, job requirements) pairs at once
+        
+        The required-skill sentences of every pair are tagged in one ``nlp.pipe``
+        run, and a sentence shared by several jobs is tagged only once.
+        
+        Returns:
+            Skill gap analysis per pair, in input order
+        """
+        sentences = [
+            [req.lower() for req in job_requirements["required_skills"]]
+            for _, job_requirements in comparisons
+        ]
+        docs = iter(pipe_unique(self.tagger_nlp, [s for group in sentences for s in group], batch_size, n_process))
+        return [
+            self.skill_gaps_from_docs(resume_skills, [next(docs) for _ in group])
+            for (resume_skills, _), group in zip(comparisons, sentences)
+        ]
+
+    def skill_gaps_from_docs(self, resume_skills: List[str], requirement_docs: List) -> Dict:
+        """Analyze skill gaps against already tagged, lowercased required-skill sentences"""
         required_skills = set()
-        for req in job_requirements["required_skills"]:
-            doc = self.nlp(req.lower())
+        for doc in requirement_docs:
             required_skills.update([token.text for token in doc if token.pos_ in ["NOUN", "PROPN"]])
         
         resume_skills_set = set(skill.lower() for skill in resume_skills)
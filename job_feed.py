@@ -0,0 +1,380 @@
+import re
+import json
+import sqlite3
+import logging
+import argparse
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from doc_cache import text_hash
+from skill_matcher import get_skill_matcher
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    job_id TEXT UNIQUE NOT NULL,
+    title TEXT,
+    content_hash TEXT NOT NULL,
+    requirements TEXT NOT NULL,
+    required_count INTEGER NOT NULL,
+    feed TEXT
+);
+CREATE TABLE IF NOT EXISTS job_skills (
+    skill TEXT NOT NULL,
+    job_id INTEGER NOT NULL,
+    required INTEGER NOT NULL,
+    PRIMARY KEY (skill, job_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS job_skills_by_job ON job_skills (job_id);
+"""
+
+# Line separating postings in a plain-text feed
+FEED_SEPARATOR = '---'
+
+_TITLE_PATTERN = re.compile(r'^\s*job title\s*:\s*(.+)$', re.IGNORECASE | re.MULTILINE)
+_HEADING_PATTERN = re.compile(r'^\s*#+\s*(.+)$', re.MULTILINE)
+
+
+class JobPosting(NamedTuple):
+    job_id: str
+    title: str
+    text: str
+    # Feed the posting was read from, so postings dropped from it can be removed
+    feed: Optional[str] = None
+
+
+def _guess_title(text: str) -> str:
+    match = _TITLE_PATTERN.search(text) or _HEADING_PATTERN.search(text)
+    if match:
+        return match.group(1).strip()
+    first_line = next((line.strip() for line in text.splitlines() if line.strip()), '')
+    return first_line[:100]
+
+
+def iter_postings(path: str, field: str = 'text') -> Iterator[JobPosting]:
+    """
+    Stream the individual postings of a job feed
+
+    JSONL feeds hold one posting per line, with the text in ``field`` (or
+    ``description``) and optional ``id`` and ``title`` fields. Text feeds hold
+    postings separated by ``---`` lines. Postings without an ID are named
+    ``<path>:<content hash>``, so inserting or removing a posting doesn't
+    rename the others. Repeated postings are yielded once.
+    """
+    seen: Set[str] = set()
+
+    def posting(text: str, job_id: Optional[str] = None, title: Optional[str] = None) -> Optional[JobPosting]:
+        job_id = job_id or f'{path}:{text_hash(text)[:16]}'
+        if job_id in seen:
+            return None
+        seen.add(job_id)
+        return JobPosting(job_id, title or _guess_title(text), text, path)
+
+    def texts() -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+        with open(path, 'r', encoding='utf-8') as file:
+            if path.endswith('.jsonl'):
+                for line in file:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    text = record.get(field) or record.get('description') or ''
+                    job_id = record.get('id') or record.get('job_id')
+                    yield text, str(job_id) if job_id else None, record.get('title')
+                return
+
+            lines: List[str] = []
+            for line in file:
+                if line.strip() != FEED_SEPARATOR:
+                    lines.append(line)
+                    continue
+                yield ''.join(lines).strip(), None, None
+                lines = []
+            yield ''.join(lines).strip(), None, None
+
+    for text, job_id, title in texts():
+        if text.strip():
+            result = posting(text, job_id, title)
+            if result is not None:
+                yield result
+
+
+class JobIndex:
+    """
+    Persistent SQLite index of analyzed job postings
+
+    Stores the extracted requirements of every posting and a table from
+    canonical skill names to postings, so matching a resume against every
+    open posting is a single lookup instead of a re-analysis. Postings are
+    keyed by ID and carry a content hash, so re-ingesting a feed only
+    analyzes postings that are new or changed.
+    """
+
+    def __init__(self, path: str, skill_matcher=None):
+        self.path = path
+        self.skill_matcher = skill_matcher if skill_matcher else get_skill_matcher()
+        self.logger = logging.getLogger(__name__)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(jobs)')}
+        if 'feed' not in columns:
+            # Indexes created before postings recorded their feed
+            self.conn.execute('ALTER TABLE jobs ADD COLUMN feed TEXT')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS jobs_by_feed ON jobs (feed)')
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def unchanged(self, postings: Sequence[JobPosting]) -> Set[str]:
+        """IDs of the postings already indexed with identical text"""
+        unchanged = set()
+        hashes = {posting.job_id: text_hash(posting.text) for posting in postings}
+        ids = list(hashes)
+        # Stay below SQLite's limit on bound parameters
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT job_id, content_hash FROM jobs WHERE job_id IN ({','.join('?' * len(batch))})", batch
+            )
+            unchanged.update(job_id for job_id, content_hash in rows if hashes[job_id] == content_hash)
+        return unchanged
+
+    def _skills(self, requirements: Dict[str, List[str]]) -> Dict[str, int]:
+        """Map each skill named in the requirements to 1 if required, 0 if only preferred"""
+        skills = {
+            skill.lower(): 0
+            for skill in self.skill_matcher.skill_names(' '.join(requirements.get('preferred_skills', [])))
+        }
+        for skill in self.skill_matcher.skill_names(' '.join(requirements.get('required_skills', []))):
+            skills[skill.lower()] = 1
+        return skills
+
+    def _remove(self, job_id: str) -> bool:
+        row = self.conn.execute('SELECT id FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        if row:
+            self.conn.execute('DELETE FROM job_skills WHERE job_id = ?', row)
+            self.conn.execute('DELETE FROM jobs WHERE id = ?', row)
+        return row is not None
+
+    def _add(self, posting: JobPosting, requirements: Dict[str, List[str]]) -> int:
+        self._remove(posting.job_id)
+        skills = self._skills(requirements)
+
+        cursor = self.conn.execute(
+            'INSERT INTO jobs (job_id, title, content_hash, requirements, required_count, feed) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (posting.job_id, posting.title, text_hash(posting.text), json.dumps(requirements),
+             sum(skills.values()), posting.feed)
+        )
+        row_id = cursor.lastrowid
+        self.conn.executemany(
+            'INSERT INTO job_skills (skill, job_id, required) VALUES (?, ?, ?)',
+            ((skill, row_id, required) for skill, required in skills.items())
+        )
+        return row_id
+
+    def add(self, posting: JobPosting, requirements: Dict[str, List[str]]) -> int:
+        """
+        Add or replace an analyzed posting
+
+        Args:
+            posting (JobPosting): The posting
+            requirements (dict): Result of ``JobAnalyzer.extract_requirements``
+
+        Returns:
+            Internal ID of the indexed posting
+        """
+        with self.conn:
+            return self._add(posting, requirements)
+
+    def add_many(self, analyzed: Iterable[Tuple[JobPosting, Dict[str, List[str]]]]) -> int:
+        """Add many analyzed postings in one transaction"""
+        count = 0
+        with self.conn:
+            for posting, requirements in analyzed:
+                self._add(posting, requirements)
+                count += 1
+        return count
+
+    def remove(self, job_id: str) -> bool:
+        """Remove a posting, returning whether it was indexed"""
+        with self.conn:
+            return self._remove(job_id)
+
+    def remove_missing(self, feed: str, job_ids: Set[str]) -> int:
+        """Remove the postings of a feed that are not in ``job_ids``, returning how many were removed"""
+        # Rows indexed before postings recorded their feed are recognized by their ID prefix
+        prefix = f'{feed}:'
+        indexed = [job_id for (job_id,) in self.conn.execute(
+            'SELECT job_id FROM jobs WHERE feed = ? OR (feed IS NULL AND substr(job_id, 1, ?) = ?)',
+            (feed, len(prefix), prefix)
+        )]
+        missing = [job_id for job_id in indexed if job_id not in job_ids]
+        with self.conn:
+            for job_id in missing:
+                self._remove(job_id)
+        return len(missing)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The indexed title and requirements of a posting"""
+        row = self.conn.execute('SELECT title, requirements FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        if not row:
+            return None
+        return {'job_id': job_id, 'title': row[0], 'requirements': json.loads(row[1])}
+
+    def match(self, resume_skills: Iterable[str], limit: Optional[int] = 20) -> List[Dict[str, Any]]:
+        """
+        Rank indexed postings by the share of their required skills the resume has
+
+        Scores follow ``matching.match_resume_to_job``. Postings sharing no
+        skill with the resume are left out.
+
+        Args:
+            resume_skills: Skill names from ``ResumeParser.extract_skills``
+            limit (int): Most postings returned, None for all
+
+        Returns:
+            Best first, one dict per posting with its score and matched and missing required skills
+        """
+        skills = sorted({skill.lower() for skill in resume_skills})
+        if not skills:
+            return []
+
+        candidates: Dict[int, List[Any]] = {}
+        for start in range(0, len(skills), 500):
+            batch = skills[start:start + 500]
+            rows = self.conn.execute(
+                f"""SELECT j.id, j.job_id, j.title, j.required_count, s.skill, s.required
+                    FROM job_skills s JOIN jobs j ON j.id = s.job_id
+                    WHERE s.skill IN ({','.join('?' * len(batch))})""",
+                batch
+            )
+            for row_id, job_id, title, required_count, skill, required in rows:
+                candidate = candidates.setdefault(row_id, [job_id, title, required_count, [], []])
+                candidate[3 if required else 4].append(skill)
+
+        ranked = sorted(
+            candidates.items(),
+            key=lambda item: (-(len(item[1][3]) / item[1][2] if item[1][2] else 0.0),
+                              -(len(item[1][3]) + len(item[1][4])), item[1][0])
+        )
+        if limit is not None:
+            ranked = ranked[:limit]
+
+        results = []
+        for row_id, (job_id, title, required_count, matched, preferred) in ranked:
+            missing = [
+                skill for (skill,) in self.conn.execute(
+                    'SELECT skill FROM job_skills WHERE job_id = ? AND required = 1 ORDER BY skill', (row_id,)
+                ) if skill not in matched
+            ]
+            results.append({
+                'job_id': job_id,
+                'title': title,
+                'match_score': len(matched) / required_count * 100 if required_count else 0.0,
+                'matched_skills': sorted(matched),
+                'matched_preferred_skills': sorted(preferred),
+                'missing_skills': missing,
+            })
+        return results
+
+
+def ingest_feeds(paths: Iterable[str], index: JobIndex, job_analyzer=None, batch_size: int = 64,
+                 field: str = 'text', n_process: int = 1) -> Tuple[int, int, int]:
+    """
+    Analyze the new and changed postings of job feeds into an index
+
+    Postings are streamed and analyzed ``batch_size`` at a time with a single
+    ``nlp.pipe`` run per batch, so memory stays flat however large the feeds are.
+    ``n_process`` spreads each batch over worker processes, which only pays
+    off with large batches. Postings indexed from a feed earlier but no longer
+    in it are removed.
+
+    Returns:
+        Number of postings analyzed, of unchanged postings skipped and of
+        postings removed
+    """
+    if job_analyzer is None:
+        # Imported here so opening an index for lookups doesn't load NLP code
+        from job_analyzer import JobAnalyzer
+        job_analyzer = JobAnalyzer()
+
+    analyzed = skipped = removed = 0
+
+    for path in paths:
+        postings = iter_postings(path, field)
+        seen: Set[str] = set()
+        while True:
+            batch = list(islice(postings, batch_size))
+            if not batch:
+                break
+            seen.update(posting.job_id for posting in batch)
+
+            unchanged = index.unchanged(batch)
+            changed = [posting for posting in batch if posting.job_id not in unchanged]
+            skipped += len(batch) - len(changed)
+            if changed:
+                requirements = job_analyzer.extract_requirements_batch(
+                    [p.text for p in changed], batch_size, n_process)
+                analyzed += index.add_many(zip(changed, requirements))
+
+        removed += index.remove_missing(path, seen)
+
+    return analyzed, skipped, removed
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Ingest job feeds into a persistent index and match resumes")
+    parser.add_argument('index', help="SQLite index file")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add_cmd = commands.add_parser('add', help="Ingest text feeds (postings separated by ---) or JSONL feeds")
+    add_cmd.add_argument('feeds', nargs='+')
+    add_cmd.add_argument('--field', default='text', help="JSONL field holding the posting text")
+    add_cmd.add_argument('--batch-size', type=int, default=64, help="Postings per nlp.pipe batch")
+    add_cmd.add_argument('--n-process', type=int, default=1, help="nlp.pipe worker processes, -1 for one per CPU")
+
+    remove_cmd = commands.add_parser('remove', help="Remove postings by ID")
+    remove_cmd.add_argument('job_ids', nargs='+')
+
+    match_cmd = commands.add_parser('match', help="Rank all postings for a resume")
+    source = match_cmd.add_mutually_exclusive_group(required=True)
+    source.add_argument('--resume', help="Resume file to parse")
+    source.add_argument('--skills', help="Comma-separated skill names")
+    match_cmd.add_argument('--limit', type=int, default=20)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    with JobIndex(args.index) as index:
+        if args.command == 'add':
+            analyzed, skipped, removed = ingest_feeds(args.feeds, index, batch_size=args.batch_size,
+                                             field=args.field, n_process=args.n_process)
+            index.logger.info(f"Analyzed {analyzed} postings, skipped {skipped} unchanged ones, removed {removed}")
+        elif args.command == 'remove':
+            for job_id in args.job_ids:
+                if not index.remove(job_id):
+                    index.logger.warning(f"Not indexed: {job_id}")
+        else:
+            if args.resume:
+                from resume_parser import ResumeParser
+                text = ResumeParser().extract_text(args.resume)
+                skills = index.skill_matcher.skill_names(text)
+            else:
+                skills = [skill.strip() for skill in args.skills.split(',') if skill.strip()]
+            for result in index.match(skills, args.limit):
+                print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
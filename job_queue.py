@@ -0,0 +1,641 @@
+import os
+import sys
+import json
+import time
+import random
+import signal
+import socket
+import sqlite3
+import logging
+import argparse
+import uuid
+import multiprocessing
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+from urllib.request import pathname2url
+
+from metrics import get_metrics
+from resume_parser import ExtractionError
+
+# Durable local work queue for parse and match jobs. Jobs live in SQLite, so
+# a batch run that crashes or is stopped resumes where it left off. Every
+# text extraction runs in its own child process with a wall time and address
+# space limit, so a file that hangs textract or blows up pdfplumber only
+# fails its own job. Failed jobs are retried with exponential backoff and
+# end up in a dead-letter state with the reason of their last failure.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    depends_on INTEGER REFERENCES jobs(id),
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (state, available_at);
+CREATE INDEX IF NOT EXISTS jobs_depends_on ON jobs (depends_on);
+CREATE TABLE IF NOT EXISTS runner (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    token TEXT NOT NULL,
+    host TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    heartbeat REAL NOT NULL
+);
+"""
+
+# Job kinds and the payload fields they need
+KINDS = {
+    # {"path": resume file}
+    'parse': ('path',),
+    # {"job_text": job description}, matched against the result of the parse job it depends on
+    'match': ('job_text',),
+}
+
+STATES = ('pending', 'running', 'done', 'dead')
+
+# Pending jobs with nothing left to wait for but their backoff
+_RUNNABLE = """state = 'pending' AND (depends_on IS NULL OR EXISTS (
+    SELECT 1 FROM jobs AS dependency WHERE dependency.id = jobs.depends_on AND dependency.state = 'done'))"""
+
+
+class QueueBusyError(RuntimeError):
+    """Raised when another live runner is already working a queue"""
+
+
+class Job(NamedTuple):
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    depends_on: Optional[int]
+    attempts: int
+    max_attempts: int
+    created_at: float
+
+
+class JobQueue:
+    """
+    SQLite-backed queue of parse and match jobs
+
+    A queue file is worked by one runner at a time, which holds a lease
+    renewed by a heartbeat. Opening a queue creates the file and its schema
+    if needed, unless ``read_only`` is set for inspecting it without writing.
+    Jobs left running by a runner that crashed are returned to the queue,
+    counting the interrupted attempt, when the next runner takes over the lease.
+    """
+
+    def __init__(self, path: str, backoff: float = 2.0, max_backoff: float = 300.0, read_only: bool = False):
+        self.path = path
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.logger = logging.getLogger(__name__)
+        if read_only:
+            self.conn = sqlite3.connect(f'file:{pathname2url(os.path.abspath(path))}?mode=ro',
+                                        uri=True, isolation_level=None)
+        else:
+            self.conn = sqlite3.connect(path, isolation_level=None)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.executescript(SCHEMA)
+        self._runner_token: Optional[str] = None
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _runner_alive(host: str, pid: int, heartbeat: float, stale_after: float) -> bool:
+        if time.time() - heartbeat > stale_after:
+            return False
+        if host != socket.gethostname():
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _recover(self) -> int:
+        interrupted = self.conn.execute("SELECT id FROM jobs WHERE state = 'running'").fetchall()
+        for (job_id,) in interrupted:
+            self.fail(job_id, "Interrupted: the runner stopped while the job was running")
+        if interrupted:
+            self.logger.warning(f"Requeued {len(interrupted)} jobs interrupted by a previous run")
+        return len(interrupted)
+
+    def start_runner(self, stale_after: float = 900.0) -> int:
+        """
+        Take the runner lease and requeue the jobs a previous runner left running
+
+        A lease is taken over once its holder's process is gone or its
+        heartbeat is older than ``stale_after`` seconds, which must exceed the
+        longest job.
+
+        Returns:
+            Number of interrupted jobs requeued
+
+        Raises:
+            QueueBusyError: If another runner holds a live lease
+        """
+        token = uuid.uuid4().hex
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = self.conn.execute('SELECT token, host, pid, heartbeat FROM runner WHERE id = 1').fetchone()
+            if row and row[0] != self._runner_token and self._runner_alive(*row[1:], stale_after):
+                raise QueueBusyError(f"Queue {self.path} is being worked by process {row[2]} on {row[1]}")
+            self.conn.execute(
+                'INSERT OR REPLACE INTO runner (id, token, host, pid, heartbeat) VALUES (1, ?, ?, ?, ?)',
+                (token, socket.gethostname(), os.getpid(), time.time())
+            )
+            recovered = self._recover()
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        self._runner_token = token
+        return recovered
+
+    def heartbeat(self):
+        """Renew the runner lease taken by ``start_runner``"""
+        if self._runner_token is not None:
+            self.conn.execute('UPDATE runner SET heartbeat = ? WHERE token = ?', (time.time(), self._runner_token))
+
+    def stop_runner(self):
+        """Release the runner lease"""
+        if self._runner_token is not None:
+            self.conn.execute('DELETE FROM runner WHERE token = ?', (self._runner_token,))
+            self._runner_token = None
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], depends_on: Optional[int] = None,
+                max_attempts: int = 3) -> int:
+        """
+        Add a job and return its ID
+
+        Args:
+            kind (str): One of ``KINDS``
+            payload: JSON-serializable job arguments
+            depends_on (int): Job that must be done before this one can run.
+                Match jobs depend on the parse job of their resume.
+            max_attempts (int): Attempts before the job is dead-lettered
+        """
+        missing = [field for field in KINDS.get(kind, ()) if field not in payload]
+        if kind not in KINDS or missing:
+            raise ValueError(f"Invalid {kind} job, missing {missing}" if missing else f"Unknown job kind: {kind}")
+        if kind == 'match' and depends_on is None:
+            raise ValueError("Match jobs need the parse job of their resume")
+
+        now = time.time()
+        cursor = self.conn.execute(
+            'INSERT INTO jobs (kind, payload, depends_on, max_attempts, available_at, created_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (kind, json.dumps(payload), depends_on, max_attempts, now, now)
+        )
+        return cursor.lastrowid
+
+    def _bury_orphans(self, now: float):
+        """Dead-letter pending jobs whose dependency is dead, such as dead match jobs retried on their own"""
+        orphans = self.conn.execute(
+            """SELECT jobs.id, jobs.depends_on FROM jobs JOIN jobs AS dependency ON dependency.id = jobs.depends_on
+               WHERE jobs.state = 'pending' AND dependency.state = 'dead'"""
+        ).fetchall()
+        for job_id, depends_on in orphans:
+            self.conn.execute(
+                "UPDATE jobs SET state = 'dead', finished_at = ?, error = ? WHERE id = ?",
+                (now, f"Job {depends_on} it depends on failed", job_id)
+            )
+
+    def claim(self) -> Optional[Job]:
+        """Mark the oldest runnable job as running and return it, None if nothing is runnable now"""
+        now = time.time()
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._bury_orphans(now)
+            row = self.conn.execute(
+                f"""SELECT id, kind, payload, depends_on, attempts, max_attempts, created_at FROM jobs
+                    WHERE {_RUNNABLE} AND available_at <= ?
+                    ORDER BY available_at, id LIMIT 1""",
+                (now,)
+            ).fetchone()
+            if row:
+                self.conn.execute(
+                    "UPDATE jobs SET state = 'running', attempts = attempts + 1, started_at = ? WHERE id = ?",
+                    (now, row[0])
+                )
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+
+        if not row:
+            return None
+        job_id, kind, payload, depends_on, attempts, max_attempts, created_at = row
+        return Job(job_id, kind, json.loads(payload), depends_on, attempts + 1, max_attempts, created_at)
+
+    def complete(self, job_id: int, result: Any, attempt: Optional[int] = None) -> bool:
+        """
+        Record the result of a running job
+
+        Jobs that are no longer running, or with ``attempt`` given that have
+        been claimed again since, are left alone.
+
+        Returns:
+            Whether the result was recorded
+        """
+        query = "UPDATE jobs SET state = 'done', finished_at = ?, error = NULL, result = ? WHERE id = ? AND state = 'running'"
+        params: List[Any] = [time.time(), json.dumps(result, ensure_ascii=False), job_id]
+        if attempt is not None:
+            query += ' AND attempts = ?'
+            params.append(attempt)
+        recorded = self.conn.execute(query, params).rowcount > 0
+        if not recorded:
+            self.logger.warning(f"Dropped the result of job {job_id}, which is no longer running this attempt")
+        return recorded
+
+    def fail(self, job_id: int, error: str, attempt: Optional[int] = None) -> bool:
+        """
+        Record a failed attempt of a running job
+
+        The job is retried after an exponential backoff with jitter, or
+        dead-lettered once it has used all its attempts. Jobs depending on a
+        dead job are dead-lettered with it. Jobs that are no longer running,
+        or with ``attempt`` given that have been claimed again since, are left
+        alone.
+
+        Returns:
+            Whether the failure was recorded
+        """
+        now = time.time()
+        row = self.conn.execute(
+            'SELECT state, attempts, max_attempts FROM jobs WHERE id = ?', (job_id,)
+        ).fetchone()
+        if not row or row[0] != 'running' or (attempt is not None and row[1] != attempt):
+            self.logger.warning(f"Dropped the failure of job {job_id}, which is no longer running this attempt")
+            return False
+        _, attempts, max_attempts = row
+
+        if attempts < max_attempts:
+            delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1)) * random.uniform(0.5, 1.0)
+            self.conn.execute(
+                "UPDATE jobs SET state = 'pending', available_at = ?, error = ? WHERE id = ?",
+                (now + delay, error, job_id)
+            )
+            return True
+
+        self.conn.execute(
+            "UPDATE jobs SET state = 'dead', finished_at = ?, error = ? WHERE id = ?", (now, error, job_id)
+        )
+        dependents = self.conn.execute(
+            "SELECT id FROM jobs WHERE depends_on = ? AND state = 'pending'", (job_id,)
+        ).fetchall()
+        for (dependent,) in dependents:
+            self.conn.execute(
+                "UPDATE jobs SET state = 'dead', finished_at = ?, error = ? WHERE id = ?",
+                (now, f"Job {job_id} it depends on failed", dependent)
+            )
+        return True
+
+    def retry_dead(self, job_ids: Optional[Sequence[int]] = None) -> int:
+        """
+        Give dead jobs, or all of them, a fresh set of attempts
+
+        A job retried without its dead dependency is dead-lettered again by
+        the next ``claim``.
+        """
+        query = "UPDATE jobs SET state = 'pending', attempts = 0, available_at = ?, finished_at = NULL WHERE state = 'dead'"
+        params: List[Any] = [time.time()]
+        if job_ids:
+            query += f" AND id IN ({','.join('?' * len(job_ids))})"
+            params.extend(job_ids)
+        return self.conn.execute(query, params).rowcount
+
+    def result(self, job_id: int) -> Any:
+        row = self.conn.execute('SELECT result FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def results(self, kind: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Every finished job with its payload and result, in ID order"""
+        query = "SELECT id, kind, payload, depends_on, result FROM jobs WHERE state = 'done'"
+        params = []
+        if kind:
+            query += ' AND kind = ?'
+            params.append(kind)
+        for job_id, job_kind, payload, depends_on, result in self.conn.execute(query + ' ORDER BY id', params):
+            yield {'id': job_id, 'kind': job_kind, 'payload': json.loads(payload), 'depends_on': depends_on,
+                   'result': json.loads(result)}
+
+    def dead_letters(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT id, kind, payload, attempts, error FROM jobs WHERE state = 'dead' ORDER BY id LIMIT ?",
+            (-1 if limit is None else limit,)
+        )
+        return [
+            {'id': job_id, 'kind': kind, 'payload': json.loads(payload), 'attempts': attempts, 'error': error}
+            for job_id, kind, payload, attempts, error in rows
+        ]
+
+    def next_available(self) -> Optional[float]:
+        """
+        When the next pending job becomes runnable, None if none is waiting only for its backoff
+
+        Jobs whose dependency is not done yet are left out, they become
+        runnable after their dependency runs.
+        """
+        return self.conn.execute(f"SELECT MIN(available_at) FROM jobs WHERE {_RUNNABLE}").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue depth per state and latencies of finished jobs
+
+        Latency runs from enqueueing to finishing, run time from the start of
+        the last attempt to finishing.
+        """
+        now = time.time()
+        depth = dict.fromkeys(STATES, 0)
+        depth.update(self.conn.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall())
+        oldest = self.conn.execute("SELECT MIN(created_at) FROM jobs WHERE state = 'pending'").fetchone()[0]
+
+        latencies = {}
+        for kind in KINDS:
+            rows = self.conn.execute(
+                "SELECT finished_at - created_at, finished_at - started_at FROM jobs "
+                "WHERE state = 'done' AND kind = ? ORDER BY 1",
+                (kind,)
+            ).fetchall()
+            if not rows:
+                continue
+            latency = [row[0] for row in rows]
+            run_time = sorted(row[1] for row in rows)
+            latencies[kind] = {
+                'count': len(rows),
+                'latency_p50': latency[len(latency) // 2],
+                'latency_p95': latency[min(len(latency) - 1, int(0.95 * len(latency)))],
+                'run_time_p50': run_time[len(run_time) // 2],
+                'run_time_mean': sum(run_time) / len(run_time),
+            }
+
+        return {
+            'depth': depth,
+            'oldest_pending_seconds': now - oldest if oldest is not None else 0.0,
+            'latency': latencies,
+        }
+
+
+def _limit_child(max_memory: Optional[int]):
+    # Own process group, so a timeout also kills tools the extractor spawned, like textract's
+    os.setpgrp()
+    if max_memory:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+
+
+def _extract_in_child(connection, path: str, max_memory: Optional[int]):
+    """Child process entry point: extract one file and send back ('ok', text) or ('error', reason)"""
+    try:
+        _limit_child(max_memory)
+        from resume_parser import ResumeParser
+        from pdf_extraction import PdfExtractor
+        # This process already runs under a wall time limit
+        parser = ResumeParser(pdf_extractor=PdfExtractor(max_workers=1, isolate=False))
+        parser.extraction_cache = None
+        connection.send(('ok', parser.extract_text(path, strict=True)))
+    except BaseException as e:
+        if isinstance(e, MemoryError) or isinstance(e.__cause__, MemoryError):
+            reason = f"Memory limit of {max_memory} bytes exceeded"
+        else:
+            reason = str(e) if isinstance(e, ExtractionError) else f"{type(e).__name__}: {e}"
+        connection.send(('error', reason))
+    finally:
+        connection.close()
+
+
+def extract_isolated(path: str, timeout: float = 60.0, max_memory: Optional[int] = 1024 ** 3) -> str:
+    """
+    Extract the text of a file in a child process with a wall time and address space limit
+
+    Raises:
+        ExtractionError: If extraction fails, times out or the child dies
+    """
+    # fork skips re-importing this module in every child where it is available
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_extract_in_child, args=(sender, path, max_memory), daemon=True)
+    process.start()
+    sender.close()
+
+    try:
+        if not receiver.poll(timeout):
+            raise ExtractionError(f"Timed out after {timeout:g}s")
+        status, value = receiver.recv()
+    except EOFError:
+        process.join(1)
+        raise ExtractionError(f"Extraction process died with exit code {process.exitcode}")
+    finally:
+        receiver.close()
+        if process.is_alive():
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                process.kill()
+        process.join()
+
+    if status != 'ok':
+        raise ExtractionError(value)
+    return value
+
+
+class QueueWorker:
+    """
+    Run queued jobs until the queue is drained
+
+    Parse jobs extract text with ``extract_isolated`` and run the NLP
+    pipeline in this process. Match jobs score the parsed resume of the job
+    they depend on against their job description.
+    """
+
+    def __init__(self, queue: JobQueue, resume_parser=None, job_analyzer=None, timeout: float = 60.0,
+                 max_memory: Optional[int] = 1024 ** 3, keep_text: bool = False):
+        self.queue = queue
+        self.timeout = timeout
+        self.max_memory = max_memory
+        self.keep_text = keep_text
+        self.logger = logging.getLogger(__name__)
+        self._resume_parser = resume_parser
+        self._job_analyzer = job_analyzer
+
+    @property
+    def resume_parser(self):
+        if self._resume_parser is None:
+            from resume_parser import ResumeParser
+            self._resume_parser = ResumeParser()
+        return self._resume_parser
+
+    @property
+    def job_analyzer(self):
+        if self._job_analyzer is None:
+            from job_analyzer import JobAnalyzer
+            self._job_analyzer = JobAnalyzer()
+        return self._job_analyzer
+
+    def _parse(self, job: Job) -> Dict[str, Any]:
+        path = job.payload['path']
+        text = extract_isolated(path, self.timeout, self.max_memory)
+        result = self.resume_parser.parse_text(text, path)
+        if not self.keep_text:
+            result['raw_text'] = None
+        return result
+
+    def _match(self, job: Job) -> Dict[str, Any]:
+        # Imported here since the queue itself needs no NLP code
+        from matching import match_resume_to_job
+
+        resume = self.queue.result(job.depends_on)
+        # Parse results only keep their text when asked to
+        resume['raw_text'] = resume.get('raw_text') or ''
+        job_text = job.payload['job_text']
+        job_data = {'raw_text': job_text, 'requirements': self.job_analyzer.extract_requirements(job_text)}
+        analysis = match_resume_to_job(resume, job_data)
+        analysis['skill_gaps'] = self.job_analyzer.analyze_skill_gaps(resume['skills'], job_data['requirements'])
+        return analysis
+
+    def run_one(self, job: Job):
+        metrics = get_metrics()
+        try:
+            with metrics.stage('queue_job', kind=job.kind):
+                result = self._parse(job) if job.kind == 'parse' else self._match(job)
+        except Exception as e:
+            reason = str(e) if isinstance(e, ExtractionError) else f"{type(e).__name__}: {e}"
+            self.logger.warning(f"Job {job.id} ({job.kind}) attempt {job.attempts}/{job.max_attempts} failed: {reason}")
+            self.queue.fail(job.id, reason, job.attempts)
+            metrics.inc('queue_jobs', kind=job.kind, outcome='failed')
+        else:
+            self.queue.complete(job.id, result, job.attempts)
+            metrics.inc('queue_jobs', kind=job.kind, outcome='done')
+        self.queue.heartbeat()
+
+    def run(self, wait: bool = True, max_sleep: float = 5.0) -> int:
+        """
+        Run jobs until none is left
+
+        Takes the queue's runner lease first, requeueing the jobs a crashed
+        runner left running, and releases it when done.
+
+        Args:
+            wait (bool): Sleep until jobs waiting out a retry backoff become
+                available, instead of returning as soon as nothing is runnable
+            max_sleep (float): Longest single sleep while waiting
+
+        Returns:
+            Number of attempts run
+
+        Raises:
+            QueueBusyError: If another runner is working the queue
+        """
+        self.queue.start_runner()
+        attempts = 0
+        try:
+            while True:
+                job = self.queue.claim()
+                if job is not None:
+                    self.run_one(job)
+                    attempts += 1
+                    continue
+
+                next_available = self.queue.next_available()
+                if not wait or next_available is None:
+                    return attempts
+                time.sleep(min(max_sleep, max(0.05, next_available - time.time())))
+                self.queue.heartbeat()
+        finally:
+            self.queue.stop_runner()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Durable local queue of resume parse and match jobs")
+    parser.add_argument('queue', help="SQLite queue file")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add_cmd = commands.add_parser('add', help="Queue a parse job per resume and a match job per resume and job")
+    add_cmd.add_argument('inputs', nargs='*', help="Resume files, directories or glob patterns")
+    add_cmd.add_argument('--manifest', help="File listing one resume path per line")
+    add_cmd.add_argument('--job', action='append', default=[], help="Job description file to match against")
+    add_cmd.add_argument('--max-attempts', type=int, default=3)
+
+    run_cmd = commands.add_parser('run', help="Work the queue until it is drained")
+    run_cmd.add_argument('--timeout', type=float, default=60.0, help="Wall time limit per extraction in seconds")
+    run_cmd.add_argument('--max-memory-mb', type=int, default=1024, help="Address space limit per extraction, 0 for none")
+    run_cmd.add_argument('--keep-text', action='store_true', help="Store the extracted text with parse results")
+    run_cmd.add_argument('--no-wait', action='store_true', help="Return instead of waiting out retry backoffs")
+
+    commands.add_parser('stats', help="Print queue depth and latency")
+
+    dead_cmd = commands.add_parser('dead', help="List dead-lettered jobs")
+    dead_cmd.add_argument('--retry', action='store_true', help="Queue them again with fresh attempts")
+
+    commands.add_parser('results', help="Print finished jobs as JSONL")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    # Inspecting a queue never creates or modifies it
+    read_only = args.command in ('stats', 'results') or (args.command == 'dead' and not args.retry)
+    if read_only and not os.path.exists(args.queue):
+        parser.error(f"no queue at {args.queue}")
+
+    with JobQueue(args.queue, read_only=read_only) as queue:
+        if args.command == 'add':
+            from batch_parser import collect_resume_paths
+            paths = collect_resume_paths(args.inputs, args.manifest)
+            job_texts = []
+            for job_path in args.job:
+                with open(job_path, 'r', encoding='utf-8') as file:
+                    job_texts.append((job_path, file.read()))
+
+            queue.conn.execute('BEGIN')
+            for path in paths:
+                parse_id = queue.enqueue('parse', {'path': path}, max_attempts=args.max_attempts)
+                for job_path, job_text in job_texts:
+                    queue.enqueue('match', {'job_path': job_path, 'job_text': job_text}, parse_id,
+                                  max_attempts=args.max_attempts)
+            queue.conn.execute('COMMIT')
+            queue.logger.info(f"Queued {len(paths)} resumes against {len(job_texts)} jobs")
+
+        elif args.command == 'run':
+            worker = QueueWorker(queue, timeout=args.timeout, max_memory=args.max_memory_mb * 1024 ** 2 or None,
+                                 keep_text=args.keep_text)
+            try:
+                attempts = worker.run(wait=not args.no_wait)
+            except QueueBusyError as e:
+                parser.error(str(e))
+            queue.logger.info(f"Ran {attempts} attempts: {json.dumps(queue.stats()['depth'])}")
+
+        elif args.command == 'stats':
+            print(json.dumps(queue.stats(), indent=2))
+
+        elif args.command == 'dead':
+            for job in queue.dead_letters():
+                print(json.dumps(job, ensure_ascii=False))
+            if args.retry:
+                queue.logger.info(f"Requeued {queue.retry_dead()} dead jobs")
+
+        else:
+            for job in queue.results():
+                job['payload'].pop('job_text', None)
+                sys.stdout.write(json.dumps(job, ensure_ascii=False) + '\n')
+
+
+if __name__ == "__main__":
+    main()
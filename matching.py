@@ -0,0 +1,43 @@
+from skill_matcher import get_skill_matcher
+
+# Matching only needs the skill taxonomy, so keep this module free of UI and
+# NLP imports: the Streamlit app, the desktop app and CLI jobs all share it
+
+def match_resume_to_job(resume_data: dict, job_description_data: dict) -> dict:
+    """
+    Match resume to job description and provide detailed analysis
+    
+    Args:
+        resume_data (dict): Parsed resume data
+        job_description_data (dict): Parsed job description data
+    
+    Returns:
+        dict: Detailed match analysis
+    """
+    # Extract resume skills and job requirements
+    resume_skills = set(skill.lower() for skill in resume_data.get('skills', []))
+    
+    # Extract job requirements from job description
+    job_requirements = job_description_data.get('requirements', {})
+    required_skills_text = ' '.join(job_requirements.get('required_skills', []))
+    
+    # Extract skills from job description with the shared taxonomy matcher
+    job_skills = set(skill.lower() for skill in get_skill_matcher().skill_names(required_skills_text))
+    
+    # Match skills
+    matched_skills = resume_skills.intersection(job_skills)
+    
+    # Calculate match score
+    total_job_skills = len(job_skills)
+    matched_skill_count = len(matched_skills)
+    match_score = (matched_skill_count / total_job_skills * 100) if total_job_skills > 0 else 0
+    
+    # Prepare detailed analysis
+    analysis = {
+        'match_score': match_score,
+        'total_job_skills': total_job_skills,
+        'matched_skills': list(matched_skills),
+        'recommended_improvements': list(job_skills - resume_skills)
+    }
+    
+    return analysis
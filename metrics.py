@@ -0,0 +1,256 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import functools
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Environment variable enabling the slow request profiler, in milliseconds
+PROFILE_SLOW_MS_ENV = 'PROFILE_SLOW_MS'
+
+# Prefix of every exported Prometheus metric
+PROMETHEUS_PREFIX = 'resume_analyzer'
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    escaped = (
+        (key, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+class SamplingProfiler:
+    """
+    Sample the call stack of one thread at a fixed interval
+
+    Samples are collapsed into ``outer;...;inner`` strings with a count each,
+    the input format of flame graph tools.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005, max_depth: int = 40):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stopped.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+
+class Metrics:
+    """
+    Thread-safe registry of stage timers and counters
+
+    Stages record their call count, wall time and CPU time of the calling
+    thread. Counters are free-form, such as bytes read, pages per extraction
+    backend or cache hits and misses. Everything can carry labels and is
+    exported in the Prometheus text format or as one JSON document.
+
+    Metrics are per process, so work done in worker processes is only counted there.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._stages: Dict[Tuple[str, Labels], List[float]] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._local = threading.local()
+
+        # Slow request profiling, off unless configured
+        self.profile_threshold: Optional[float] = None
+        self.profile_interval = 0.005
+        self.profile_hook: Callable[[str, float, Counter], None] = self._log_slow_request
+        slow_ms = os.environ.get(PROFILE_SLOW_MS_ENV)
+        if slow_ms:
+            self.configure_profiler(float(slow_ms) / 1000)
+
+    def configure_profiler(self, threshold: Optional[float], interval: float = 0.005,
+                           hook: Optional[Callable[[str, float, Counter], None]] = None):
+        """
+        Profile stages opened with ``profile=True`` and report those slower than ``threshold`` seconds
+
+        Args:
+            threshold (float): Wall time in seconds above which a stage is reported, None to disable
+            interval (float): Seconds between stack samples
+            hook: Called with the stage name, its wall time and the collapsed stack
+                samples. Defaults to logging the most frequent stacks as JSON.
+        """
+        self.profile_threshold = threshold
+        self.profile_interval = interval
+        self.profile_hook = hook if hook else self._log_slow_request
+
+    def observe(self, name: str, wall: float, cpu: float = 0.0, **labels):
+        """Record one completed call of a stage"""
+        key = (name, _labels(labels))
+        with self._lock:
+            totals = self._stages.get(key)
+            if totals is None:
+                self._stages[key] = [1, wall, cpu]
+            else:
+                totals[0] += 1
+                totals[1] += wall
+                totals[2] += cpu
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add ``value`` to a counter"""
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    @contextmanager
+    def stage(self, name: str, profile: bool = False, **labels) -> Iterator[None]:
+        """
+        Time the enclosed block as one call of stage ``name``
+
+        With ``profile=True`` and the profiler configured, the block's thread
+        is sampled and reported if it runs longer than the threshold. Nested
+        profiled stages are covered by the outermost one.
+        """
+        profiler = None
+        if profile and self.profile_threshold is not None and not getattr(self._local, 'profiling', False):
+            self._local.profiling = True
+            profiler = SamplingProfiler(threading.get_ident(), self.profile_interval)
+            profiler.start()
+
+        wall_started = time.perf_counter()
+        cpu_started = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_started
+            self.observe(name, wall, time.thread_time() - cpu_started, **labels)
+            if profiler is not None:
+                samples = profiler.stop()
+                self._local.profiling = False
+                if wall > self.profile_threshold:
+                    self.profile_hook(name, wall, samples)
+
+    def _log_slow_request(self, name: str, wall: float, samples: Counter):
+        self.logger.warning(json.dumps({
+            'event': 'slow_stage',
+            'stage': name,
+            'wall_seconds': round(wall, 6),
+            'samples': sum(samples.values()),
+            'top_stacks': samples.most_common(10),
+        }))
+
+    def snapshot(self) -> Dict:
+        """
+        All metrics as a JSON-serializable dict
+
+        Cache hit rates are derived from ``cache_hits`` and ``cache_misses``
+        counters labeled by ``cache``.
+        """
+        with self._lock:
+            stages = {key: list(totals) for key, totals in self._stages.items()}
+            counters = dict(self._counters)
+
+        hits, misses = Counter(), Counter()
+        for (name, labels), value in counters.items():
+            cache = dict(labels).get('cache')
+            if name == 'cache_hits':
+                hits[cache] += value
+            elif name == 'cache_misses':
+                misses[cache] += value
+
+        return {
+            'stages': [
+                {'stage': name, 'labels': dict(labels), 'calls': calls, 'wall_seconds': wall, 'cpu_seconds': cpu}
+                for (name, labels), (calls, wall, cpu) in sorted(stages.items())
+            ],
+            'counters': [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(counters.items())
+            ],
+            'cache_hit_rates': {
+                cache: hits[cache] / (hits[cache] + misses[cache])
+                for cache in set(hits) | set(misses) if hits[cache] + misses[cache]
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            stages = sorted((key, list(totals)) for key, totals in self._stages.items())
+            counters = sorted(self._counters.items())
+
+        lines = []
+        for suffix, column, help_text in (
+            ('stage_calls_total', 0, 'Completed calls per pipeline stage'),
+            ('stage_seconds_total', 1, 'Wall time spent per pipeline stage'),
+            ('stage_cpu_seconds_total', 2, 'CPU time of the calling thread per pipeline stage'),
+        ):
+            metric = f'{PROMETHEUS_PREFIX}_{suffix}'
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} counter')
+            for (name, labels), totals in stages:
+                lines.append(f'{metric}{_format_labels((("stage", name),) + labels)} {totals[column]}')
+
+        declared = set()
+        for (name, labels), value in counters:
+            metric = f'{PROMETHEUS_PREFIX}_{name}_total'
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric}{_format_labels(labels)} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+    def log_json(self, level: int = logging.INFO):
+        """Log a snapshot of all metrics as one JSON line"""
+        self.logger.log(level, json.dumps({'event': 'metrics', **self.snapshot()}))
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Get the process-wide metrics registry"""
+    return _metrics
+
+
+def timed(name: str, profile: bool = False):
+    """Decorator recording every call of a function as stage ``name``"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with _metrics.stage(name, profile=profile):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,117 @@
+import logging
+import threading
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+
+DEFAULT_MODEL = "en_core_web_sm"
+
+# Components left out of each pipeline profile. Excluded components are never
+# loaded, so a profile only pays for the work its callers actually need.
+PIPELINE_PROFILES = {
+    # Everything the model ships with
+    'full': [],
+    # Sentence boundaries only, used for education and requirement extraction
+    'sentences': ['tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'ner'],
+    # Part-of-speech tags only, used for noun extraction in skill gap analysis
+    'tagger': ['parser', 'senter', 'lemmatizer', 'ner'],
+    # Tokenizer only
+    'tokens': ['tok2vec', 'tagger', 'parser', 'senter', 'attribute_ruler', 'lemmatizer', 'ner'],
+}
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded spaCy pipelines keyed by model and profile"""
+
+    def __init__(self):
+        self._models: Dict[Tuple[str, str], 'Language'] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, profile: str = 'full', model: str = DEFAULT_MODEL) -> 'Language':
+        """
+        Return the pipeline for a model and profile, loading it on first use
+
+        Args:
+            profile (str): One of the keys of ``PIPELINE_PROFILES``
+            model (str): Name or path of the spaCy model
+
+        Returns:
+            Loaded spaCy pipeline, shared by every caller in the process
+        """
+        if profile not in PIPELINE_PROFILES:
+            raise ValueError(f"Unknown pipeline profile: {profile}")
+
+        key = (model, profile)
+        nlp = self._models.get(key)
+        if nlp is None:
+            with self._lock:
+                # Another thread may have loaded it while we were waiting
+                nlp = self._models.get(key)
+                if nlp is None:
+                    nlp = self._load(model, profile)
+                    self._models[key] = nlp
+        return nlp
+
+    def _load(self, model: str, profile: str) -> 'Language':
+        # spaCy takes a while to import, so it is only imported once a model is needed
+        import spacy
+
+        self.logger.info(f"Loading spaCy model {model} ({profile} profile)")
+        nlp = spacy.load(model, exclude=PIPELINE_PROFILES[profile])
+
+        if profile == 'sentences':
+            if 'senter' in nlp.component_names:
+                nlp.enable_pipe('senter')
+            elif not nlp.has_pipe('sentencizer'):
+                nlp.add_pipe('sentencizer')
+
+            # The shared tok2vec layer is only needed if the sentence
+            # segmenter listens to it
+            if 'tok2vec' in nlp.pipe_names:
+                listeners = getattr(nlp.get_pipe('tok2vec'), 'listening_components', [])
+                if not any(name in nlp.pipe_names for name in listeners):
+                    nlp.disable_pipe('tok2vec')
+
+        return nlp
+
+    def clear(self):
+        """Drop all loaded pipelines"""
+        with self._lock:
+            self._models.clear()
+
+
+_registry = ModelRegistry()
+
+
+def get_nlp(profile: str = 'full', model: str = DEFAULT_MODEL) -> 'Language':
+    """
+    Get a shared spaCy pipeline from the process-wide registry
+
+    Args:
+        profile (str): Pipeline profile, see ``PIPELINE_PROFILES``
+        model (str): Name or path of the spaCy model
+
+    Returns:
+        Loaded spaCy pipeline
+    """
+    return _registry.get(profile, model)
+
+
+def pipe_unique(nlp, texts: Sequence[str], batch_size: int = 64, n_process: int = 1) -> List:
+    """
+    Parse many texts with one ``nlp.pipe`` run, parsing repeated texts once
+
+    Args:
+        nlp: spaCy pipeline
+        texts: Texts to parse
+        batch_size (int): Texts per ``nlp.pipe`` batch
+        n_process (int): Worker processes used by ``nlp.pipe``, -1 for one per CPU
+
+    Returns:
+        One Doc per input text, in input order. Repeated texts share a Doc.
+    """
+    unique = list(dict.fromkeys(texts))
+    docs = dict(zip(unique, nlp.pipe(unique, batch_size=batch_size, n_process=n_process)))
+    return [docs[text] for text in texts]
@@ -0,0 +1,497 @@
+import io
+import os
+import re
+import time
+import signal
+import logging
+import threading
+import multiprocessing
+from collections import defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from metrics import get_metrics
+
+# Glyphs pdfminer could not map to Unicode show up as "(cid:123)"
+_CID_PATTERN = re.compile(r'\(cid:\d+\)')
+
+
+class PdfLimits(NamedTuple):
+    max_pages: int = 100
+    max_bytes: int = 25 * 1024 * 1024
+    timeout: float = 30.0
+
+
+class PdfExtractionResult(NamedTuple):
+    text: str
+    page_count: int
+    # Backend that produced each extracted page, or None if none produced text
+    page_backends: List[Optional[str]]
+    # Seconds spent in each backend
+    timings: Dict[str, float]
+    # True if pages were skipped because of the page or time limit
+    truncated: bool
+
+
+def page_quality(text: str) -> float:
+    """
+    Score how usable a page's extracted text is, from 0 (unusable) to 1
+
+    Penalizes empty text layers, unmapped glyphs, a low share of letters and
+    digits, and long runs without spaces (words glued together).
+    """
+    if not text or not text.strip():
+        return 0.0
+
+    cid_chars = sum(len(m) for m in _CID_PATTERN.findall(text))
+    length = len(text)
+    alnum = sum(ch.isalnum() for ch in text)
+    spaces = sum(ch.isspace() for ch in text)
+
+    score = (alnum + spaces) / length
+    score *= 1 - cid_chars / length
+    if length > 200 and spaces / length < 0.05:
+        score *= 0.5
+    return score
+
+
+def _process_context():
+    """
+    Start method for extraction processes
+
+    fork is the cheapest, but a child forked while other threads hold locks
+    (Streamlit, Qt or HTTP server threads, or a worker pool's own manager
+    thread) can deadlock, so threaded hosts get forkserver, or spawn where
+    that is unavailable.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if 'fork' in methods and threading.active_count() == 1:
+        return multiprocessing.get_context('fork')
+    if 'forkserver' in methods:
+        context = multiprocessing.get_context('forkserver')
+        # Children fork from a server that already has the backends loaded
+        context.set_forkserver_preload(['pdf_extraction', 'PyPDF2', 'pdfplumber'])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def _read_source(source: Union[str, bytes], max_bytes: int) -> bytes:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        size = len(source)
+    else:
+        size = os.path.getsize(source)
+    if size > max_bytes:
+        raise ValueError(f"PDF is {size} bytes, the limit is {max_bytes}")
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    with open(source, 'rb') as file:
+        return file.read()
+
+
+def _page_count(data: bytes) -> int:
+    import PyPDF2
+    import pdfplumber
+
+    try:
+        return len(PyPDF2.PdfReader(io.BytesIO(data)).pages)
+    except Exception:
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            return len(pdf.pages)
+
+
+def _iter_page_range(data: bytes, start: int, stop: int, quality_threshold: float, deadline: float,
+                     timings: Dict[str, float]) -> Iterator[Tuple[int, str, Optional[str]]]:
+    """
+    Extract pages ``start`` to ``stop`` one at a time, picking the best backend for each
+
+    PyPDF2 is tried first because it is the fastest. pdfplumber is only used
+    for pages whose PyPDF2 text scores below ``quality_threshold``. Extraction
+    stops early once ``deadline`` (a ``time.time()`` value) has passed. Seconds
+    spent in each backend are added to ``timings``.
+    """
+    # Backends are imported here rather than at module load to keep startup fast
+    import PyPDF2
+    import pdfplumber
+
+    plumber = None
+
+    try:
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+    except Exception:
+        reader = None
+
+    try:
+        for index in range(start, stop):
+            if time.time() > deadline:
+                break
+
+            text, backend = '', None
+            if reader is not None:
+                started = time.perf_counter()
+                try:
+                    text = reader.pages[index].extract_text() or ''
+                    backend = 'pypdf2'
+                except Exception:
+                    text = ''
+                timings['pypdf2'] += time.perf_counter() - started
+
+            quality = page_quality(text)
+            if quality < quality_threshold:
+                started = time.perf_counter()
+                try:
+                    if plumber is None:
+                        plumber = pdfplumber.open(io.BytesIO(data))
+                    fallback = plumber.pages[index].extract_text() or ''
+                    if page_quality(fallback) > quality:
+                        text, backend = fallback, 'pdfplumber'
+                except Exception:
+                    pass
+                timings['pdfplumber'] += time.perf_counter() - started
+
+            yield index, text, backend if text else None
+    finally:
+        if plumber is not None:
+            plumber.close()
+
+
+def _extract_page_range(data: bytes, start: int, stop: int, quality_threshold: float,
+                        deadline: float) -> Tuple[List[Tuple[int, str, Optional[str]]], Dict[str, float]]:
+    """Extract a page range at once, returning the pages and per-backend timings"""
+    timings = defaultdict(float)
+    pages = list(_iter_page_range(data, start, stop, quality_threshold, deadline, timings))
+    return pages, dict(timings)
+
+
+class _DeadlineExceeded(BaseException):
+    """Raised by SIGALRM in pool workers to interrupt a page still running at the deadline"""
+
+
+def _raise_deadline(signum, frame):
+    raise _DeadlineExceeded()
+
+
+@contextmanager
+def _deadline_alarm(deadline: float):
+    """Raise _DeadlineExceeded in this process once ``deadline`` passes, where SIGALRM exists"""
+    alarm = hasattr(signal, 'setitimer')
+    if alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_deadline)
+        signal.setitimer(signal.ITIMER_REAL, max(0.001, deadline - time.time()))
+    try:
+        yield
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def _worker_data(source: Union[str, bytes]) -> bytes:
+    """File paths are read by the worker itself, so only in-memory documents are pickled"""
+    if isinstance(source, str):
+        with open(source, 'rb') as file:
+            return file.read()
+    return source
+
+
+def _page_count_worker(source: Union[str, bytes], deadline: float) -> Optional[int]:
+    """Pool worker entry point: count the pages of a PDF, None if the deadline passes first"""
+    data = _worker_data(source)
+    try:
+        with _deadline_alarm(deadline):
+            return _page_count(data)
+    except _DeadlineExceeded:
+        return None
+
+
+def _extract_page_range_worker(source: Union[str, bytes], start: int, stop: int, quality_threshold: float,
+                               deadline: float) -> Tuple[List[Tuple[int, str, Optional[str]]], Dict[str, float]]:
+    """
+    Pool worker entry point: extract a page range of a PDF file or PDF bytes
+
+    An alarm interrupts a page still being extracted at the deadline, which
+    frees the worker for the next document; the pages finished so far are kept.
+    """
+    data = _worker_data(source)
+    timings = defaultdict(float)
+    pages = []
+
+    try:
+        with _deadline_alarm(deadline):
+            for page in _iter_page_range(data, start, stop, quality_threshold, deadline, timings):
+                pages.append(page)
+    except _DeadlineExceeded:
+        pass
+    return pages, dict(timings)
+
+
+def _send_pages(connection, data: bytes, page_count: Optional[int], max_pages: int, quality_threshold: float,
+                deadline: float):
+    """Child process entry point: send the page count, each extracted page and the per-backend timings"""
+    try:
+        if page_count is None:
+            page_count = _page_count(data)
+        connection.send(('count', page_count))
+        timings = defaultdict(float)
+        for page in _iter_page_range(data, 0, min(page_count, max_pages), quality_threshold, deadline, timings):
+            connection.send(('page', page))
+        connection.send(('done', dict(timings)))
+    except BaseException as e:
+        connection.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        connection.close()
+
+
+class _IsolatedPages:
+    """
+    Pages of a PDF extracted serially in a child process
+
+    The child is killed once the deadline passes, so a page that never
+    finishes can't block the caller. Iteration stops early on a timeout and
+    ``timed_out`` is set.
+    """
+
+    def __init__(self, data: bytes, max_pages: int, quality_threshold: float, deadline: float,
+                 page_count: Optional[int] = None):
+        context = _process_context()
+        self.deadline = deadline
+        self.timings: Dict[str, float] = {}
+        self.timed_out = False
+        self._receiver, sender = context.Pipe(duplex=False)
+        self._process = context.Process(
+            target=_send_pages, args=(sender, data, page_count, max_pages, quality_threshold, deadline), daemon=True
+        )
+        self._process.start()
+        sender.close()
+
+        try:
+            message = self._receive()
+            if message is None:
+                raise TimeoutError("PDF page count timed out")
+            self.page_count = message
+        except BaseException:
+            self.close()
+            raise
+
+    def _receive(self) -> Any:
+        """The next message from the child, None on a timeout"""
+        if not self._receiver.poll(max(0.0, self.deadline - time.time())):
+            self.timed_out = True
+            return None
+        try:
+            kind, value = self._receiver.recv()
+        except EOFError:
+            raise RuntimeError(f"PDF extraction process died with exit code {self._process.exitcode}")
+        if kind == 'error':
+            raise ValueError(value)
+        if kind == 'done':
+            self.timings = value
+            return None
+        return value
+
+    def __iter__(self) -> Iterator[Tuple[int, str, Optional[str]]]:
+        while True:
+            page = self._receive()
+            if page is None:
+                return
+            yield page
+
+    def close(self):
+        self._receiver.close()
+        if self._process.is_alive():
+            self._process.kill()
+        self._process.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Page-range worker pools shared by every PdfExtractor in the process, by worker count
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=_process_context())
+        return pool
+
+
+def _discard_pool(workers: int, pool: ProcessPoolExecutor):
+    """Stop handing work to a pool, so the next document gets a fresh one"""
+    with _pools_lock:
+        if _pools.get(workers) is pool:
+            del _pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class PdfExtractor:
+    """
+    PDF text extraction with resource limits and per-page backend selection
+
+    Documents over ``max_bytes`` are rejected, only the first ``max_pages``
+    pages are read, and extraction stops once ``timeout`` seconds have passed.
+    With more than one worker, pages are counted in a worker pool shared
+    across documents, and documents with at least ``parallel_threshold``
+    pages are split into page ranges extracted by that pool. Others are
+    extracted serially in a child process that is killed at the timeout, or
+    in this process if ``isolate`` is off because the caller enforces its own
+    wall time limit.
+    """
+
+    def __init__(self, limits: Optional[PdfLimits] = None, parallel_threshold: int = 16,
+                 max_workers: Optional[int] = None, quality_threshold: float = 0.6, isolate: bool = True):
+        self.limits = limits if limits else PdfLimits()
+        self.parallel_threshold = parallel_threshold
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.quality_threshold = quality_threshold
+        self.isolate = isolate
+        self.logger = logging.getLogger(__name__)
+
+        # Cumulative per-backend totals across all documents
+        self.backend_timings: Dict[str, float] = defaultdict(float)
+        self.backend_pages: Dict[str, int] = defaultdict(int)
+
+    def extract(self, source: Union[str, bytes]) -> PdfExtractionResult:
+        """
+        Extract text from a PDF file path or PDF bytes
+
+        Returns:
+            PdfExtractionResult with the text of every extracted page joined by spaces
+        """
+        data = _read_source(source, self.limits.max_bytes)
+        deadline = time.time() + self.limits.timeout
+
+        # Counting pages only pays off when they may be spread over the pool,
+        # and is done there so a malformed document can't hang this process
+        page_count = self._count_pages(source, data, deadline) if self.max_workers > 1 else None
+        to_extract = min(page_count, self.limits.max_pages) if page_count is not None else 0
+
+        if to_extract >= self.parallel_threshold and self.max_workers > 1:
+            pages, timings = self._extract_parallel(source, data, to_extract, deadline)
+        elif self.isolate:
+            with _IsolatedPages(data, self.limits.max_pages, self.quality_threshold, deadline, page_count) as isolated:
+                pages = list(isolated)
+            page_count, timings = isolated.page_count, isolated.timings
+        else:
+            page_count = _page_count(data) if page_count is None else page_count
+            pages, timings = _extract_page_range(data, 0, min(page_count, self.limits.max_pages),
+                                                 self.quality_threshold, deadline)
+
+        pages.sort()
+        backends = [backend for _, _, backend in pages]
+        self._record(timings, backends)
+
+        truncated = len(pages) < page_count
+        if truncated:
+            get_metrics().inc('pdf_truncated')
+            self.logger.warning(f"Extracted {len(pages)} of {page_count} PDF pages (page or time limit reached)")
+
+        return PdfExtractionResult(
+            text=" ".join(text for _, text, _ in pages if text),
+            page_count=page_count,
+            page_backends=backends,
+            timings=timings,
+            truncated=truncated
+        )
+
+    def iter_pages(self, source: Union[str, bytes]) -> Iterator[str]:
+        """
+        Yield the text of each page in order, under the same limits as ``extract``
+
+        Pages are extracted serially, so a caller that stops iterating early
+        never waits for the remaining pages.
+        """
+        data = _read_source(source, self.limits.max_bytes)
+        deadline = time.time() + self.limits.timeout
+
+        if self.isolate:
+            with _IsolatedPages(data, self.limits.max_pages, self.quality_threshold, deadline) as isolated:
+                try:
+                    for _, text, backend in isolated:
+                        self._record({}, [backend])
+                        yield text
+                finally:
+                    self._record(isolated.timings, [])
+            return
+
+        timings = defaultdict(float)
+        try:
+            to_extract = min(_page_count(data), self.limits.max_pages)
+            for _, text, backend in _iter_page_range(data, 0, to_extract, self.quality_threshold,
+                                                     deadline, timings):
+                self._record({}, [backend])
+                yield text
+        finally:
+            self._record(timings, [])
+
+    def _record(self, timings: Dict[str, float], backends: List[Optional[str]]):
+        """Add per-backend seconds and page counts to the totals and the process metrics"""
+        metrics = get_metrics()
+        for backend, seconds in timings.items():
+            self.backend_timings[backend] += seconds
+            metrics.inc('pdf_backend_seconds', seconds, backend=backend)
+        for backend in backends:
+            if backend:
+                self.backend_pages[backend] += 1
+            # Pages no backend got text from are counted as "none"
+            metrics.inc('pdf_pages', backend=backend or 'none')
+
+    def _count_pages(self, source: Union[str, bytes], data: bytes, deadline: float) -> int:
+        """Count pages in the worker pool, raising TimeoutError if that outlasts the deadline"""
+        pool = _get_pool(self.max_workers)
+        future = pool.submit(_page_count_worker, source if isinstance(source, str) else data, deadline)
+        try:
+            # The worker interrupts itself at the deadline, allow it a moment to report back
+            page_count = future.result(timeout=max(0.0, deadline - time.time()) + 1.0)
+        except FutureTimeoutError:
+            _discard_pool(self.max_workers, pool)
+            page_count = None
+        except BrokenProcessPool:
+            # A worker died on this document, e.g. killed for running out of memory
+            _discard_pool(self.max_workers, pool)
+            raise
+        if page_count is None:
+            raise TimeoutError("PDF page count timed out")
+        return page_count
+
+    def _extract_parallel(self, source: Union[str, bytes], data: bytes, to_extract: int, deadline: float):
+        workers = min(self.max_workers, to_extract)
+        step = -(-to_extract // workers)
+        pages, timings = [], defaultdict(float)
+
+        # Workers read files themselves, in-memory PDFs are sent along with each range
+        document = source if isinstance(source, str) else data
+        pool = _get_pool(self.max_workers)
+        futures = [
+            pool.submit(_extract_page_range_worker, document, start, min(start + step, to_extract),
+                        self.quality_threshold, deadline)
+            for start in range(0, to_extract, step)
+        ]
+        # Workers interrupt themselves at the deadline, allow them a moment to report back
+        done, not_done = wait(futures, timeout=max(0.0, deadline - time.time()) + 1.0)
+
+        for future in done:
+            try:
+                range_pages, range_timings = future.result()
+            except Exception as e:
+                self.logger.warning(f"PDF page range extraction failed: {e}")
+                if isinstance(e, BrokenProcessPool):
+                    _discard_pool(self.max_workers, pool)
+                continue
+            pages.extend(range_pages)
+            for backend, seconds in range_timings.items():
+                timings[backend] += seconds
+
+        if not_done:
+            self.logger.warning(f"PDF extraction timed out with {len(not_done)} page ranges unfinished")
+            _discard_pool(self.max_workers, pool)
+
+        return pages, dict(timings)
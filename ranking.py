@@ -0,0 +1,138 @@
+import logging
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from tfidf_model import get_default_tfidf_model
+
+if TYPE_CHECKING:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+# (index, cosine score) pairs, best first
+Ranking = List[Tuple[int, float]]
+
+
+class RankingResult(NamedTuple):
+    jobs_per_resume: List[Ranking]
+    resumes_per_job: List[Ranking]
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices and scores of the k best columns of each row, best first"""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.int64), empty
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+class MatchRanker:
+    """
+    Rank many resumes against many jobs with TF-IDF cosine similarity
+
+    All documents are vectorized once into sparse L2-normalized matrices, so
+    cosine similarity is a plain sparse matrix product. Scores are computed in
+    row chunks whose dense size never exceeds ``max_chunk_bytes``, keeping only
+    the running top-k for each resume and each job.
+    """
+
+    def __init__(self, vectorizer: Optional['TfidfVectorizer'] = None, max_chunk_bytes: int = 64 * 1024 * 1024):
+        # A vectorizer that is already fitted, such as the persisted default
+        # model, is only used to transform
+        if vectorizer is None:
+            vectorizer = get_default_tfidf_model()
+        if vectorizer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            vectorizer = TfidfVectorizer(stop_words='english')
+        self.vectorizer = vectorizer
+        self.max_chunk_bytes = max_chunk_bytes
+        self.logger = logging.getLogger(__name__)
+
+    def vectorize(self, resume_texts: Sequence[str], job_texts: Sequence[str]):
+        """
+        Vectorize resumes and jobs into sparse TF-IDF matrices
+
+        If the vectorizer is not fitted yet it is fitted once on the combined
+        corpus, so IDF weights reflect every document being ranked.
+        """
+        if not hasattr(self.vectorizer, 'vocabulary_'):
+            self.vectorizer.fit(list(resume_texts) + list(job_texts))
+
+        resumes = self.vectorizer.transform(resume_texts).tocsr()
+        jobs = self.vectorizer.transform(job_texts).tocsr()
+        return resumes, jobs
+
+    def rank(self, resume_texts: Sequence[str], job_texts: Sequence[str], k: int = 10) -> RankingResult:
+        """
+        Find the top-k jobs for each resume and the top-k resumes for each job
+
+        Args:
+            resume_texts: Raw resume texts
+            job_texts: Raw job description texts
+            k (int): Number of matches kept per resume and per job
+
+        Returns:
+            RankingResult with one best-first list of (index, score) pairs per
+            resume and per job
+        """
+        if not len(resume_texts) or not len(job_texts):
+            return RankingResult([[] for _ in resume_texts], [[] for _ in job_texts])
+
+        resumes, jobs = self.vectorize(resume_texts, job_texts)
+        return self.rank_matrices(resumes, jobs, k)
+
+    def rank_matrices(self, resumes, jobs, k: int = 10) -> RankingResult:
+        """Rank pre-vectorized, L2-normalized sparse matrices"""
+        n_resumes, n_jobs = resumes.shape[0], jobs.shape[0]
+        jobs_t = jobs.T.tocsc()
+
+        chunk_rows = max(1, self.max_chunk_bytes // max(1, n_jobs * 8))
+        k_jobs = min(k, n_jobs)
+        k_resumes = min(k, n_resumes)
+
+        jobs_per_resume: List[Ranking] = []
+        # Running best resumes per job, stored column-wise (k x n_jobs)
+        best_resume_idx = np.empty((0, n_jobs), dtype=np.int64)
+        best_resume_scores = np.empty((0, n_jobs))
+
+        for start in range(0, n_resumes, chunk_rows):
+            stop = min(start + chunk_rows, n_resumes)
+            scores = (resumes[start:stop] @ jobs_t).toarray()
+
+            # Top jobs for each resume in this chunk
+            idx, top_scores = top_k_rows(scores, k_jobs)
+            for row_idx, row_scores in zip(idx, top_scores):
+                jobs_per_resume.append([(int(j), float(s)) for j, s in zip(row_idx, row_scores)])
+
+            # Merge this chunk's best resumes into the running top-k per job
+            if k_resumes and n_jobs:
+                idx, top_scores = top_k_rows(scores.T, k_resumes)
+                candidate_idx = np.vstack([best_resume_idx, idx.T + start])
+                candidate_scores = np.vstack([best_resume_scores, top_scores.T])
+                keep, kept_scores = top_k_rows(candidate_scores.T, k_resumes)
+                best_resume_idx = np.take_along_axis(candidate_idx.T, keep, axis=1).T
+                best_resume_scores = kept_scores.T
+
+        resumes_per_job = [
+            [(int(r), float(s)) for r, s in zip(best_resume_idx[:, j], best_resume_scores[:, j])]
+            for j in range(n_jobs)
+        ]
+
+        return RankingResult(jobs_per_resume, resumes_per_job)
+
+
+def rank_resumes_and_jobs(resume_texts: Sequence[str], job_texts: Sequence[str], k: int = 10) -> RankingResult:
+    """
+    Main function to rank resumes against job descriptions
+
+    Args:
+        resume_texts: Raw resume texts
+        job_texts: Raw job description texts
+        k (int): Number of matches kept per resume and per job
+
+    Returns:
+        RankingResult with the top-k jobs per resume and resumes per job
+    """
+    return MatchRanker().rank(resume_texts, job_texts, k)
@@ -0,0 +1,387 @@
+import re
+import json
+import math
+import sqlite3
+import logging
+import argparse
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from skill_matcher import get_skill_matcher, tokenize
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY,
+    file_path TEXT UNIQUE NOT NULL,
+    email TEXT,
+    phone TEXT,
+    skills TEXT NOT NULL,
+    education TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term_id INTEGER NOT NULL,
+    resume_id INTEGER NOT NULL,
+    is_skill INTEGER NOT NULL,
+    PRIMARY KEY (term_id, resume_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_by_resume ON postings (resume_id);
+"""
+
+# Query tokens: parentheses, quoted phrases and bare words
+_QUERY_TOKEN = re.compile(r'\(|\)|"[^"]*"|[^\s()"]+')
+_OPERATORS = {'AND', 'OR', 'NOT'}
+
+
+class QueryError(ValueError):
+    pass
+
+
+class _QueryParser:
+    """
+    Recursive-descent parser for boolean queries
+
+    Supports AND, OR, NOT, parentheses and quoted phrases. Adjacent terms
+    without an operator are combined with AND, e.g. ``python "machine learning"``.
+    """
+
+    def __init__(self, query: str):
+        self.tokens = _QUERY_TOKEN.findall(query)
+        self.pos = 0
+
+    def parse(self):
+        if not self.tokens:
+            raise QueryError("empty query")
+        node = self._or()
+        if self.pos != len(self.tokens):
+            raise QueryError(f"unexpected '{self.tokens[self.pos]}'")
+        return node
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _or(self):
+        nodes = [self._and()]
+        while self._peek() == 'OR':
+            self.pos += 1
+            nodes.append(self._and())
+        return nodes[0] if len(nodes) == 1 else ('or', nodes)
+
+    def _and(self):
+        nodes = [self._not()]
+        while self._peek() not in (None, ')', 'OR'):
+            if self._peek() == 'AND':
+                self.pos += 1
+            nodes.append(self._not())
+        return nodes[0] if len(nodes) == 1 else ('and', nodes)
+
+    def _not(self):
+        if self._peek() == 'NOT':
+            self.pos += 1
+            return ('not', self._not())
+        return self._atom()
+
+    def _atom(self):
+        token = self._peek()
+        if token is None:
+            raise QueryError("query ends unexpectedly")
+        self.pos += 1
+        if token == '(':
+            node = self._or()
+            if self._peek() != ')':
+                raise QueryError("missing ')'")
+            self.pos += 1
+            return node
+        if token == ')' or token in _OPERATORS:
+            raise QueryError(f"unexpected '{token}'")
+        return ('term', token.strip('"'))
+
+
+class ResumeIndex:
+    """
+    Persistent SQLite index of parsed resumes
+
+    Stores contact, skill and education fields for every resume together with
+    an inverted index from skills and text terms to resumes. Resumes are keyed
+    by file path, so adding a path again replaces its previous entry.
+    """
+
+    def __init__(self, path: str, skill_matcher=None):
+        self.path = path
+        self.skill_matcher = skill_matcher if skill_matcher else get_skill_matcher()
+        self.logger = logging.getLogger(__name__)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM resumes').fetchone()[0]
+
+    def _index_terms(self, resume_data: Dict[str, Any]) -> Dict[str, int]:
+        """Map each indexed term of a resume to 1 if it is a skill, else 0"""
+        terms = {
+            token: 0 for token, _, _ in tokenize(resume_data.get('raw_text', ''))
+            if len(token) > 1 and not token.isdigit()
+        }
+        for skill in resume_data.get('skills', []):
+            terms[skill.lower()] = 1
+        return terms
+
+    def _term_ids(self, terms: Iterable[str]) -> Dict[str, int]:
+        terms = list(terms)
+        self.conn.executemany('INSERT OR IGNORE INTO terms (term) VALUES (?)', ((term,) for term in terms))
+        ids = {}
+        # Stay below SQLite's limit on bound parameters
+        for start in range(0, len(terms), 500):
+            batch = terms[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            ids.update(self.conn.execute(
+                f'SELECT term, id FROM terms WHERE term IN ({placeholders})', batch
+            ))
+        return ids
+
+    def _remove(self, file_path: str):
+        row = self.conn.execute('SELECT id FROM resumes WHERE file_path = ?', (file_path,)).fetchone()
+        if row:
+            self.conn.execute('DELETE FROM postings WHERE resume_id = ?', row)
+            self.conn.execute('DELETE FROM resumes WHERE id = ?', row)
+        return row is not None
+
+    def _add(self, resume_data: Dict[str, Any]) -> int:
+        file_path = resume_data['file_path']
+        contact_info = resume_data.get('contact_info', {})
+        self._remove(file_path)
+
+        cursor = self.conn.execute(
+            'INSERT INTO resumes (file_path, email, phone, skills, education) VALUES (?, ?, ?, ?, ?)',
+            (file_path, contact_info.get('email'), contact_info.get('phone'),
+             json.dumps(resume_data.get('skills', [])), json.dumps(resume_data.get('education', [])))
+        )
+        resume_id = cursor.lastrowid
+
+        terms = self._index_terms(resume_data)
+        term_ids = self._term_ids(terms)
+        self.conn.executemany(
+            'INSERT INTO postings (term_id, resume_id, is_skill) VALUES (?, ?, ?)',
+            ((term_ids[term], resume_id, is_skill) for term, is_skill in terms.items())
+        )
+        return resume_id
+
+    def add(self, resume_data: Dict[str, Any]) -> int:
+        """
+        Add or replace a parsed resume
+
+        Args:
+            resume_data (dict): Result of ``ResumeParser.parse_resume``
+
+        Returns:
+            Internal ID of the indexed resume
+        """
+        with self.conn:
+            return self._add(resume_data)
+
+    def add_many(self, resumes: Iterable[Dict[str, Any]], batch_size: int = 1000) -> int:
+        """Add many parsed resumes, committing every ``batch_size`` resumes"""
+        count = 0
+        for resume_data in resumes:
+            self._add(resume_data)
+            count += 1
+            if count % batch_size == 0:
+                self.conn.commit()
+        self.conn.commit()
+        return count
+
+    def remove(self, file_path: str) -> bool:
+        """Remove a resume from the index, returning whether it was present"""
+        with self.conn:
+            return self._remove(file_path)
+
+    def _normalize_term(self, term: str) -> List[str]:
+        """
+        Map a query term to the indexed terms it stands for
+
+        Skill names and aliases resolve to the canonical skill, so "k8s" finds
+        resumes listing Kubernetes. Other phrases become their tokens.
+        """
+        matches = self.skill_matcher.find(term)
+        if len(matches) == 1 and matches[0].start == 0 and matches[0].end == len(term.rstrip('.')):
+            return [matches[0].name.lower()]
+        return [token for token, _, _ in tokenize(term)]
+
+    def _compile(self, node) -> Tuple[str, List[Any]]:
+        """Compile a query tree to a SELECT returning matching resume IDs"""
+        kind = node[0]
+
+        if kind == 'term':
+            terms = self._normalize_term(node[1])
+            if not terms:
+                return 'SELECT id FROM resumes WHERE 0', []
+            selects = [
+                'SELECT p.resume_id FROM postings p JOIN terms t ON t.id = p.term_id WHERE t.term = ?'
+                for _ in terms
+            ]
+            return ' INTERSECT '.join(selects), terms
+
+        if kind == 'not':
+            sql, params = self._compile(node[1])
+            return f'SELECT id FROM resumes EXCEPT SELECT * FROM ({sql})', params
+
+        if kind == 'or':
+            parts = [self._compile(child) for child in node[1]]
+            return (' UNION '.join(f'SELECT * FROM ({sql})' for sql, _ in parts),
+                    [param for _, params in parts for param in params])
+
+        # AND: intersect the positive operands and subtract the negated ones
+        positives = [child for child in node[1] if child[0] != 'not']
+        negatives = [child[1] for child in node[1] if child[0] == 'not']
+        if not positives:
+            positives = [('all',)]
+
+        sql_parts, params = [], []
+        for child in positives:
+            if child[0] == 'all':
+                sql, child_params = 'SELECT id FROM resumes', []
+            else:
+                sql, child_params = self._compile(child)
+            sql_parts.append(f'SELECT * FROM ({sql})')
+            params.extend(child_params)
+        sql = ' INTERSECT '.join(sql_parts)
+
+        for child in negatives:
+            child_sql, child_params = self._compile(child)
+            sql += f' EXCEPT SELECT * FROM ({child_sql})'
+            params.extend(child_params)
+        return sql, params
+
+    def _fetch(self, resume_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        rows = {}
+        for start in range(0, len(resume_ids), 500):
+            batch = resume_ids[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            for resume_id, file_path, email, phone, skills, education in self.conn.execute(
+                f'SELECT id, file_path, email, phone, skills, education FROM resumes WHERE id IN ({placeholders})',
+                batch
+            ):
+                contact_info = {key: value for key, value in (('email', email), ('phone', phone)) if value}
+                rows[resume_id] = {
+                    'file_path': file_path,
+                    'contact_info': contact_info,
+                    'skills': json.loads(skills),
+                    'education': json.loads(education),
+                }
+        return rows
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Run a boolean query such as ``Python AND (Kubernetes OR k8s) NOT Java``
+
+        Returns:
+            Stored fields of the matching resumes, in index order
+        """
+        sql, params = self._compile(_QueryParser(query).parse())
+        sql = f'SELECT * FROM ({sql}) ORDER BY 1'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params = params + [limit]
+
+        resume_ids = [row[0] for row in self.conn.execute(sql, params)]
+        rows = self._fetch(resume_ids)
+        return [rows[resume_id] for resume_id in resume_ids]
+
+    def search_ranked(self, query: str, limit: int = 20) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Rank resumes by how many query terms they contain
+
+        Each matched term adds its inverse document frequency to the score,
+        doubled when the resume lists it as a skill, so rare skills weigh most.
+
+        Returns:
+            (score, stored fields) pairs, best first
+        """
+        terms = sorted({
+            term for word in _QUERY_TOKEN.findall(query)
+            if word not in _OPERATORS and word not in '()'
+            for term in self._normalize_term(word.strip('"'))
+        })
+        if not terms:
+            return []
+
+        total = len(self)
+        placeholders = ','.join('?' * len(terms))
+        doc_freqs = dict(self.conn.execute(
+            f'SELECT t.id, COUNT(*) FROM terms t JOIN postings p ON p.term_id = t.id '
+            f'WHERE t.term IN ({placeholders}) GROUP BY t.id', terms
+        ))
+        if not doc_freqs:
+            return []
+
+        weights = {term_id: math.log(1 + total / df) for term_id, df in doc_freqs.items()}
+        cases = ' '.join('WHEN ? THEN ?' for _ in weights)
+        params = [value for item in weights.items() for value in item]
+        id_placeholders = ','.join('?' * len(weights))
+        scored = self.conn.execute(
+            f'SELECT resume_id, SUM((CASE term_id {cases} END) * (1 + is_skill)) AS score '
+            f'FROM postings WHERE term_id IN ({id_placeholders}) '
+            f'GROUP BY resume_id ORDER BY score DESC, resume_id LIMIT ?',
+            params + list(weights) + [limit]
+        ).fetchall()
+
+        rows = self._fetch([resume_id for resume_id, _ in scored])
+        return [(score, rows[resume_id]) for resume_id, score in scored]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Build and query a persistent index of parsed resumes")
+    parser.add_argument('index', help="SQLite index file")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add_cmd = commands.add_parser('add', help="Index JSONL output of batch_parser.py")
+    add_cmd.add_argument('jsonl', nargs='+')
+
+    remove_cmd = commands.add_parser('remove', help="Remove resumes by file path")
+    remove_cmd.add_argument('file_paths', nargs='+')
+
+    search_cmd = commands.add_parser('search', help="Boolean query, e.g. 'Python AND Kubernetes'")
+    search_cmd.add_argument('query')
+    search_cmd.add_argument('--limit', type=int)
+
+    rank_cmd = commands.add_parser('rank', help="Ranked query over the given terms")
+    rank_cmd.add_argument('query')
+    rank_cmd.add_argument('--limit', type=int, default=20)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    with ResumeIndex(args.index) as index:
+        if args.command == 'add':
+            for path in args.jsonl:
+                with open(path, 'r', encoding='utf-8') as file:
+                    resumes = (json.loads(line) for line in file if line.strip())
+                    count = index.add_many(r for r in resumes if 'error' not in r)
+                index.logger.info(f"Indexed {count} resumes from {path}")
+        elif args.command == 'remove':
+            for file_path in args.file_paths:
+                if not index.remove(file_path):
+                    index.logger.warning(f"Not indexed: {file_path}")
+        elif args.command == 'search':
+            for resume in index.search(args.query, args.limit):
+                print(json.dumps(resume, ensure_ascii=False))
+        else:
+            for score, resume in index.search_ranked(args.query, args.limit):
+                print(json.dumps({'score': round(score, 4), **resume}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
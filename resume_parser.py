@@ -1,118 +1,187 @@
+import io
 import os
 import re
 import logging
-from typing import Dict, List, Set, Any
-import textract
+from typing import Dict, List, Any, BinaryIO, Iterator, Optional, Tuple, Union
 from pathlib import Path
-import PyPDF2
-import docx
-import pdfplumber
-import spacy
+from nlp_models import get_nlp, pipe_unique
+from doc_cache import get_doc_cache
+from skill_matcher import get_skill_matcher
+from extraction_cache import get_default_extraction_cache
+from pdf_extraction import PdfExtractor
+from extractors import ExtractionError, create_registry, detect_file_type
+from metrics import get_metrics, timed
+
+# Bump whenever a change alters extracted text or parse results, so entries
+# in persistent extraction caches are invalidated
+PARSER_VERSION = '5'
+
+# Characters carried over between streamed chunks, so skills and contact
+# details split across a chunk boundary are still found
+CHUNK_OVERLAP = 100
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\b(\+\d{1,2}\s?)?(\d{3}[-.]?)?\s?\d{3}[-.]?\d{4}\b')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Anything the parser can read: a path, raw bytes or a binary file object
+ResumeSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+
+def _load_source(source: ResumeSource) -> Tuple[Optional[str], Optional[bytes]]:
+    """Split a source into a file path or in-memory bytes, exactly one of which is set"""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source), None
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return None, bytes(source)
+    if hasattr(source, 'read'):
+        return None, source.read()
+    raise TypeError(f"Unsupported resume source: {type(source).__name__}")
+
+
+def _split_at_whitespace(text: str, chunk_chars: int) -> Iterator[str]:
+    """Slice text into pieces of at most ``chunk_chars``, cutting between words where possible"""
+    start = 0
+    while start < len(text):
+        end = start + chunk_chars
+        if end < len(text):
+            cut = max(text.rfind(' ', start, end), text.rfind('\n', start, end))
+            if cut > start:
+                end = cut
+        yield text[start:end]
+        start = end
 
 class ResumeParser:
-    def __init__(self, nlp=None):
-        self.nlp = nlp if nlp else spacy.load("en_core_web_sm")
-        self.skill_patterns = self._load_skill_patterns()
+    def __init__(self, nlp=None, doc_cache=None, skill_matcher=None, extraction_cache=None,
+                 pdf_extractor=None, extractors=None):
+        # An explicitly passed pipeline is used for every task, otherwise
+        # each task gets the smallest shared pipeline that can serve it
+        self._nlp = nlp
+        self.doc_cache = doc_cache if doc_cache is not None else get_doc_cache()
+        self.skill_matcher = skill_matcher if skill_matcher else get_skill_matcher()
+        self.extraction_cache = (extraction_cache if extraction_cache is not None
+                                 else get_default_extraction_cache(PARSER_VERSION))
+        self.pdf_extractor = pdf_extractor if pdf_extractor else PdfExtractor()
+        # Text extractors per detected file type, see extractors.create_registry
+        self.extractors = extractors if extractors else create_registry(self.pdf_extractor)
         self.logger = logging.getLogger(__name__)
         logging.basicConfig(level=logging.INFO)
 
-    def _load_skill_patterns(self) -> Set[str]:
-        """Load common technical skills and frameworks"""
-        return {
-            'Python', 'Java', 'JavaScript', 'C++', 'SQL', 
-            'Machine Learning', 'Data Science', 'React', 
-            'Node.js', 'Docker', 'Kubernetes', 'AWS'
-        }
+    @property
+    def nlp(self):
+        return self._nlp if self._nlp else get_nlp()
 
-    def extract_text(self, file_path: str) -> str:
-        """Extract text from various file formats"""
-        file_extension = os.path.splitext(file_path)[1].lower()
-        
-        try:
-            if file_extension == '.pdf':
-                return self._extract_pdf_text(file_path)
-            elif file_extension in ['.docx', '.doc']:
-                return self._extract_docx_text(file_path)
-            else:
-                return textract.process(file_path).decode('utf-8')
-        
-        except Exception as e:
-            self.logger.error(f"Error extracting text: {e}")
-            return ""
+    @property
+    def sentence_nlp(self):
+        return self._nlp if self._nlp else get_nlp('sentences')
 
-    def _extract_pdf_text(self, file_path):
+    def _cache_key(self, path: Optional[str], data: Optional[bytes]) -> Optional[str]:
+        if not self.extraction_cache:
+            return None
+        return self.extraction_cache.key_for_file(path) if path else self.extraction_cache.key_for_bytes(data)
+
+    def extract_text(self, source: ResumeSource, name: Optional[str] = None, strict: bool = False) -> str:
         """
-        Extract text from PDF using multiple methods for reliability
+        Extract text from various file formats
+        
+        Args:
+            source: Path, bytes, memoryview or binary file object
+            name (str): Original file name, used as a hint when content sniffing is inconclusive
+            strict (bool): Raise ExtractionError instead of returning an empty string on failure
         """
-        text = ""
+        path, data = _load_source(source)
         
-        # Method 1: PyPDF2
-        try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = " ".join(page.extract_text() for page in pdf_reader.pages)
-        except Exception as e1:
-            self.logger.warning(f"PyPDF2 extraction failed: {e1}")
-            
-            # Method 2: pdfplumber
-            try:
-                with pdfplumber.open(file_path) as pdf:
-                    text = " ".join(page.extract_text() for page in pdf.pages if page.extract_text())
-            except Exception as e2:
-                self.logger.error(f"PDF text extraction failed: {e2}")
+        cache_key = self._cache_key(path, data)
+        if cache_key:
+            entry = self.extraction_cache.get(cache_key)
+            if entry:
+                return entry['text']
         
-        return self._clean_text(text)
+        return self._extract_text(path, data, name, strict)
 
-    def _extract_docx_text(self, file_path):
-        """
-        Extract text from DOCX files
-        """
+    def _extract_text(self, path: Optional[str], data: Optional[bytes], name: Optional[str] = None,
+                      strict: bool = False) -> str:
         try:
-            doc = docx.Document(file_path)
-            text = " ".join([paragraph.text for paragraph in doc.paragraphs])
-            return self._clean_text(text)
+            file_type = detect_file_type(path, data, name)
+            metrics = get_metrics()
+            metrics.inc('input_bytes', len(data) if data is not None else os.path.getsize(path), format=file_type)
+            with metrics.stage('extract_text', format=file_type):
+                result = self.extractors.extract(path, data, name, file_type)
+            self.logger.debug(f"Extracted {file_type} text with {result.extractor}, timings {result.timings}")
+            text = self._clean_text(result.text)
+        
         except Exception as e:
-            self.logger.error(f"DOCX extraction error: {e}")
+            if strict:
+                if isinstance(e, ExtractionError):
+                    raise
+                raise ExtractionError(f"{type(e).__name__}: {e}") from e
+            self.logger.error(f"Error extracting text: {e}")
             return ""
+        
+        if strict and not text:
+            raise ExtractionError("No text could be extracted")
+        return text
 
     def _clean_text(self, text):
         """
         Clean and normalize extracted text
         """
         # Remove extra whitespaces
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = WHITESPACE_PATTERN.sub(' ', text).strip()
         
-        # Optional: Remove non-printable characters
-        text = ''.join(char for char in text if char.isprintable())
+        # Optional: Remove non-printable characters. The per-character filter
+        # only runs when there is something to remove.
+        if not text.isprintable():
+            text = ''.join(char for char in text if char.isprintable())
         
         return text
 
+    @timed('extract_contact_info')
     def extract_contact_info(self, text: str) -> Dict[str, str]:
         """Extract contact information from text"""
         contact_info = {}
         
         # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            contact_info['email'] = emails[0]
+        email = EMAIL_PATTERN.search(text)
+        if email:
+            contact_info['email'] = email.group()
         
         # Extract phone number
-        phone_pattern = r'\b(\+\d{1,2}\s?)?(\d{3}[-.]?)?\s?\d{3}[-.]?\d{4}\b'
-        phones = re.findall(phone_pattern, text)
-        if phones:
-            contact_info['phone'] = phones[0][0] + phones[0][1] + phones[0][2]
+        phone = PHONE_PATTERN.search(text)
+        if phone:
+            contact_info['phone'] = phone.group().strip()
         
         return contact_info
 
+    @timed('extract_skills')
     def extract_skills(self, text: str) -> List[str]:
-        """Extract skills from resume text"""
-        text_lower = text.lower()
-        return [skill for skill in self.skill_patterns if skill.lower() in text_lower]
+        """Extract canonical skill names from resume text"""
+        return self.skill_matcher.skill_names(text)
 
+    @timed('extract_education')
     def extract_education(self, text: str) -> List[Dict[str, str]]:
         """Extract education information"""
-        doc = self.nlp(text)
+        return self.education_from_doc(self.doc_cache.get_doc(self.sentence_nlp, text))
+
+    @timed('extract_education_batch')
+    def extract_education_batch(self, texts: List[str], batch_size: int = 32,
+                                n_process: int = 1) -> List[List[Dict[str, str]]]:
+        """
+        Extract education information from many texts with one ``nlp.pipe`` run
+        
+        Args:
+            texts: Resume texts
+            batch_size (int): Texts per ``nlp.pipe`` batch
+            n_process (int): Worker processes for ``nlp.pipe``, worth it for thousands of texts
+        
+        Returns:
+            Education entries per text, in input order
+        """
+        docs = pipe_unique(self.sentence_nlp, texts, batch_size, n_process)
+        return [self.education_from_doc(doc) for doc in docs]
+
+    def education_from_doc(self, doc) -> List[Dict[str, str]]:
+        """Extract education information from already parsed text"""
         education = []
         
         # Common education keywords
@@ -125,40 +194,167 @@ class ResumeParser:
         
         return education
 
-    def parse_resume(self, file_path: str) -> Dict[str, Any]:
+    @timed('parse_resume', profile=True)
+    def parse_resume(self, source: ResumeSource, name: Optional[str] = None) -> Dict[str, Any]:
         """
         Main method to parse resume and extract all information
+        
+        Args:
+            source: Path, bytes, memoryview or binary file object
+            name (str): Original file name, reported as ``file_path`` for in-memory sources
         """
-        # Extract text
-        text = self.extract_text(file_path)
+        path, data = _load_source(source)
+        file_path = path or name
         
-        # Extract skills
-        skills = self.extract_skills(text)
+        # Reuse earlier work on a file with identical content
+        cache_key = self._cache_key(path, data)
+        entry = self.extraction_cache.get(cache_key) if cache_key else None
+        if entry and entry.get('skills_fingerprint') == self.skill_matcher.fingerprint:
+            return {**entry['result'], 'file_path': file_path}
         
-        # Extract contact info
-        contact_info = self.extract_contact_info(text)
+        # Extract text, unless only the skill taxonomy changed since it was cached
+        text = entry['text'] if entry else self._extract_text(path, data, name)
+        result = self.parse_text(text, file_path)
         
-        # Extract education
-        education = self.extract_education(text)
+        # Failed extractions are not cached so they get retried next time
+        if cache_key and text:
+            self.extraction_cache.put(cache_key, {
+                'text': text,
+                'result': result,
+                'skills_fingerprint': self.skill_matcher.fingerprint
+            })
         
+        return result
+
+    def parse_text(self, text: str, file_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Extract all information from already extracted resume text
+        
+        Returns:
+            The same fields as ``parse_resume``
+        """
         return {
             'raw_text': text,
-            'skills': skills,
-            'contact_info': contact_info,
+            'skills': self.extract_skills(text),
+            'contact_info': self.extract_contact_info(text),
             'file_path': file_path,
+            'education': self.extract_education(text)
+        }
+
+    def iter_text_chunks(self, source: ResumeSource, chunk_chars: int = 20000,
+                         name: Optional[str] = None) -> Iterator[str]:
+        """
+        Yield the raw text of a document piece by piece
+
+        PDFs are yielded page by page, DOCX files as groups of paragraphs of
+        about ``chunk_chars`` characters, and other formats in slices of that size.
+        """
+        path, data = _load_source(source)
+        
+        try:
+            file_type = detect_file_type(path, data, name)
+            if file_type == 'pdf':
+                yield from self.pdf_extractor.iter_pages(path if data is None else data)
+                return
+            
+            if file_type == 'docx':
+                import docx
+                doc = docx.Document(path if data is None else io.BytesIO(data))
+                pieces = (paragraph.text for paragraph in doc.paragraphs)
+            else:
+                text = self.extractors.extract(path, data, name, file_type).text
+                pieces = _split_at_whitespace(text, chunk_chars)
+            
+            buffer, size = [], 0
+            for piece in pieces:
+                buffer.append(piece)
+                size += len(piece) + 1
+                if size >= chunk_chars:
+                    yield " ".join(buffer)
+                    buffer, size = [], 0
+            if buffer:
+                yield " ".join(buffer)
+        
+        except Exception as e:
+            self.logger.error(f"Error extracting text: {e}")
+
+    def parse_resume_stream(self, source: ResumeSource, contact_only: bool = False,
+                            keep_text: bool = False, chunk_chars: int = 20000,
+                            name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Parse a resume chunk by chunk so memory use is bounded by the chunk size
+
+        Args:
+            source: Path, bytes, memoryview or binary file object
+            contact_only (bool): Only look for contact info, and stop reading the
+                document as soon as both an email and a phone number are found
+            keep_text (bool): Also return the full cleaned text as ``raw_text``
+            chunk_chars (int): Approximate chunk size for non-PDF documents
+            name (str): Original file name for in-memory sources
+
+        Returns:
+            Dict shaped like ``parse_resume`` output. ``raw_text`` is None unless
+            ``keep_text`` is set.
+        """
+        skills = {}
+        contact_info = {}
+        education = []
+        text_parts = []
+        tail = ""
+        
+        for chunk in self.iter_text_chunks(source, chunk_chars, name):
+            chunk = self._clean_text(chunk)
+            if not chunk:
+                continue
+            
+            # Include the end of the previous chunk so matches that straddle
+            # the boundary are not lost
+            window = f"{tail} {chunk}" if tail else chunk
+            
+            for key, value in self.extract_contact_info(window).items():
+                contact_info.setdefault(key, value)
+            
+            if contact_only:
+                if 'email' in contact_info and 'phone' in contact_info:
+                    break
+            else:
+                skills.update(dict.fromkeys(self.extract_skills(window)))
+                # Parsed without the document cache, which would keep every chunk alive.
+                # The overlap can repeat a sentence, or part of one, found in the previous window.
+                for entry in self.education_from_doc(self.sentence_nlp(window)):
+                    description = entry['description']
+                    if any(description in found['description'] for found in education):
+                        continue
+                    education = [found for found in education if found['description'] not in description]
+                    education.append(entry)
+            
+            if keep_text:
+                text_parts.append(chunk)
+            tail = chunk[-CHUNK_OVERLAP:]
+            if len(chunk) > CHUNK_OVERLAP and not chunk[-CHUNK_OVERLAP - 1].isspace():
+                # Start on a word boundary, or "NoSQL" would leave "SQL" to be matched as a skill
+                space = tail.find(' ')
+                tail = tail[space + 1:] if space >= 0 else ""
+        
+        return {
+            'raw_text': " ".join(text_parts) if keep_text else None,
+            'skills': list(skills),
+            'contact_info': contact_info,
+            'file_path': source if isinstance(source, (str, os.PathLike)) else name,
             'education': education
         }
 
-def parse_resume(file_path: str) -> Dict[str, Any]:
+def parse_resume(file_path: ResumeSource, name: Optional[str] = None) -> Dict[str, Any]:
     """
     Main function to parse resume
     
     Args:
-        file_path (str): Path to the resume file
+        file_path: Path to the resume file, or its content as bytes or a file object
+        name (str): Original file name for in-memory content
     
     Returns:
         Dict containing parsed resume information
     """
     parser = ResumeParser()
     
-    return parser.parse_resume(file_path)
+    return parser.parse_resume(file_path, name)
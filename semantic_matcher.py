@@ -0,0 +1,406 @@
+import os
+import re
+import json
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from extraction_cache import CACHE_DIR_ENV
+from ranking import Ranking, top_k_rows
+
+DEFAULT_EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+
+# Environment variable pointing at the embedding cache database used by default,
+# set to an empty value to disable the embedding cache, re-encoding texts on every call
+EMBEDDING_CACHE_ENV = 'EMBEDDING_CACHE_PATH'
+
+EMBEDDING_CACHE_NAME = 'embeddings.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    vector BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+# SQLite limits the number of bound parameters per statement
+_LOOKUP_BATCH = 500
+
+# Resume passages compared against each requirement: lines and sentences
+_PASSAGE_SPLIT = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+class TextEncoder:
+    """
+    Sentence embeddings from a Hugging Face transformers model, on CPU
+
+    Texts are encoded in batches sorted by length so each batch pads as
+    little as possible. Token embeddings are mean-pooled over the attention
+    mask and L2-normalized, so a dot product is a cosine similarity.
+    transformers and torch are only imported when the first text is encoded.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, batch_size: int = 32, max_length: int = 256):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.logger = logging.getLogger(__name__)
+        self._tokenizer = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model_id(self) -> str:
+        """Identifies everything that affects the vectors, for cache keys"""
+        return f'{self.model_name}:{self.max_length}'
+
+    def _load(self):
+        with self._lock:
+            if self._model is None:
+                from transformers import AutoModel, AutoTokenizer
+
+                self.logger.info(f"Loading embedding model {self.model_name}")
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                model = AutoModel.from_pretrained(self.model_name)
+                model.eval()
+                self._model = model
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts
+
+        Returns:
+            float32 array of shape (len(texts), dim) with unit-length rows
+        """
+        if self._model is None:
+            self._load()
+        import torch
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+
+        with torch.inference_mode():
+            for start in range(0, len(order), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                inputs = self._tokenizer([texts[i] for i in batch], padding=True, truncation=True,
+                                         max_length=self.max_length, return_tensors='pt')
+                tokens = self._model(**inputs).last_hidden_state
+                mask = inputs['attention_mask'].unsqueeze(-1).to(tokens.dtype)
+                pooled = (tokens * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                pooled = torch.nn.functional.normalize(pooled, dim=1)
+                for i, vector in zip(batch, pooled.numpy().astype(np.float32)):
+                    vectors[i] = vector
+
+        if not vectors:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack(vectors)
+
+
+class EmbeddingCache:
+    """
+    SQLite store of embeddings keyed by a hash of the model and the text
+
+    Identical texts are embedded once no matter where they come from, and a
+    different model or setting never reuses another's vectors.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def key(model_id: str, text: str) -> str:
+        digest = hashlib.sha256(model_id.encode('utf-8') + b'\0')
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Return the cached vectors among ``keys``"""
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_BATCH):
+                batch = keys[start:start + _LOOKUP_BATCH]
+                rows = self.conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                ((key, np.ascontiguousarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items())
+            )
+
+
+class VectorIndex:
+    """
+    Exact nearest-neighbor search over unit-length vectors by brute force
+
+    Scores are dot products computed in row chunks of at most
+    ``max_chunk_bytes``, keeping a running top-k per query. With
+    ``quantize=True`` vectors are stored as int8 with a per-row scale, a
+    quarter of the float32 memory, at the cost of slightly approximate scores.
+    """
+
+    def __init__(self, vectors: np.ndarray, quantize: bool = False, max_chunk_bytes: int = 64 * 1024 * 1024):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.quantize = quantize
+        self.max_chunk_bytes = max_chunk_bytes
+        if quantize:
+            scales = np.abs(vectors).max(axis=1) / 127.0 if len(vectors) else np.empty(0, dtype=np.float32)
+            scales[scales == 0] = 1.0
+            self.vectors = np.round(vectors / scales[:, None]).astype(np.int8)
+            self.scales = scales.astype(np.float32)
+        else:
+            self.vectors = vectors
+            self.scales = None
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    @property
+    def nbytes(self) -> int:
+        return self.vectors.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def search(self, queries: np.ndarray, k: int = 10) -> List[Ranking]:
+        """
+        Find the k most similar stored vectors for each query
+
+        Returns:
+            One best-first list of (index, score) pairs per query
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        n_queries, n_vectors = len(queries), len(self.vectors)
+        k = min(k, n_vectors)
+        if not n_queries or not k:
+            return [[] for _ in range(n_queries)]
+
+        chunk_rows = max(1, self.max_chunk_bytes // max(1, n_queries * 4 + self.vectors.shape[1] * 4))
+        best_idx = np.empty((n_queries, 0), dtype=np.int64)
+        best_scores = np.empty((n_queries, 0), dtype=np.float32)
+
+        for start in range(0, n_vectors, chunk_rows):
+            chunk = self.vectors[start:start + chunk_rows]
+            if self.quantize:
+                scores = (chunk.astype(np.float32) @ queries.T) * self.scales[start:start + chunk_rows, None]
+            else:
+                scores = chunk @ queries.T
+
+            idx, top_scores = top_k_rows(scores.T, k)
+            candidate_idx = np.hstack([best_idx, idx + start])
+            candidate_scores = np.hstack([best_scores, top_scores])
+            keep, best_scores = top_k_rows(candidate_scores, k)
+            best_idx = np.take_along_axis(candidate_idx, keep, axis=1)
+
+        return [
+            [(int(i), float(s)) for i, s in zip(row_idx, row_scores)]
+            for row_idx, row_scores in zip(best_idx, best_scores)
+        ]
+
+
+class SemanticMatcher:
+    """
+    Embedding-based matching of resumes, job descriptions and requirements
+
+    Complements the lexical TF-IDF score and skill lists: "k8s" and
+    "container orchestration" end up close together even though they share
+    no words. Every text is embedded once and kept in the embedding cache,
+    ``cache`` or else the shared one at ``cache_path`` or the default location.
+    """
+
+    def __init__(self, encoder: Optional[TextEncoder] = None, cache: Optional[EmbeddingCache] = None,
+                 requirement_threshold: float = 0.5, cache_path: Optional[str] = None):
+        self.encoder = encoder if encoder else TextEncoder()
+        self.cache = cache if cache is not None else get_default_embedding_cache(cache_path)
+        self.requirement_threshold = requirement_threshold
+        self.logger = logging.getLogger(__name__)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts, encoding only those not embedded before
+
+        Returns:
+            float32 array with one unit-length row per text
+        """
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        model_id = self.encoder.model_id
+        keys = [EmbeddingCache.key(model_id, text) for text in texts]
+        found = self.cache.get_many(keys) if self.cache else {}
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            encoded = dict(zip(missing, self.encoder.encode(list(missing.values()))))
+            if self.cache:
+                self.cache.put_many(encoded)
+            found.update(encoded)
+
+        return np.stack([found[key] for key in keys])
+
+    def similarity(self, resume_text: str, job_description: str) -> float:
+        """Cosine similarity between the embeddings of a resume and a job description"""
+        resume, job = self.embed([resume_text, job_description])
+        return float(resume @ job)
+
+    def requirement_coverage(self, resume_text: str, requirements: Sequence[str]) -> Dict[str, float]:
+        """
+        Score how well the resume covers each requirement sentence
+
+        Each requirement is compared with every line and sentence of the
+        resume and keeps its best match.
+
+        Returns:
+            Best cosine similarity per requirement
+        """
+        passages = [passage.strip() for passage in _PASSAGE_SPLIT.split(resume_text) if passage.strip()]
+        if not passages or not requirements:
+            return {requirement: 0.0 for requirement in requirements}
+
+        index = VectorIndex(self.embed(passages))
+        best = index.search(self.embed(requirements), k=1)
+        return {requirement: hits[0][1] for requirement, hits in zip(requirements, best)}
+
+    def match_resume_to_job(self, resume_data: dict, job_description_data: dict) -> dict:
+        """
+        Semantic counterpart of ``matching.match_resume_to_job``
+
+        Returns:
+            dict with the overall semantic score, requirement coverage and the
+            requirements no part of the resume is close to
+        """
+        resume_text = resume_data.get('raw_text', '')
+        requirements = job_description_data.get('requirements', {})
+        required = requirements.get('required_skills', []) + requirements.get('preferred_skills', [])
+
+        coverage = self.requirement_coverage(resume_text, required)
+        met = [req for req, score in coverage.items() if score >= self.requirement_threshold]
+
+        return {
+            'semantic_score': self.similarity(resume_text, job_description_data.get('raw_text', '')),
+            'requirement_coverage': coverage,
+            'met_requirements': met,
+            'missing_requirements': [req for req in coverage if req not in met],
+        }
+
+    def rank(self, resume_texts: Sequence[str], job_texts: Sequence[str], k: int = 10,
+             quantize: bool = False) -> List[Ranking]:
+        """Top-k resumes for each job by embedding similarity"""
+        index = VectorIndex(self.embed(resume_texts), quantize=quantize)
+        return index.search(self.embed(job_texts), k)
+
+
+_default_caches: Dict[str, EmbeddingCache] = {}
+_default_caches_lock = threading.Lock()
+
+
+def default_embedding_cache_path() -> Optional[str]:
+    """
+    Where embeddings are cached by default
+
+    ``$EMBEDDING_CACHE_PATH`` if set, otherwise next to the extraction cache
+    in ``$EXTRACTION_CACHE_DIR``, otherwise in the user's cache directory.
+    None if ``$EMBEDDING_CACHE_PATH`` is set but empty, which disables the cache.
+    """
+    path = os.environ.get(EMBEDDING_CACHE_ENV)
+    if path is not None:
+        return path or None
+    directory = os.environ.get(CACHE_DIR_ENV)
+    if not directory:
+        cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        directory = os.path.join(cache_home, 'resume-analyzer')
+    return os.path.join(directory, EMBEDDING_CACHE_NAME)
+
+
+def get_default_embedding_cache(path: Optional[str] = None) -> Optional[EmbeddingCache]:
+    """
+    Get the process-wide cache in a database, ``default_embedding_cache_path()`` by default
+
+    Returns:
+        EmbeddingCache for that database, or None when caching is turned off
+        or the database can't be opened
+    """
+    path = path or default_embedding_cache_path()
+    if not path:
+        return None
+
+    with _default_caches_lock:
+        if path not in _default_caches:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                _default_caches[path] = EmbeddingCache(path)
+            except (OSError, sqlite3.Error) as e:
+                logging.getLogger(__name__).warning(f"Embeddings won't be cached, can't open {path}: {e}")
+                return None
+        return _default_caches[path]
+
+
+def _read_texts(paths: Sequence[str], field: str) -> Tuple[List[str], List[str]]:
+    """Read texts and their labels from text files or JSONL records"""
+    texts, labels = [], []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as file:
+            if not path.endswith('.jsonl'):
+                texts.append(file.read())
+                labels.append(path)
+                continue
+            for line_number, line in enumerate(file, start=1):
+                if line.strip():
+                    record = json.loads(line)
+                    texts.append(record.get(field) or '')
+                    labels.append(record.get('file_path') or f'{path}:{line_number}')
+    return texts, labels
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank resumes against job descriptions by embedding similarity")
+    parser.add_argument('--resumes', nargs='+', required=True,
+                        help="Resume text files or batch_parser.py JSONL output")
+    parser.add_argument('--jobs', nargs='+', required=True, help="Job description text files")
+    parser.add_argument('-k', type=int, default=10, help="Resumes listed per job")
+    parser.add_argument('--model', default=DEFAULT_EMBEDDING_MODEL, help="Hugging Face model name or path")
+    parser.add_argument('--batch-size', type=int, default=32, help="Texts per encoder batch")
+    parser.add_argument('--cache', help=f"Embedding cache database (defaults to ${EMBEDDING_CACHE_ENV}, "
+                                        f"then {EMBEDDING_CACHE_NAME} in ${CACHE_DIR_ENV} or ~/.cache/resume-analyzer)")
+    parser.add_argument('--quantize', action='store_true', help="Search int8-quantized resume vectors")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    resume_texts, resume_labels = _read_texts(args.resumes, 'raw_text')
+    job_texts, job_labels = _read_texts(args.jobs, 'raw_text')
+
+    matcher = SemanticMatcher(TextEncoder(args.model, batch_size=args.batch_size), cache_path=args.cache)
+    rankings = matcher.rank(resume_texts, job_texts, args.k, quantize=args.quantize)
+
+    for job_label, ranking in zip(job_labels, rankings):
+        print(job_label)
+        for index, score in ranking:
+            print(f"  {score:.3f}  {resume_labels[index]}")
+
+
+if __name__ == "__main__":
+    main()
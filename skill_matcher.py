@@ -0,0 +1,155 @@
+import os
+import re
+import hashlib
+import logging
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+DEFAULT_TAXONOMY_PATH = os.environ.get(
+    'SKILL_TAXONOMY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skill_taxonomy.tsv')
+)
+
+# A token is a run of letters/digits that may contain "+", "#" or inner dots,
+# so "c++", "c#" and "node.js" stay whole while sentence-ending dots are dropped
+TOKEN_PATTERN = re.compile(r'[a-z0-9](?:[a-z0-9+#]|\.(?=[a-z0-9]))*')
+
+# Trie key marking the end of a complete skill phrase
+_TERMINAL = ''
+
+
+class SkillMatch(NamedTuple):
+    skill_id: str
+    name: str
+    start: int
+    end: int
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """Split lowercased text into (token, start, end) triples"""
+    return [(m.group(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text.lower())]
+
+
+class SkillMatcher:
+    """
+    Single-pass skill matcher backed by a token trie
+
+    Every name and alias in the taxonomy is tokenized once into a trie. A scan
+    walks the text's tokens and takes the longest phrase starting at each
+    position, so its cost depends on the length of the text and of the longest
+    phrase, not on the number of skills.
+    """
+
+    def __init__(self, skills: Iterable[Tuple[str, str, Iterable[str]]]):
+        self.logger = logging.getLogger(__name__)
+        self.names: Dict[str, str] = {}
+        self._trie: Dict = {}
+        digest = hashlib.sha256()
+
+        for skill_id, name, aliases in skills:
+            self.names[skill_id] = name
+            for phrase in (name, *aliases):
+                self._add_phrase(phrase, skill_id)
+                digest.update(f'{skill_id}\t{phrase}\n'.encode('utf-8'))
+
+        # Identifies the taxonomy, so cached results can tell when it changed
+        self.fingerprint = digest.hexdigest()[:16]
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SkillMatcher':
+        """
+        Load a taxonomy file
+
+        Each non-comment line holds a skill ID, its canonical name and an optional
+        ``|``-separated list of aliases, separated by tabs.
+        """
+        skills = []
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                line = line.rstrip('\n')
+                if not line.strip() or line.startswith('#'):
+                    continue
+                fields = line.split('\t')
+                skill_id, name = fields[0].strip(), fields[1].strip()
+                aliases = [alias.strip() for alias in fields[2].split('|')] if len(fields) > 2 else []
+                skills.append((skill_id, name, [alias for alias in aliases if alias]))
+        return cls(skills)
+
+    def _add_phrase(self, phrase: str, skill_id: str):
+        tokens = [token for token, _, _ in tokenize(phrase)]
+        if not tokens:
+            return
+
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+
+        existing = node.get(_TERMINAL)
+        if existing and existing != skill_id:
+            self.logger.debug(f"Phrase '{phrase}' already maps to {existing}, ignoring it for {skill_id}")
+            return
+        node[_TERMINAL] = skill_id
+
+    def find(self, text: str) -> List[SkillMatch]:
+        """
+        Find all skill mentions in text
+
+        Returns:
+            Non-overlapping leftmost-longest matches with their character spans
+        """
+        tokens = tokenize(text)
+        matches = []
+        i = 0
+
+        while i < len(tokens):
+            node = self._trie
+            best: Optional[Tuple[str, int]] = None
+            j = i
+            while j < len(tokens):
+                node = node.get(tokens[j][0])
+                if node is None:
+                    break
+                j += 1
+                if _TERMINAL in node:
+                    best = (node[_TERMINAL], j)
+
+            if best:
+                skill_id, end = best
+                matches.append(SkillMatch(skill_id, self.names[skill_id], tokens[i][1], tokens[end - 1][2]))
+                i = end
+            else:
+                i += 1
+
+        return matches
+
+    def skill_ids(self, text: str) -> List[str]:
+        """Distinct skill IDs mentioned in text, in order of first mention"""
+        return list(dict.fromkeys(match.skill_id for match in self.find(text)))
+
+    def skill_names(self, text: str) -> List[str]:
+        """Distinct canonical skill names mentioned in text, in order of first mention"""
+        return [self.names[skill_id] for skill_id in self.skill_ids(text)]
+
+
+_matchers: Dict[str, SkillMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_skill_matcher(path: str = DEFAULT_TAXONOMY_PATH) -> SkillMatcher:
+    """
+    Get the shared matcher for a taxonomy file, compiling it on first use
+
+    Args:
+        path (str): Taxonomy file, defaults to ``$SKILL_TAXONOMY_PATH`` or the bundled one
+
+    Returns:
+        Compiled SkillMatcher shared by every caller in the process
+    """
+    matcher = _matchers.get(path)
+    if matcher is None:
+        with _matchers_lock:
+            matcher = _matchers.get(path)
+            if matcher is None:
+                matcher = SkillMatcher.from_file(path)
+                _matchers[path] = matcher
+    return matcher
@@ -0,0 +1,75 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+
+import analysis_service
+from analysis_service import AnalysisService, _extract_in_worker
+from doc_cache import DocCache
+from extractors import ExtractionError, ExtractorRegistry
+from resume_parser import ResumeParser
+
+
+def slow_extractor(source):
+    time.sleep(60)
+
+
+@pytest.fixture
+def slow_parser(monkeypatch):
+    """The worker parser with a text extractor that never finishes"""
+    registry = ExtractorRegistry()
+    registry.register('txt', 'slow', slow_extractor)
+    parser = ResumeParser(doc_cache=DocCache(), extraction_cache=False, extractors=registry)
+    monkeypatch.setattr(analysis_service, '_worker_parser', parser)
+    return parser
+
+
+@pytest.fixture(scope='module')
+def service():
+    return AnalysisService(workers=1)
+
+
+@pytest.mark.parametrize('body', [b'[1, 2]', b'"text"', b'null'])
+def test_non_object_json_is_rejected(service, body):
+    status, payload = asyncio.run(service._handle_request_inner('POST', '/analyze-job', body))
+    assert status == HTTPStatus.BAD_REQUEST
+    assert 'JSON object' in payload['error']
+
+
+def test_invalid_json_is_rejected(service):
+    status, _ = asyncio.run(service._handle_request_inner('POST', '/match', b'{'))
+    assert status == HTTPStatus.BAD_REQUEST
+
+
+def test_extraction_stops_at_the_deadline(slow_parser):
+    started = time.time()
+    with pytest.raises(TimeoutError):
+        _extract_in_worker(b'Jane Doe, Python developer', 'resume.txt', time.time() + 0.2)
+    assert time.time() - started < 5
+
+    with pytest.raises(TimeoutError):
+        _extract_in_worker(b'Jane Doe, Python developer', 'resume.txt', time.time() - 1)
+
+
+def test_failed_extraction_is_an_error(slow_parser):
+    slow_parser.extractors.unregister('txt', 'slow')
+    with pytest.raises(ExtractionError):
+        _extract_in_worker(b'Jane Doe, Python developer', 'resume.txt', time.time() + 5)
+
+
+@pytest.mark.parametrize('error, status', [
+    (TimeoutError("extraction passed the request deadline"), HTTPStatus.GATEWAY_TIMEOUT),
+    (ExtractionError("No text could be extracted"), HTTPStatus.UNPROCESSABLE_ENTITY),
+])
+def test_parse_errors_map_to_statuses(service, monkeypatch, error, status):
+    def failing_extract(data, filename, deadline=None):
+        raise error
+
+    monkeypatch.setattr(analysis_service, '_extract_in_worker', failing_extract)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        monkeypatch.setattr(service, 'extraction_pool', pool)
+        status_code, payload = asyncio.run(service._handle_request_inner('POST', '/parse?filename=cv.txt', b'data'))
+    assert status_code == status
+    assert 'error' in payload
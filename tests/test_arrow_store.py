@@ -0,0 +1,60 @@
+import pytest
+
+from arrow_store import MATCH_SCHEMA, RESUME_SCHEMA, ResultWriter, iter_resumes, open_results, resume_row
+
+RESULTS = [
+    {
+        'raw_text': f'Resume {i} text',
+        'skills': ['Python', 'SQL'][:i % 3],
+        'contact_info': {'email': f'person{i}@example.com', 'phone': '555-123-4567'} if i % 2 else {},
+        'file_path': f'resumes/{i}.pdf',
+        'education': [{'description': 'Master of Science in Physics'}] if i % 4 == 0 else [],
+    }
+    for i in range(7)
+]
+ERROR = {'file_path': 'resumes/broken.pdf', 'error': 'No text could be extracted'}
+
+
+@pytest.fixture(params=['resumes.parquet', 'resumes.arrow'])
+def path(request, tmp_path):
+    return str(tmp_path / request.param)
+
+
+def test_resumes_round_trip_across_batches(path):
+    results = RESULTS[:3] + [ERROR] + RESULTS[3:]
+    with ResultWriter(path, RESUME_SCHEMA, batch_size=3) as writer:
+        writer.write_many(resume_row(result) for result in results)
+        # Only full batches are written before closing
+        assert writer.rows_written == 6
+    assert writer.rows_written == len(results)
+
+    table = open_results(path)
+    assert table.schema == RESUME_SCHEMA
+    assert table.num_rows == len(results)
+    assert list(iter_resumes(table, batch_size=2)) == results
+
+
+def test_column_selection(path):
+    with ResultWriter(path, RESUME_SCHEMA, batch_size=2) as writer:
+        writer.write_many(resume_row(result) for result in RESULTS)
+
+    table = open_results(path, columns=['file_path', 'skills'])
+    assert table.column_names == ['file_path', 'skills']
+    assert table.column('skills').to_pylist() == [result['skills'] for result in RESULTS]
+
+
+def test_match_rows(path):
+    rows = [
+        {'file_path': 'resumes/0.pdf', 'job_id': 'job-1', 'title': 'Data Engineer', 'match_score': 72.5,
+         'total_job_skills': 4, 'matched_skills': ['python', 'sql'], 'missing_skills': ['spark', 'airflow']},
+        {'file_path': 'resumes/1.pdf', 'job_id': 'job-1', 'title': None, 'match_score': 0.0,
+         'total_job_skills': 0, 'matched_skills': [], 'missing_skills': []},
+    ]
+    with ResultWriter(path, MATCH_SCHEMA) as writer:
+        writer.write_many(rows)
+    assert open_results(path).to_pylist() == rows
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        ResultWriter(str(tmp_path / 'results.csv'), RESUME_SCHEMA, 'csv')
@@ -0,0 +1,52 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import batch_parser
+from batch_parser import BatchResumeParser, collect_resume_paths
+
+
+def test_collect_resume_paths(tmp_path):
+    resumes = tmp_path / 'resumes'
+    resumes.mkdir()
+    for name in ('b.pdf', 'a.docx', 'notes.csv'):
+        (resumes / name).write_text('x')
+    manifest = tmp_path / 'manifest.txt'
+    manifest.write_text(f"# resumes\n{resumes / 'a.docx'}\nother.rtf\n")
+
+    paths = collect_resume_paths([str(resumes)], str(manifest))
+    assert paths == [str(resumes / 'a.docx'), str(resumes / 'b.pdf'), 'other.rtf']
+
+
+@pytest.mark.parametrize('order', ['input', 'completion'])
+def test_slow_file_does_not_let_results_pile_up(monkeypatch, order):
+    batch = BatchResumeParser(workers=2, order=order, max_pending=3, progress_every=0)
+    consumed = [0]
+    outstanding = []
+
+    class Executor(ThreadPoolExecutor):
+        def __init__(self, max_workers, initializer, initargs):
+            super().__init__(max_workers)
+
+        def submit(self, fn, *args):
+            outstanding.append(batch.stats.submitted + 1 - consumed[0])
+            return super().submit(fn, *args)
+
+    def parse(index, path):
+        time.sleep(0.3 if index == 0 else 0.01)
+        return index, {'file_path': path}
+
+    monkeypatch.setattr(batch_parser, 'ProcessPoolExecutor', Executor)
+    monkeypatch.setattr(batch_parser, '_parse_worker', parse)
+
+    paths = [f'resume{i}.txt' for i in range(20)]
+    results = []
+    for result in batch.run(paths):
+        results.append(result['file_path'])
+        consumed[0] += 1
+
+    assert max(outstanding) <= 3
+    assert sorted(results) == sorted(paths)
+    if order == 'input':
+        assert results == paths
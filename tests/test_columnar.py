@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from columnar import JobTable, ResumeTable, SkillMatrix, SkillVocabulary, match_pairs, match_tables, top_jobs
+
+
+def tables(n_resumes=40, n_jobs=15, n_skills=30, seed=0):
+    rng = np.random.default_rng(seed)
+    names = [f'skill{i}' for i in range(n_skills)]
+    vocabulary = SkillVocabulary()
+    resumes = ResumeTable(vocabulary)
+    jobs = JobTable(vocabulary)
+    resume_skills = [set(map(str, rng.choice(names, rng.integers(0, 12), replace=False))) for _ in range(n_resumes)]
+    job_skills = [set(map(str, rng.choice(names, rng.integers(0, 6), replace=False))) for _ in range(n_jobs)]
+    for i, skills in enumerate(resume_skills):
+        resumes.append({'file_path': f'r{i}.pdf', 'skills': sorted(skills)})
+    for i, skills in enumerate(job_skills):
+        jobs.append_skills(skills, job_id=str(i))
+    return resumes, jobs, resume_skills, job_skills
+
+
+def expected_score(resume, job):
+    return len(resume & job) / len(job) * 100 if job else 0.0
+
+
+def test_skill_matrix_round_trips_ids():
+    matrix = SkillMatrix.from_ids([(0, 7, 8), (), (15,)], 16)
+    assert matrix.packed.shape == (3, 2)
+    assert matrix.counts.tolist() == [3, 0, 1]
+    assert matrix.row_ids(0).tolist() == [0, 7, 8]
+    assert matrix.widened(4).shape == (3, 4)
+
+
+def test_match_tables_matches_set_arithmetic():
+    resumes, jobs, resume_skills, job_skills = tables()
+    # A tiny chunk size exercises the chunked loop
+    result = match_tables(resumes, jobs, max_chunk_bytes=64)
+    for i, resume in enumerate(resume_skills):
+        for j, job in enumerate(job_skills):
+            assert result.overlap[i, j] == len(resume & job)
+            assert result.scores[i, j] == pytest.approx(expected_score(resume, job))
+
+
+def test_top_jobs_are_chunked_and_best_first():
+    resumes, jobs, resume_skills, job_skills = tables()
+    rankings = list(top_jobs(resumes, jobs, k=4, max_chunk_bytes=64))
+    assert len(rankings) == len(resume_skills)
+    for resume, ranking in zip(resume_skills, rankings):
+        scores = [score for _, score in ranking]
+        assert scores == sorted(scores, reverse=True)
+        assert scores == pytest.approx(sorted((expected_score(resume, job) for job in job_skills), reverse=True)[:4])
+        assert all(score == pytest.approx(expected_score(resume, job_skills[job])) for job, score in ranking)
+
+
+def test_match_pairs_lists_matched_and_missing_skills():
+    vocabulary = SkillVocabulary()
+    resumes, jobs = ResumeTable(vocabulary), JobTable(vocabulary)
+    resumes.append({'skills': ['Python', 'SQL']})
+    jobs.append_skills(['python', 'docker'])
+    jobs.append_skills([])
+
+    first, second = match_pairs(resumes, jobs, [(0, 0), (0, 1)])
+    assert first == {'match_score': 50.0, 'total_job_skills': 2, 'matched_skills': ['python'],
+                     'recommended_improvements': ['docker']}
+    assert second['match_score'] == 0
+    assert resumes.to_dict(0)['skills'] == ['python', 'sql']
@@ -0,0 +1,130 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from dedup import DedupPipeline, LSHIndex, MinHasher, optimal_bands, similarity
+
+WORDS = ('python developer with experience building data pipelines in spark and airflow on aws '
+         'leading a team of engineers and mentoring juniors while shipping machine learning models '
+         'to production with docker kubernetes and terraform').split()
+
+
+def text(words=WORDS, replace=0):
+    words = list(words)
+    for i in range(replace):
+        words[i * 3] = f'changed{i}'
+    return ' '.join(words)
+
+
+def jaccard(hasher, a, b):
+    a, b = hasher.shingles(a), hasher.shingles(b)
+    return len(a & b) / len(a | b)
+
+
+def test_optimal_bands_fit_signature():
+    for threshold in (0.5, 0.8, 0.9):
+        bands, rows = optimal_bands(threshold, 128)
+        assert bands * rows <= 128
+    # Stricter thresholds need more rows per band
+    assert optimal_bands(0.9, 128)[1] > optimal_bands(0.5, 128)[1]
+
+
+def test_shingles():
+    hasher = MinHasher(shingle_size=2)
+    assert hasher.shingles('A b C') == {'a b', 'b c'}
+    assert hasher.shingles('one') == {'one'}
+    assert hasher.shingles('') == set()
+
+
+def test_signature_estimates_jaccard():
+    hasher = MinHasher(num_perm=256)
+    a, b = text(), text(replace=3)
+    signature = hasher.signature(a)
+    assert signature.dtype == np.uint64 and signature.shape == (256,)
+    assert np.array_equal(signature, MinHasher(num_perm=256).signature(a))
+    assert similarity(signature, hasher.signature(a)) == 1.0
+    assert similarity(signature, hasher.signature(b)) == pytest.approx(jaccard(hasher, a, b), abs=0.1)
+
+
+def test_signature_is_unbiased():
+    a, b = text(), text(replace=3)
+    estimates = [similarity(MinHasher(seed=seed).signature(a), MinHasher(seed=seed).signature(b))
+                 for seed in range(20)]
+    assert np.mean(estimates) == pytest.approx(jaccard(MinHasher(), a, b), abs=0.03)
+
+
+def test_lsh_finds_near_duplicates_only():
+    hasher = MinHasher()
+    index = LSHIndex(threshold=0.7)
+    index.add('original', hasher.signature(text()))
+    index.add('other', hasher.signature(' '.join(reversed(WORDS))))
+
+    matches = index.query(hasher.signature(text(replace=1)))
+    assert [key for key, _ in matches] == ['original']
+    assert matches[0][1] >= 0.7
+    assert index.query(hasher.signature(text(replace=10))) == []
+    assert len(index) == 2 and 'other' in index
+
+    with pytest.raises(KeyError):
+        index.add('original', hasher.signature(text()))
+    with pytest.raises(ValueError):
+        LSHIndex(threshold=0)
+
+
+class FakeParser:
+    def __init__(self, texts):
+        self.texts = texts
+        self.parsed = []
+
+    def extract_text(self, source, name=None):
+        return self.texts[source]
+
+    def _clean_text(self, text):
+        return text
+
+    def extract_contact_info(self, text):
+        return {'email': text.split()[-1]} if text else {}
+
+    def parse_text(self, text, file_path=None):
+        self.parsed.append(file_path)
+        return {'raw_text': text, 'skills': ['Python'], 'education': [], 'file_path': file_path,
+                'contact_info': self.extract_contact_info(text)}
+
+
+def test_pipeline_reuses_results_of_near_duplicates():
+    parser = FakeParser({
+        'a.pdf': text() + ' a@example.com',
+        'b.pdf': text() + ' b@example.com',
+        'c.pdf': ' '.join(reversed(WORDS)),
+        'empty1.pdf': '',
+        'empty2.pdf': '',
+    })
+    pipeline = DedupPipeline(parser, threshold=0.7)
+    results = {path: pipeline.parse_resume(path) for path in parser.texts}
+
+    assert parser.parsed == ['a.pdf', 'c.pdf', 'empty1.pdf', 'empty2.pdf']
+    assert results['b.pdf']['duplicate_of'] == 'a.pdf'
+    assert results['b.pdf']['contact_info'] == {'email': 'b@example.com'}
+    assert 'duplicate_of' not in results['empty2.pdf']
+    assert pipeline.clusters() == [{'original': 'a.pdf', 'duplicates': ['b.pdf']}]
+
+    calls = []
+
+    def compute(resume, job):
+        calls.append(resume['file_path'])
+        return {'match_score': 50}
+
+    for path in ('a.pdf', 'b.pdf', 'a.pdf'):
+        assert pipeline.match(results[path], 'job', {}, compute) == {'match_score': 50}
+    assert calls == ['a.pdf']
+
+
+def test_path_like_sources_keep_their_path():
+    parser = FakeParser({'a.pdf': text() + ' a@example.com', 'b.pdf': text() + ' b@example.com'})
+    parser.extract_text = lambda source, name=None: parser.texts[os.fspath(source)]
+    pipeline = DedupPipeline(parser, threshold=0.7)
+    assert pipeline.parse_resume(Path('a.pdf'))['dedup_key'] == 'a.pdf'
+    result = pipeline.parse_resume(Path('b.pdf'))
+    assert (result['file_path'], result['dedup_key'], result['duplicate_of']) == ('b.pdf', 'b.pdf', 'a.pdf')
@@ -0,0 +1,55 @@
+import spacy
+
+from doc_cache import DocCache, pipeline_key
+
+
+def test_docs_are_keyed_on_what_the_pipeline_computes():
+    cache = DocCache()
+    blank = spacy.blank('en')
+    sentences = spacy.blank('en')
+    sentences.add_pipe('sentencizer')
+
+    doc = cache.get_doc(blank, 'Python developer. Knows SQL.')
+    # Another pipeline with the same components shares the entry
+    assert cache.get_doc(spacy.blank('en'), 'Python developer. Knows SQL.') is doc
+    assert pipeline_key(sentences) != pipeline_key(blank)
+    assert cache.get_doc(sentences, 'Python developer. Knows SQL.') is not doc
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_namespaces_keep_values_for_the_same_text_apart():
+    cache = DocCache()
+    assert cache.get_or_compute('upper', 'python', str.upper) == 'PYTHON'
+    assert cache.get_or_compute('title', 'python', str.title) == 'Python'
+    assert cache.get_or_compute('upper', 'python', str.title) == 'PYTHON'
+
+
+def test_least_recently_used_entries_are_evicted_by_count():
+    cache = DocCache(max_entries=2)
+    calls = []
+
+    def compute(text):
+        calls.append(text)
+        return text
+
+    for text in ('a', 'b', 'a', 'c', 'a', 'b'):
+        cache.get_or_compute('ns', text, compute)
+    # "a" stays as the most recently used entry, "b" was evicted by "c"
+    assert calls == ['a', 'b', 'c', 'b']
+    assert len(cache) == 2
+
+
+def test_entries_are_evicted_by_total_length():
+    cache = DocCache(max_chars=10)
+    for text in ('aaaa', 'bbbb', 'cccc'):
+        cache.get_or_compute('ns', text, len)
+    assert len(cache) == 2
+    assert cache._chars == 8
+
+    # A text longer than the whole budget is never cached
+    cache.get_or_compute('ns', 'x' * 11, len)
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0 and cache._chars == 0
@@ -0,0 +1,89 @@
+import os
+import time
+
+from extraction_cache import ExtractionCache
+from resume_parser import PARSER_VERSION
+
+
+def entry_files(directory):
+    return sorted(name for _, _, files in os.walk(directory) for name in files)
+
+
+def test_hits_and_misses(tmp_path):
+    cache = ExtractionCache(str(tmp_path), PARSER_VERSION)
+    path = tmp_path / 'resume.txt'
+    path.write_bytes(b'Jane Doe, Python developer')
+    key = cache.key_for_file(str(path))
+    # Keyed by content, so a renamed copy or an upload of the same bytes hits
+    assert cache.key_for_bytes(b'Jane Doe, Python developer') == key
+    assert cache.key_for_bytes(b'John Doe, Java developer') != key
+
+    assert cache.get(key) is None
+    cache.put(key, {'text': 'Jane Doe, Python developer', 'skills': ['Python']})
+    assert cache.get(key) == {'text': 'Jane Doe, Python developer', 'skills': ['Python']}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_parser_version_invalidates_entries(tmp_path):
+    cache = ExtractionCache(str(tmp_path), PARSER_VERSION)
+    key = cache.key_for_bytes(b'resume')
+    cache.put(key, {'text': 'resume'})
+
+    newer = ExtractionCache(str(tmp_path), str(int(PARSER_VERSION) + 1))
+    newer_key = newer.key_for_bytes(b'resume')
+    assert newer_key != key
+    assert newer.get(newer_key) is None
+    assert ExtractionCache(str(tmp_path), PARSER_VERSION).get(key) == {'text': 'resume'}
+
+
+def test_writes_replace_entries_atomically(tmp_path, monkeypatch):
+    cache = ExtractionCache(str(tmp_path))
+    key = cache.key_for_bytes(b'resume')
+    cache.put(key, {'text': 'first'})
+    cache.put(key, {'text': 'second'})
+    assert cache.get(key) == {'text': 'second'}
+    assert entry_files(tmp_path) == [key + '.json']
+
+    def failing_replace(source, destination):
+        raise OSError('disk full')
+
+    # A failed write leaves the previous entry intact and no temporary file behind
+    monkeypatch.setattr(os, 'replace', failing_replace)
+    cache.put(key, {'text': 'third'})
+    assert cache.get(key) == {'text': 'second'}
+    assert entry_files(tmp_path) == [key + '.json']
+
+
+def test_corrupt_entries_are_misses(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    key = cache.key_for_bytes(b'resume')
+    cache.put(key, {'text': 'resume'})
+    with open(cache._path(key), 'w', encoding='utf-8') as file:
+        file.write('{"text": ')
+    assert cache.get(key) is None
+
+
+def test_least_recently_used_entries_are_evicted_by_size(tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_bytes=10 ** 6)
+    keys = [cache.key_for_bytes(bytes([i])) for i in range(4)]
+    now = time.time()
+    for age, key in enumerate(keys):
+        cache.put(key, {'text': 'x' * 1000})
+        os.utime(cache._path(key), (now - 100 * (4 - age), now - 100 * (4 - age)))
+    # Reading the oldest entry makes it the most recently used one
+    assert cache.get(keys[0])
+
+    size = os.path.getsize(cache._path(keys[0]))
+    cache.max_bytes = 2 * size
+    cache.evict()
+    assert [cache.get(key) is not None for key in keys] == [True, False, False, True]
+
+
+def test_writes_trigger_eviction(tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_bytes=20000)
+    for i in range(50):
+        cache.put(cache.key_for_bytes(bytes([i])), {'text': 'x' * 1000})
+    total = sum(os.path.getsize(os.path.join(root, name))
+                for root, _, files in os.walk(tmp_path) for name in files)
+    # Eviction runs once a twentieth of the budget has been written since the last scan
+    assert total <= 20000 + 20000 // 20 + 1100
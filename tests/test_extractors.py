@@ -0,0 +1,115 @@
+import io
+import zipfile
+
+import pytest
+
+import extractors
+from extractors import (DocumentSource, ExtractionError, ExtractorRegistry, decode_text, detect_file_type,
+                        extract_html, extract_odt, extract_rtf, rtf_to_text)
+
+ODF_CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+    xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">
+  <office:body><office:text>
+    <text:h>Jane Doe</text:h>
+    <text:p>Python<text:s text:c="3"/>SQL<text:tab/>Docker<text:line-break/>Master <text:span>degree</text:span></text:p>
+  </office:text></office:body>
+</office:document-content>"""
+
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def make_odt():
+    return make_zip({'mimetype': 'application/vnd.oasis.opendocument.text', 'content.xml': ODF_CONTENT})
+
+
+@pytest.fixture(autouse=True)
+def no_magic(monkeypatch):
+    # Keep detection independent of whether libmagic is installed
+    monkeypatch.setattr(extractors, '_get_magic', lambda: None)
+
+
+@pytest.mark.parametrize('data, name, expected', [
+    (b'%PDF-1.4\n...', None, 'pdf'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\x00' * 100, None, 'doc'),
+    (make_zip({'word/document.xml': '<w:document/>'}), None, 'docx'),
+    (make_odt(), None, 'odt'),
+    (b'  {\\rtf1\\ansi Hello}', 'resume.txt', 'rtf'),
+    (b'<!DOCTYPE html><html><body>Hi</body></html>', None, 'html'),
+    (b'Jane Doe\nPython developer\n', None, 'txt'),
+    ('José'.encode('utf-16'), None, 'txt'),
+    (b'\x00\x01\x02\x03' * 50, 'resume.doc', 'doc'),
+    (b'\x00\x01\x02\x03' * 50, None, 'other'),
+])
+def test_detect_file_type(data, name, expected):
+    assert detect_file_type(data=data, name=name) == expected
+
+
+def test_detect_file_type_on_disk(tmp_path):
+    path = tmp_path / 'resume.bin'
+    path.write_bytes(make_odt())
+    assert detect_file_type(str(path)) == 'odt'
+
+
+def test_decode_text():
+    assert decode_text('café'.encode('utf-8')) == 'café'
+    assert decode_text('café'.encode('cp1252')) == 'café'
+    assert decode_text('café'.encode('utf-8-sig')) == 'café'
+
+
+def test_rtf_to_text():
+    rtf = (r"{\rtf1\ansi\uc1{\fonttbl{\f0 Arial;}}{\*\generator Writer;}{\info{\title CV}}"
+           r"\f0 Jos\'e9 \u8212? Python\par "
+           r"Skills:\tab SQL \{braces\}\line {\b Docker}\~ok}")
+    assert rtf_to_text(rtf) == 'José — Python\nSkills:\tSQL {braces}\nDocker\xa0ok'
+
+
+def test_rtf_unicode_fallback_count():
+    assert rtf_to_text(r"{\rtf1\uc2\u26085 XYz}") == '日z'
+
+
+def test_extract_rtf_from_bytes():
+    assert extract_rtf(DocumentSource(None, b"{\\rtf1 Na\\'efve}")) == 'Naïve'
+
+
+def test_extract_html():
+    html = (b"<html><head><title>CV</title><style>p {color: red}</style></head>"
+            b"<body><h1>Jane&nbsp;Doe</h1><script>var x = 1;</script>"
+            b"<ul><li>Python &amp; SQL</li><li>Docker</li></ul></body></html>")
+    lines = [line.strip() for line in extract_html(DocumentSource(None, html)).splitlines() if line.strip()]
+    assert lines == ['Jane\xa0Doe', 'Python & SQL', 'Docker']
+
+
+def test_extract_odt(tmp_path):
+    path = tmp_path / 'resume.odt'
+    path.write_bytes(make_odt())
+    for source in (DocumentSource(str(path), None), DocumentSource(None, make_odt())):
+        lines = [line.strip() for line in extract_odt(source).splitlines() if line.strip()]
+        assert lines == ['Jane Doe', 'Python   SQL\tDocker', 'Master degree']
+
+
+def test_registry_falls_back_in_order():
+    def broken(source):
+        raise RuntimeError('boom')
+
+    registry = ExtractorRegistry()
+    registry.register('txt', 'empty', lambda source: '  ')
+    registry.register('txt', 'text', lambda source: source.read().decode())
+    registry.register('txt', 'broken', broken, first=True)
+    assert registry.extractors('txt') == ['broken', 'empty', 'text']
+
+    result = registry.extract(data=b'Python developer', name='cv.txt')
+    assert (result.text, result.file_type, result.extractor) == ('Python developer', 'txt', 'text')
+    assert list(result.timings) == ['broken', 'empty', 'text']
+
+    registry.unregister('txt', 'text')
+    with pytest.raises(ExtractionError, match='broken: RuntimeError: boom'):
+        registry.extract(data=b'Python developer')
+
+    assert registry.extract(data=b'%PDF-1.4').extractor is None
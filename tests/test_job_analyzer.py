@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from doc_cache import DocCache
+from job_analyzer import JobAnalyzer
+
+JOB_DESCRIPTIONS = os.path.join(os.path.dirname(__file__), '..', 'test_data', 'job_descriptions.txt')
+
+RESUME_SKILLS = [['python', 'sql', 'django'], ['javascript', 'node.js'], []]
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    import spacy
+
+    # Sentence boundaries from punctuation, and longer words tagged as nouns in place of a trained tagger
+    nlp = spacy.blank('en')
+    nlp.add_pipe('sentencizer')
+    ruler = nlp.add_pipe('attribute_ruler')
+    ruler.add(patterns=[[{'IS_ALPHA': True, 'LENGTH': {'>': 3}}]], attrs={'POS': 'NOUN'})
+    return JobAnalyzer(nlp=nlp, doc_cache=DocCache())
+
+
+@pytest.fixture(scope='module')
+def jobs():
+    with open(JOB_DESCRIPTIONS, 'r', encoding='utf-8') as file:
+        return [job.strip() for job in file.read().split('---') if job.strip()]
+
+
+def test_batch_requirements_match_single_extraction(analyzer, jobs):
+    single = [analyzer.extract_requirements(job) for job in jobs]
+    assert analyzer.extract_requirements_batch(jobs + jobs[:1], batch_size=2) == single + single[:1]
+    assert all(requirements['required_skills'] for requirements in single)
+
+
+def test_batch_skill_gaps_match_single_analysis(analyzer, jobs):
+    comparisons = [
+        (skills, analyzer.extract_requirements(job))
+        for job in jobs for skills in RESUME_SKILLS
+    ]
+    single = [analyzer.analyze_skill_gaps(skills, requirements) for skills, requirements in comparisons]
+    batch = analyzer.analyze_skill_gaps_batch(comparisons, batch_size=3)
+
+    def normalized(gaps):
+        return {**gaps, 'missing_skills': sorted(gaps['missing_skills']),
+                'matching_skills': sorted(gaps['matching_skills'])}
+
+    assert [normalized(gaps) for gaps in batch] == [normalized(gaps) for gaps in single]
+    assert any(gaps['matching_skills'] for gaps in single)
+
+
+def test_docs_parsed_elsewhere_give_the_same_results(analyzer, jobs):
+    doc = analyzer.sentence_nlp(jobs[0])
+    requirements = analyzer.requirements_from_doc(doc)
+    assert requirements == analyzer.extract_requirements(jobs[0])
+
+    docs = [analyzer.tagger_nlp(req.lower()) for req in requirements['required_skills']]
+    gaps = analyzer.skill_gaps_from_docs(['python'], docs)
+    assert gaps['match_percentage'] == analyzer.analyze_skill_gaps(['python'], requirements)['match_percentage']
+    assert 'python' in gaps['matching_skills']
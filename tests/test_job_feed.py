@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from job_feed import JobIndex, ingest_feeds, iter_postings
+
+
+class FakeAnalyzer:
+    """Requires every skill word named on a ``Skills:`` line"""
+
+    def __init__(self):
+        self.analyzed = []
+
+    def extract_requirements_batch(self, texts, batch_size=64, n_process=1):
+        self.analyzed.extend(texts)
+        results = []
+        for text in texts:
+            line = next((line for line in text.splitlines() if line.startswith('Skills:')), 'Skills:')
+            skills = [skill.strip() for skill in line[len('Skills:'):].split(',') if skill.strip()]
+            results.append({'required_skills': skills, 'preferred_skills': []})
+        return results
+
+
+POSTINGS = [
+    "Job Title: Backend Engineer\nSkills: Python, Django",
+    "Job Title: Data Engineer\nSkills: Python, SQL",
+    "Job Title: Frontend Engineer\nSkills: JavaScript, React",
+    "Job Title: DevOps Engineer\nSkills: Docker, Kubernetes",
+]
+
+
+def write_feed(path, postings):
+    path.write_text('\n---\n'.join(postings), encoding='utf-8')
+
+
+@pytest.fixture
+def index(tmp_path):
+    with JobIndex(str(tmp_path / 'jobs.db')) as index:
+        yield index
+
+
+def test_ids_do_not_depend_on_position(tmp_path):
+    feed = tmp_path / 'feed.txt'
+    write_feed(feed, POSTINGS)
+    before = {posting.title: posting.job_id for posting in iter_postings(str(feed))}
+    write_feed(feed, ["Job Title: QA Engineer\nSkills: Selenium"] + POSTINGS)
+    after = {posting.title: posting.job_id for posting in iter_postings(str(feed))}
+
+    assert len(after) == 5
+    assert all(after[title] == job_id for title, job_id in before.items())
+
+
+def test_jsonl_ids_and_repeats(tmp_path):
+    feed = tmp_path / 'feed.jsonl'
+    records = [{'id': 7, 'title': 'Engineer', 'text': POSTINGS[0]}, {'text': POSTINGS[1]}, {'text': POSTINGS[1]}]
+    feed.write_text('\n'.join(json.dumps(record) for record in records), encoding='utf-8')
+
+    postings = list(iter_postings(str(feed)))
+    assert [posting.job_id for posting in postings][0] == '7'
+    assert postings[0].title == 'Engineer'
+    assert len(postings) == 2
+
+
+def test_prepending_a_posting_only_analyzes_it(tmp_path, index):
+    feed = tmp_path / 'feed.txt'
+    write_feed(feed, POSTINGS)
+    assert ingest_feeds([str(feed)], index, FakeAnalyzer()) == (4, 0, 0)
+
+    write_feed(feed, ["Job Title: QA Engineer\nSkills: Selenium"] + POSTINGS)
+    analyzer = FakeAnalyzer()
+    assert ingest_feeds([str(feed)], index, analyzer) == (1, 4, 0)
+    assert len(analyzer.analyzed) == 1
+    assert len(index) == 5
+
+
+def test_postings_dropped_from_a_feed_are_removed(tmp_path, index):
+    feed, other = tmp_path / 'feed.txt', tmp_path / 'other.txt'
+    write_feed(feed, POSTINGS)
+    write_feed(other, ["Job Title: Analyst\nSkills: SQL"])
+    ingest_feeds([str(feed), str(other)], index, FakeAnalyzer())
+
+    write_feed(feed, POSTINGS[:1] + POSTINGS[2:])
+    assert ingest_feeds([str(feed)], index, FakeAnalyzer()) == (0, 3, 1)
+
+    titles = {match['title'] for match in index.match(['sql'], limit=None)}
+    assert titles == {'Analyst'}
+    assert len(index) == 4
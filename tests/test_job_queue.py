@@ -0,0 +1,174 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+
+import pytest
+
+import job_queue
+from job_queue import JobQueue, QueueBusyError, QueueWorker, extract_isolated
+from resume_parser import ExtractionError
+
+
+class FakeParser:
+    def parse_text(self, text, file_path=None):
+        return {'raw_text': text, 'skills': ['python'], 'file_path': file_path}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'queue.db')
+
+
+@pytest.fixture
+def queue(path):
+    with JobQueue(path, backoff=0.0) as queue:
+        yield queue
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_failed_jobs_are_retried_then_dead_lettered_with_dependents(queue):
+    parse_id = queue.enqueue('parse', {'path': 'a.pdf'}, max_attempts=2)
+    match_id = queue.enqueue('match', {'job_text': 'Python'}, parse_id)
+
+    # The match job waits for its parse job
+    job = queue.claim()
+    assert job.id == parse_id and job.attempts == 1
+    assert queue.claim() is None
+    assert queue.fail(job.id, 'broken')
+    assert queue.stats()['depth']['pending'] == 2
+
+    job = queue.claim()
+    assert job.attempts == 2
+    queue.fail(job.id, 'still broken')
+
+    dead = {job['id']: job for job in queue.dead_letters()}
+    assert dead[parse_id]['error'] == 'still broken'
+    assert dead[match_id]['error'] == f"Job {parse_id} it depends on failed"
+    assert queue.claim() is None
+
+    assert queue.retry_dead([parse_id]) == 1
+    assert queue.claim().attempts == 1
+
+
+def test_backoff_delays_retries(path):
+    with JobQueue(path, backoff=60.0) as queue:
+        queue.enqueue('parse', {'path': 'a.pdf'})
+        queue.fail(queue.claim().id, 'broken')
+        assert queue.claim() is None
+        assert queue.next_available() > time.time() + 29
+
+
+def test_results_of_jobs_no_longer_running_are_dropped(queue):
+    job_id = queue.enqueue('parse', {'path': 'a.pdf'})
+    first = queue.claim()
+    queue.fail(first.id, 'broken')
+    second = queue.claim()
+
+    # The first attempt finishing late must not overwrite the second one
+    assert not queue.complete(first.id, {'stale': True}, first.attempts)
+    assert not queue.fail(first.id, 'late', first.attempts)
+    assert queue.complete(second.id, {'fresh': True}, second.attempts)
+    assert not queue.complete(job_id, {'again': True})
+    assert queue.result(job_id) == {'fresh': True}
+
+
+def test_opening_a_queue_does_not_recover_running_jobs(path, queue):
+    queue.enqueue('parse', {'path': 'a.pdf'})
+    queue.start_runner()
+    queue.claim()
+
+    with JobQueue(path, read_only=True) as reader:
+        assert reader.stats()['depth']['running'] == 1
+        list(reader.results())
+        reader.dead_letters()
+    with JobQueue(path) as other:
+        with pytest.raises(QueueBusyError):
+            other.start_runner()
+    assert queue.stats()['depth']['running'] == 1
+
+
+def test_read_only_queues_are_not_created(tmp_path):
+    missing = str(tmp_path / 'missing.db')
+    with pytest.raises(sqlite3.OperationalError):
+        JobQueue(missing, read_only=True)
+    with pytest.raises(SystemExit):
+        job_queue.main([missing, 'stats'])
+    assert not os.path.exists(missing)
+
+
+def test_next_available_waits_for_dependencies(path):
+    with JobQueue(path, backoff=60.0) as queue:
+        parse_id = queue.enqueue('parse', {'path': 'a.pdf'})
+        queue.enqueue('match', {'job_text': 'Python'}, parse_id)
+        queue.fail(queue.claim().id, 'broken')
+        # The match job is pending since enqueueing, but can't run before its parse job
+        assert queue.next_available() > time.time() + 29
+
+
+def test_retried_jobs_of_a_dead_dependency_are_dead_lettered_again(queue):
+    parse_id = queue.enqueue('parse', {'path': 'a.pdf'}, max_attempts=1)
+    match_id = queue.enqueue('match', {'job_text': 'Python'}, parse_id)
+    queue.fail(queue.claim().id, 'broken')
+
+    assert queue.retry_dead([match_id]) == 1
+    assert queue.next_available() is None
+    started = time.time()
+    assert QueueWorker(queue).run(wait=True) == 0
+    assert time.time() - started < 1
+    assert {job['id'] for job in queue.dead_letters()} == {parse_id, match_id}
+
+
+def test_next_runner_recovers_jobs_of_a_crashed_one(path, queue):
+    job_id = queue.enqueue('parse', {'path': 'a.pdf'})
+    queue.claim()
+    queue.conn.execute("INSERT INTO runner VALUES (1, 'crashed', ?, ?, ?)",
+                       (job_queue.socket.gethostname(), dead_pid(), time.time()))
+
+    with JobQueue(path, backoff=0.0) as runner:
+        assert runner.start_runner() == 1
+        job = runner.claim()
+        assert job.id == job_id and job.attempts == 2
+        runner.stop_runner()
+
+
+def test_stale_heartbeat_releases_the_lease(path, queue):
+    queue.start_runner()
+    queue.conn.execute('UPDATE runner SET heartbeat = ?', (time.time() - 3600,))
+    with JobQueue(path) as runner:
+        assert runner.start_runner() == 0
+
+
+def test_worker_runs_parse_and_match_jobs(queue, monkeypatch):
+    def extract(path, timeout, max_memory):
+        if path == 'b.pdf':
+            raise ExtractionError('Timed out after 60s')
+        return f'text of {path}'
+
+    monkeypatch.setattr(job_queue, 'extract_isolated', extract)
+    parse_id = queue.enqueue('parse', {'path': 'a.pdf'})
+    failing_id = queue.enqueue('parse', {'path': 'b.pdf'}, max_attempts=1)
+
+    worker = QueueWorker(queue, resume_parser=FakeParser())
+    assert worker.run(wait=False) == 2
+    assert queue.result(parse_id)['raw_text'] is None
+    assert queue.dead_letters() == [
+        {'id': failing_id, 'kind': 'parse', 'payload': {'path': 'b.pdf'}, 'attempts': 1, 'error': 'Timed out after 60s'}
+    ]
+    # The lease is released when the worker stops
+    assert queue.conn.execute('SELECT COUNT(*) FROM runner').fetchone()[0] == 0
+
+
+def test_extract_isolated(tmp_path):
+    resume = tmp_path / 'resume.txt'
+    resume.write_text('Jane Doe\nPython developer', encoding='utf-8')
+    assert 'Python developer' in extract_isolated(str(resume), timeout=30)
+
+    with pytest.raises(ExtractionError):
+        extract_isolated(str(tmp_path / 'missing.txt'), timeout=30)
@@ -0,0 +1,89 @@
+import json
+import time
+
+import pytest
+
+from metrics import Metrics, timed, get_metrics
+
+
+@pytest.fixture
+def metrics():
+    return Metrics()
+
+
+def test_stages_and_counters(metrics):
+    metrics.observe('parse', 0.5, 0.25, format='pdf')
+    metrics.observe('parse', 1.5, 0.75, format='pdf')
+    metrics.inc('pdf_pages', 3, backend='pypdf2')
+    metrics.inc('pdf_pages', backend='pypdf2')
+
+    snapshot = metrics.snapshot()
+    assert snapshot['stages'] == [
+        {'stage': 'parse', 'labels': {'format': 'pdf'}, 'calls': 2, 'wall_seconds': 2.0, 'cpu_seconds': 1.0}
+    ]
+    assert snapshot['counters'] == [{'name': 'pdf_pages', 'labels': {'backend': 'pypdf2'}, 'value': 4}]
+    json.dumps(snapshot)
+
+
+def test_cache_hit_rates(metrics):
+    metrics.inc('cache_hits', 3, cache='doc')
+    metrics.inc('cache_misses', cache='doc')
+    metrics.inc('cache_misses', cache='extraction')
+    assert metrics.snapshot()['cache_hit_rates'] == {'doc': 0.75, 'extraction': 0.0}
+
+
+def test_prometheus_export(metrics):
+    metrics.observe('extract_text', 2.0, 1.0, format='pdf')
+    metrics.inc('requests', endpoint='/parse', status=200)
+    metrics.inc('requests', endpoint='/match', status=500)
+    metrics.inc('odd', label='say "hi"\\\n')
+
+    lines = metrics.to_prometheus().splitlines()
+    assert '# TYPE resume_analyzer_stage_calls_total counter' in lines
+    assert 'resume_analyzer_stage_calls_total{stage="extract_text",format="pdf"} 1' in lines
+    assert 'resume_analyzer_stage_seconds_total{stage="extract_text",format="pdf"} 2.0' in lines
+    assert 'resume_analyzer_stage_cpu_seconds_total{stage="extract_text",format="pdf"} 1.0' in lines
+    assert lines.count('# TYPE resume_analyzer_requests_total counter') == 1
+    assert 'resume_analyzer_requests_total{endpoint="/match",status="500"} 1' in lines
+    assert 'resume_analyzer_odd_total{label="say \\"hi\\"\\\\\\n"} 1' in lines
+
+    # Every sample follows the TYPE line of its metric
+    declared = set()
+    for line in lines:
+        if line.startswith('# TYPE'):
+            declared.add(line.split()[2])
+        elif not line.startswith('#'):
+            assert line.split('{')[0] in declared
+
+
+def test_stage_records_failures_and_reset(metrics):
+    with pytest.raises(RuntimeError):
+        with metrics.stage('work', kind='a'):
+            raise RuntimeError()
+    assert metrics.snapshot()['stages'][0]['calls'] == 1
+    metrics.reset()
+    assert metrics.snapshot()['stages'] == []
+
+
+def test_slow_profiled_stage_reports_stacks(metrics):
+    reports = []
+    metrics.configure_profiler(0.01, interval=0.001, hook=lambda *report: reports.append(report))
+    with metrics.stage('fast'):
+        time.sleep(0.03)
+    with metrics.stage('slow', profile=True):
+        time.sleep(0.05)
+
+    assert [name for name, _, _ in reports] == ['slow']
+    _, wall, samples = reports[0]
+    assert wall >= 0.05
+    assert sum(samples.values()) > 0
+
+
+def test_timed_decorator():
+    @timed('test_timed_decorator')
+    def work(value):
+        return value * 2
+
+    assert work(2) == 4
+    stages = [stage for stage in get_metrics().snapshot()['stages'] if stage['stage'] == 'test_timed_decorator']
+    assert stages[0]['calls'] == 1
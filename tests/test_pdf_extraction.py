@@ -0,0 +1,160 @@
+import os
+import tempfile
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+import pdf_extraction
+from pdf_extraction import PdfExtractor, PdfLimits, page_quality
+
+
+def make_pdf(texts):
+    """A minimal PDF with one line of Helvetica text per page"""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None,
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for text in texts:
+        stream = f'BT /F1 12 Tf 72 720 Td ({text}) Tj ET'.encode()
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % len(objects))
+        kids.append(b'%d 0 R' % len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (b' '.join(kids), len(kids))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+PAGES = [f'Page {i} lists Python and SQL skills' for i in range(20)]
+
+
+def hanging_pages(data, start, stop, quality_threshold, deadline, timings):
+    """Stands in for _iter_page_range with a second page that never finishes"""
+    yield start, PAGES[start], 'pypdf2'
+    time.sleep(60)
+
+
+@pytest.fixture
+def forked(monkeypatch):
+    """Fork extraction processes, so they see stand-ins patched into this one"""
+    monkeypatch.setattr(pdf_extraction, '_process_context', lambda: multiprocessing.get_context('fork'))
+
+
+def test_page_quality():
+    assert page_quality('') == 0.0
+    assert page_quality('Python developer') == 1.0
+    assert page_quality('(cid:12)(cid:13) x') < 0.5
+
+
+@pytest.mark.parametrize('isolate', [True, False])
+def test_serial_extraction(isolate):
+    result = PdfExtractor(max_workers=1, isolate=isolate).extract(make_pdf(PAGES))
+    assert result.page_count == 20
+    assert result.text == ' '.join(PAGES)
+    assert result.page_backends == ['pypdf2'] * 20
+    assert not result.truncated
+
+
+def test_page_limit_truncates(tmp_path):
+    path = tmp_path / 'resume.pdf'
+    path.write_bytes(make_pdf(PAGES))
+    result = PdfExtractor(PdfLimits(max_pages=3), max_workers=1).extract(str(path))
+    assert result.text == ' '.join(PAGES[:3])
+    assert result.truncated
+
+
+def test_size_limit():
+    with pytest.raises(ValueError):
+        PdfExtractor(PdfLimits(max_bytes=100), max_workers=1).extract(make_pdf(PAGES))
+
+
+def test_iter_pages_stops_early():
+    pages = PdfExtractor(max_workers=1).iter_pages(make_pdf(PAGES))
+    assert next(pages) == PAGES[0]
+    pages.close()
+
+
+def test_serial_timeout_kills_a_hanging_page(monkeypatch, forked):
+    monkeypatch.setattr(pdf_extraction, '_iter_page_range', hanging_pages)
+    started = time.time()
+    result = PdfExtractor(PdfLimits(timeout=1.0), max_workers=1).extract(make_pdf(PAGES))
+    assert time.time() - started < 10
+    assert result.text == PAGES[0]
+    assert result.truncated
+
+    started = time.time()
+    assert list(PdfExtractor(PdfLimits(timeout=1.0), max_workers=1).iter_pages(make_pdf(PAGES))) == PAGES[:1]
+    assert time.time() - started < 10
+
+
+def test_parallel_extraction_reuses_one_pool():
+    extractor = PdfExtractor(parallel_threshold=4, max_workers=4)
+    data = make_pdf(PAGES)
+    assert extractor.extract(data).text == ' '.join(PAGES)
+    pool = pdf_extraction._get_pool(4)
+    assert extractor.extract(data).text == ' '.join(PAGES)
+    assert pdf_extraction._get_pool(4) is pool
+
+
+def test_parallel_timeout_interrupts_workers(monkeypatch, forked, tmp_path):
+    # A worker count no other test uses, so the pool is forked with the stand-in
+    monkeypatch.setattr(pdf_extraction, '_iter_page_range', hanging_pages)
+    path = tmp_path / 'resume.pdf'
+    path.write_bytes(make_pdf(PAGES))
+    extractor = PdfExtractor(PdfLimits(timeout=1.0), parallel_threshold=4, max_workers=3)
+    try:
+        started = time.time()
+        result = extractor.extract(str(path))
+        assert time.time() - started < 10
+        assert result.text == ' '.join(PAGES[start] for start in (0, 7, 14))
+        assert result.truncated
+    finally:
+        pdf_extraction._discard_pool(3, pdf_extraction._get_pool(3))
+
+
+@pytest.mark.parametrize('pages', [PAGES[:2], PAGES])
+def test_pages_are_counted_outside_the_caller(monkeypatch, tmp_path, pages):
+    caller, page_count = os.getpid(), pdf_extraction._page_count
+
+    def guarded_page_count(data):
+        assert os.getpid() != caller
+        return page_count(data)
+
+    monkeypatch.setattr(pdf_extraction, '_page_count', guarded_page_count)
+    path = tmp_path / 'resume.pdf'
+    path.write_bytes(make_pdf(pages))
+    extractor = PdfExtractor(parallel_threshold=4, max_workers=4)
+    assert extractor.extract(str(path)).text == ' '.join(pages)
+    assert extractor.extract(make_pdf(pages)).text == ' '.join(pages)
+
+
+def test_in_memory_parallel_extraction_writes_no_files(monkeypatch):
+    def no_temporary_files(*args, **kwargs):
+        raise OSError('read-only file system')
+
+    monkeypatch.setattr(tempfile, 'mkstemp', no_temporary_files)
+    monkeypatch.setattr(tempfile, 'NamedTemporaryFile', no_temporary_files)
+    assert PdfExtractor(parallel_threshold=4, max_workers=4).extract(make_pdf(PAGES)).text == ' '.join(PAGES)
+
+
+def test_threaded_hosts_do_not_fork():
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    try:
+        assert pdf_extraction._process_context().get_start_method() != 'fork'
+        # A serial extraction in a threaded host still works without forking it
+        assert PdfExtractor(max_workers=1).extract(make_pdf(PAGES[:2])).text == ' '.join(PAGES[:2])
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from ranking import MatchRanker, top_k_rows
+
+
+def test_top_k_rows_best_first():
+    scores = np.array([[0.1, 0.9, 0.5, 0.7], [0.4, 0.3, 0.2, 0.1]])
+    indices, top = top_k_rows(scores, 2)
+    assert indices.tolist() == [[1, 3], [0, 1]]
+    assert top.tolist() == [[0.9, 0.7], [0.4, 0.3]]
+
+
+def test_top_k_rows_clamps_k():
+    scores = np.array([[0.2, 0.1]])
+    assert top_k_rows(scores, 5)[0].tolist() == [[0, 1]]
+    indices, top = top_k_rows(scores, 0)
+    assert indices.shape == top.shape == (1, 0)
+
+
+def test_rank_matrices_matches_brute_force_across_chunks():
+    resumes = sparse.random(37, 50, density=0.2, random_state=1, format='csr')
+    jobs = sparse.random(11, 50, density=0.2, random_state=2, format='csr')
+    dense = (resumes @ jobs.T).toarray()
+
+    # Chunks of a few rows force the running per-job merge
+    result = MatchRanker(vectorizer=TfidfVectorizer(), max_chunk_bytes=11 * 8 * 3).rank_matrices(resumes, jobs, k=3)
+
+    for i, ranking in enumerate(result.jobs_per_resume):
+        assert [score for _, score in ranking] == pytest.approx(sorted(dense[i], reverse=True)[:3])
+        assert all(dense[i, j] == pytest.approx(score) for j, score in ranking)
+    for j, ranking in enumerate(result.resumes_per_job):
+        assert [score for _, score in ranking] == pytest.approx(sorted(dense[:, j], reverse=True)[:3])
+        assert all(dense[i, j] == pytest.approx(score) for i, score in ranking)
+
+
+def test_rank_texts():
+    ranker = MatchRanker(vectorizer=TfidfVectorizer())
+    result = ranker.rank(['python django developer', 'nurse with icu experience'],
+                         ['senior python django engineer', 'icu nurse'], k=1)
+    assert [ranking[0][0] for ranking in result.jobs_per_resume] == [0, 1]
+    assert [ranking[0][0] for ranking in result.resumes_per_job] == [0, 1]
+    assert ranker.rank([], ['job'], k=1) == ([], [[]])
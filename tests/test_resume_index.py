@@ -0,0 +1,63 @@
+import pytest
+
+from resume_index import QueryError, ResumeIndex, _QueryParser
+
+
+def parse(query):
+    return _QueryParser(query).parse()
+
+
+def test_precedence_and_implicit_and():
+    assert parse('python "machine learning" OR java') == (
+        'or', [('and', [('term', 'python'), ('term', 'machine learning')]), ('term', 'java')]
+    )
+    assert parse('Python AND (Kubernetes OR k8s) NOT Java') == (
+        'and', [('term', 'Python'), ('or', [('term', 'Kubernetes'), ('term', 'k8s')]), ('not', ('term', 'Java'))]
+    )
+    assert parse('NOT NOT sql') == ('not', ('not', ('term', 'sql')))
+
+
+@pytest.mark.parametrize('query', ['', '   ', 'python AND', '(python', 'python)', 'OR java', 'NOT'])
+def test_malformed_queries(query):
+    with pytest.raises(QueryError):
+        parse(query)
+
+
+@pytest.fixture
+def index(tmp_path):
+    resumes = [
+        ('alice.pdf', 'Python developer, Kubernetes in production. Machine learning.', ['Python', 'Kubernetes', 'Machine Learning']),
+        ('bob.pdf', 'Java and Python backend engineer on Kubernetes.', ['Java', 'Python', 'Kubernetes']),
+        ('carol.pdf', 'Python data analyst who loves SQL.', ['Python', 'SQL']),
+        ('dave.pdf', 'Java engineer.', ['Java']),
+    ]
+    with ResumeIndex(str(tmp_path / 'resumes.db')) as index:
+        index.add_many({'file_path': path, 'raw_text': text, 'skills': skills} for path, text, skills in resumes)
+        yield index
+
+
+def search(index, query):
+    return [resume['file_path'] for resume in index.search(query)]
+
+
+def test_boolean_search(index):
+    assert search(index, 'Python AND (Kubernetes OR k8s) NOT Java') == ['alice.pdf']
+    assert search(index, 'k8s') == ['alice.pdf', 'bob.pdf']
+    assert search(index, 'java OR sql') == ['bob.pdf', 'carol.pdf', 'dave.pdf']
+    assert search(index, 'NOT python') == ['dave.pdf']
+    assert search(index, '"machine learning"') == ['alice.pdf']
+    assert search(index, 'haskell') == []
+
+
+def test_replace_and_remove(index):
+    index.add({'file_path': 'dave.pdf', 'raw_text': 'Now writes SQL.', 'skills': ['SQL']})
+    assert search(index, 'sql') == ['carol.pdf', 'dave.pdf']
+    assert index.remove('carol.pdf')
+    assert search(index, 'sql') == ['dave.pdf']
+    assert len(index) == 3
+
+
+def test_ranked_search_prefers_rare_skills(index):
+    ranked = index.search_ranked('python sql')
+    assert ranked[0][1]['file_path'] == 'carol.pdf'
+    assert [score for score, _ in ranked] == sorted((score for score, _ in ranked), reverse=True)
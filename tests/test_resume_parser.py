@@ -0,0 +1,51 @@
+import pytest
+
+from doc_cache import DocCache
+from resume_parser import CHUNK_OVERLAP, ResumeParser
+
+TEXT = (
+    "Jane Doe. jane@example.com. "
+    + "Worked on many python projects over the years. " * 8
+    + "I earned a Master of Science in Computer Engineering from MIT in 2015. "
+    + "Built docker pipelines. " * 8
+    + "Bachelor degree in Physics."
+)
+
+
+@pytest.fixture(scope='module')
+def resume(tmp_path_factory):
+    path = tmp_path_factory.mktemp('resumes') / 'resume.txt'
+    path.write_text(TEXT, encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('chunk_chars', [120, 333, 20000])
+def test_stream_keeps_sentences_across_chunk_boundaries(resume, chunk_chars):
+    doc_cache = DocCache()
+    parser = ResumeParser(doc_cache=doc_cache)
+    result = parser.parse_resume_stream(resume, chunk_chars=chunk_chars)
+
+    assert result['education'] == parser.extract_education(parser._clean_text(TEXT))
+    assert result['contact_info']['email'] == 'jane@example.com'
+    assert result['raw_text'] is None
+    # Only the one full-text parse above went through the document cache
+    assert len(doc_cache) == 1
+
+
+@pytest.mark.parametrize('skill', ['NoSQL', 'MySQL', 'PostgreSQL'])
+def test_stream_overlap_starts_on_a_word_boundary(tmp_path, skill):
+    import spacy
+
+    nlp = spacy.blank('en')
+    nlp.add_pipe('sentencizer')
+    parser = ResumeParser(nlp=nlp, doc_cache=DocCache(), extraction_cache=False)
+    # The first chunk ends exactly CHUNK_OVERLAP characters after the start of "SQL"
+    first = f"Skills: {skill} " + "x" * (CHUNK_OVERLAP - 4)
+    text = first + " " + "Worked on data pipelines."
+    path = tmp_path / 'resume.txt'
+    path.write_text(text, encoding='utf-8')
+
+    result = parser.parse_resume_stream(str(path), chunk_chars=len(first) + 1)
+
+    assert result['skills'] == [skill]
+    assert result['skills'] == parser.parse_resume(str(path))['skills']
@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+
+import semantic_matcher
+from semantic_matcher import SemanticMatcher, default_embedding_cache_path, get_default_embedding_cache
+
+
+class FakeEncoder:
+    model_id = 'fake:1'
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        vectors = np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_default_path_order(monkeypatch, tmp_path):
+    monkeypatch.setenv(semantic_matcher.EMBEDDING_CACHE_ENV, str(tmp_path / 'explicit.db'))
+    assert default_embedding_cache_path() == str(tmp_path / 'explicit.db')
+
+    monkeypatch.setenv(semantic_matcher.EMBEDDING_CACHE_ENV, '')
+    assert default_embedding_cache_path() is None
+    assert get_default_embedding_cache() is None
+
+    monkeypatch.delenv(semantic_matcher.EMBEDDING_CACHE_ENV)
+    monkeypatch.setenv(semantic_matcher.CACHE_DIR_ENV, str(tmp_path / 'extraction'))
+    assert default_embedding_cache_path() == str(tmp_path / 'extraction' / 'embeddings.db')
+
+    monkeypatch.delenv(semantic_matcher.CACHE_DIR_ENV)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'home'))
+    assert default_embedding_cache_path() == str(tmp_path / 'home' / 'resume-analyzer' / 'embeddings.db')
+
+
+def test_embeddings_persist_across_matchers(monkeypatch, tmp_path):
+    monkeypatch.delenv(semantic_matcher.EMBEDDING_CACHE_ENV, raising=False)
+    monkeypatch.setenv(semantic_matcher.CACHE_DIR_ENV, str(tmp_path / 'cache'))
+
+    first = FakeEncoder()
+    vectors = SemanticMatcher(first).embed(['python', 'sql', 'python'])
+    assert first.encoded == ['python', 'sql']
+    assert os.path.exists(tmp_path / 'cache' / 'embeddings.db')
+
+    # A new process would open the same database; a fresh cache object stands in for it
+    semantic_matcher._default_caches.clear()
+    second = FakeEncoder()
+    assert np.array_equal(SemanticMatcher(second).embed(['python', 'sql', 'python']), vectors)
+    assert second.encoded == []
+
+
+def test_cache_path_argument(tmp_path):
+    path = tmp_path / 'custom' / 'vectors.db'
+    matcher = SemanticMatcher(FakeEncoder(), cache_path=str(path))
+    matcher.embed(['go'])
+    assert matcher.cache.path == str(path)
+    assert os.path.exists(path)
@@ -0,0 +1,63 @@
+import pytest
+
+from skill_matcher import SkillMatcher, get_skill_matcher, tokenize
+
+
+@pytest.fixture
+def matcher():
+    return SkillMatcher([
+        ('java', 'Java', []),
+        ('javascript', 'JavaScript', ['js']),
+        ('cpp', 'C++', []),
+        ('nodejs', 'Node.js', ['nodejs']),
+        ('ml', 'Machine Learning', ['ml']),
+        ('ml_ops', 'Machine Learning Operations', ['mlops']),
+        ('gcp', 'GCP', ['google cloud', 'google cloud platform']),
+    ])
+
+
+def test_tokenize_keeps_symbols_and_inner_dots():
+    assert [token for token, _, _ in tokenize('C++, C# and Node.js.')] == ['c++', 'c#', 'and', 'node.js']
+
+
+def test_whole_tokens_only(matcher):
+    assert matcher.skill_names('JavaScript and Java') == ['JavaScript', 'Java']
+    assert matcher.skill_names('javanese cuisine') == []
+
+
+def test_longest_phrase_wins(matcher):
+    text = 'Deployed on Google Cloud Platform; machine learning operations'
+    matches = matcher.find(text)
+    assert [match.skill_id for match in matches] == ['gcp', 'ml_ops']
+    assert text[matches[0].start:matches[0].end] == 'Google Cloud Platform'
+
+
+def test_aliases_and_first_mention_order(matcher):
+    assert matcher.skill_ids('ML with node.js, then JS and C++ and more ML') == ['ml', 'nodejs', 'javascript', 'cpp']
+
+
+def test_fingerprint_follows_taxonomy():
+    first = SkillMatcher([('python', 'Python', [])])
+    assert first.fingerprint == SkillMatcher([('python', 'Python', [])]).fingerprint
+    assert first.fingerprint != SkillMatcher([('python', 'Python', ['py'])]).fingerprint
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / 'taxonomy.tsv'
+    path.write_text('# comment\npython\tPython\tpython3|py3\nsql\tSQL\t\n', encoding='utf-8')
+    matcher = SkillMatcher.from_file(str(path))
+    assert matcher.skill_names('py3 and sql') == ['Python', 'SQL']
+
+
+@pytest.mark.parametrize('text', [
+    'Took a rest after the project',
+    'Loaded shipping containers at the port',
+    'Carried the Olympic torch',
+])
+def test_bundled_taxonomy_ignores_everyday_words(text):
+    assert get_skill_matcher().skill_names(text) == []
+
+
+def test_bundled_taxonomy_qualified_aliases():
+    names = get_skill_matcher().skill_names('Built REST APIs on Mongo DB and Docker with PyTorch models')
+    assert names == ['RESTful APIs', 'MongoDB', 'Docker', 'PyTorch']
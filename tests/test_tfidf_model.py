@@ -0,0 +1,57 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from tfidf_model import fit_tfidf_model, list_versions, load_tfidf_model, save_tfidf_model
+
+CORPUS = [
+    'Senior Python developer with Django, Flask and PostgreSQL experience',
+    'Data scientist skilled in machine learning, statistics and Python',
+    'Frontend engineer building React and TypeScript applications',
+    'DevOps engineer running Kubernetes and Terraform on AWS',
+]
+QUERIES = CORPUS + ['Python and Kubernetes', 'words the model has never seen']
+
+
+@pytest.fixture
+def vectorizer():
+    return fit_tfidf_model(CORPUS, ngram_range=(1, 2), sublinear_tf=True)
+
+
+def test_saved_model_transforms_like_the_fitted_one(vectorizer, tmp_path):
+    path = save_tfidf_model(vectorizer, str(tmp_path), 'v1')
+    assert path == str(tmp_path / 'v1')
+
+    loaded = load_tfidf_model(str(tmp_path))
+    assert loaded.model_version == 'v1'
+    assert loaded.get_params()['ngram_range'] == (1, 2)
+    assert isinstance(loaded.idf_, np.memmap)
+    np.testing.assert_array_equal(loaded.transform(QUERIES).toarray(), vectorizer.transform(QUERIES).toarray())
+
+
+def test_latest_complete_version_is_loaded(vectorizer, tmp_path):
+    save_tfidf_model(vectorizer, str(tmp_path), '20240101000000')
+    save_tfidf_model(fit_tfidf_model(CORPUS[:2]), str(tmp_path), '20240201000000')
+    # A version still being written has no meta.json yet
+    os.makedirs(tmp_path / '20240301000000')
+
+    assert list_versions(str(tmp_path)) == ['20240101000000', '20240201000000']
+    assert load_tfidf_model(str(tmp_path)).model_version == '20240201000000'
+    assert load_tfidf_model(str(tmp_path), '20240101000000').model_version == '20240101000000'
+
+
+def test_load_errors(vectorizer, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_tfidf_model(str(tmp_path / 'missing'))
+
+    path = save_tfidf_model(vectorizer, str(tmp_path), 'v1')
+    meta_path = os.path.join(path, 'meta.json')
+    with open(meta_path, 'r', encoding='utf-8') as file:
+        meta = json.load(file)
+    meta['format_version'] = 0
+    with open(meta_path, 'w', encoding='utf-8') as file:
+        json.dump(meta, file)
+    with pytest.raises(ValueError):
+        load_tfidf_model(str(tmp_path))
@@ -0,0 +1,199 @@
+import os
+import json
+import time
+import logging
+import argparse
+import threading
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional
+
+# NumPy and scikit-learn are imported on first use, so importing this module
+# only to check for a default model stays cheap
+if TYPE_CHECKING:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Bump when the on-disk layout changes
+FORMAT_VERSION = 1
+
+# Environment variable pointing at a model directory loaded by default
+MODEL_DIR_ENV = 'TFIDF_MODEL_DIR'
+
+# Vectorizer settings that must match between fitting and scoring
+_PERSISTED_PARAMS = (
+    'lowercase', 'strip_accents', 'token_pattern', 'stop_words', 'ngram_range',
+    'analyzer', 'binary', 'norm', 'use_idf', 'smooth_idf', 'sublinear_tf'
+)
+
+logger = logging.getLogger(__name__)
+
+
+def fit_tfidf_model(documents: Iterable[str], **params) -> 'TfidfVectorizer':
+    """
+    Fit a TF-IDF vectorizer on a reference corpus
+
+    Args:
+        documents: Reference corpus, e.g. a representative sample of resumes and jobs
+        **params: Extra TfidfVectorizer arguments
+
+    Returns:
+        Fitted TfidfVectorizer
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    params.setdefault('stop_words', 'english')
+    vectorizer = TfidfVectorizer(**params)
+    vectorizer.fit(documents)
+    return vectorizer
+
+
+def save_tfidf_model(vectorizer: 'TfidfVectorizer', directory: str, version: Optional[str] = None) -> str:
+    """
+    Save a fitted vectorizer as a versioned artifact
+
+    The artifact is written to ``directory/<version>`` and holds the vocabulary
+    as one term per line, the IDF weights as a ``.npy`` array that can be
+    memory-mapped, and a ``meta.json`` describing both.
+
+    Returns:
+        Path of the written version directory
+    """
+    import numpy as np
+    import sklearn
+
+    version = version or time.strftime('%Y%m%d%H%M%S')
+    path = os.path.join(directory, version)
+    os.makedirs(path, exist_ok=True)
+
+    terms = [None] * len(vectorizer.vocabulary_)
+    for term, index in vectorizer.vocabulary_.items():
+        terms[index] = term
+
+    with open(os.path.join(path, 'vocabulary.txt'), 'w', encoding='utf-8') as file:
+        file.write('\n'.join(terms))
+
+    np.save(os.path.join(path, 'idf.npy'), np.ascontiguousarray(vectorizer.idf_, dtype=np.float64))
+
+    params = vectorizer.get_params()
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'version': version,
+        'sklearn_version': sklearn.__version__,
+        'n_features': len(terms),
+        'params': {key: params[key] for key in _PERSISTED_PARAMS if key in params},
+    }
+    if not isinstance(meta['params'].get('stop_words'), (str, type(None))):
+        meta['params']['stop_words'] = sorted(meta['params']['stop_words'])
+
+    # Write meta last so a half-written version is never picked up by load
+    with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as file:
+        json.dump(meta, file, indent=2)
+
+    logger.info(f"Saved TF-IDF model {version} with {len(terms)} terms to {path}")
+    return path
+
+
+def list_versions(directory: str) -> List[str]:
+    """Complete model versions saved under a directory, oldest first"""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        name for name in os.listdir(directory)
+        if os.path.isfile(os.path.join(directory, name, 'meta.json'))
+    )
+
+
+def load_tfidf_model(directory: str, version: Optional[str] = None) -> 'TfidfVectorizer':
+    """
+    Load a saved vectorizer ready for transform-only scoring
+
+    Args:
+        directory (str): Directory passed to ``save_tfidf_model``
+        version (str): Version to load, defaults to the latest one
+
+    Returns:
+        TfidfVectorizer whose IDF weights are memory-mapped from disk
+    """
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    if version is None:
+        versions = list_versions(directory)
+        if not versions:
+            raise FileNotFoundError(f"No TF-IDF model versions found in {directory}")
+        version = versions[-1]
+
+    path = os.path.join(directory, version)
+    with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as file:
+        meta = json.load(file)
+
+    if meta.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported TF-IDF model format {meta.get('format_version')} in {path}")
+
+    with open(os.path.join(path, 'vocabulary.txt'), 'r', encoding='utf-8') as file:
+        terms = file.read().split('\n') if meta['n_features'] else []
+
+    params = dict(meta['params'])
+    if 'ngram_range' in params:
+        params['ngram_range'] = tuple(params['ngram_range'])
+
+    vectorizer = TfidfVectorizer(vocabulary={term: index for index, term in enumerate(terms)}, **params)
+    vectorizer.idf_ = np.load(os.path.join(path, 'idf.npy'), mmap_mode='r')
+    vectorizer.model_version = meta['version']
+
+    logger.info(f"Loaded TF-IDF model {meta['version']} with {len(terms)} terms from {path}")
+    return vectorizer
+
+
+_default_model = None
+_default_model_loaded = False
+_default_model_lock = threading.Lock()
+
+
+def get_default_tfidf_model() -> Optional['TfidfVectorizer']:
+    """
+    Get the process-wide model named by ``$TFIDF_MODEL_DIR``, if any
+
+    Returns:
+        The latest saved vectorizer in that directory, or None when the
+        variable is not set
+    """
+    global _default_model, _default_model_loaded
+    if not _default_model_loaded:
+        with _default_model_lock:
+            if not _default_model_loaded:
+                directory = os.environ.get(MODEL_DIR_ENV)
+                _default_model = load_tfidf_model(directory) if directory else None
+                _default_model_loaded = True
+    return _default_model
+
+
+def _iter_corpus(paths: Iterable[str], field: str) -> Iterator[str]:
+    """Yield documents from text files (one per file) and JSONL files (one per line)"""
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as file:
+            if path.endswith('.jsonl'):
+                for line in file:
+                    if line.strip():
+                        text = json.loads(line).get(field)
+                        if text:
+                            yield text
+            else:
+                yield file.read()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Fit a TF-IDF model on a reference corpus and save it")
+    parser.add_argument('corpus', nargs='+', help="Text files (one document each) or JSONL files")
+    parser.add_argument('-o', '--output', required=True, help="Model directory")
+    parser.add_argument('--version', help="Version name (defaults to a timestamp)")
+    parser.add_argument('--field', default='raw_text', help="JSONL field holding the document text")
+    parser.add_argument('--min-df', type=int, default=1, help="Ignore terms in fewer documents than this")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    vectorizer = fit_tfidf_model(_iter_corpus(args.corpus, args.field), min_df=args.min_df)
+    print(save_tfidf_model(vectorizer, args.output, args.version))
+
+
+if __name__ == "__main__":
+    main()